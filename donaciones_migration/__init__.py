@@ -7,6 +7,10 @@ Genera un único archivo SQL (output/donaciones.sql) con INSERTs
 encadenados para las tablas ingresos, ingreso_detalles y egresos,
 usando variables MySQL para enlazar los IDs.
 
+build_donaciones_tsv genera la variante para LOAD DATA (TSV + driver) y
+load_donaciones_to_db hace la misma carga directamente en la BD (modo
+--directo), sin generar archivos.
+
 Uso:
     from donaciones_migration import build_donaciones_sql
     ruta = build_donaciones_sql(dfs_limpios, engine)
@@ -16,12 +20,36 @@ from sqlalchemy.engine import Engine
 
 from donaciones_migration.validator import run_all_validations
 from donaciones_migration.transformer import build_donaciones_dfs
-from donaciones_migration.exporter_sql import export_donaciones_to_sql
+from donaciones_migration.exporter_sql import (
+    export_donaciones_to_db,
+    export_donaciones_to_sql,
+    export_donaciones_to_tsv,
+)
+from utils.db_loader import LOTE_FILAS
 from utils.logger import get_logger
 
 logger = get_logger()
 
-__all__ = ["build_donaciones_sql"]
+__all__ = ["build_donaciones_sql", "build_donaciones_tsv", "load_donaciones_to_db"]
+
+
+def _build_donaciones_dfs(dfs_limpios: dict, engine: Engine):
+    """Pasos 1-3: hoja DONACIONES → validaciones → 3 DataFrames."""
+    if "DONACIONES" not in dfs_limpios:
+        msg = (
+            "La hoja 'DONACIONES' no se encuentra en dfs_limpios. "
+            "Hojas disponibles: " + str(list(dfs_limpios.keys()))
+        )
+        logger.error(msg)
+        raise KeyError(msg)
+
+    df_donaciones = dfs_limpios["DONACIONES"]
+    logger.info(f"Hoja DONACIONES cargada: {len(df_donaciones)} filas")
+    logger.info(f"Columnas: {list(df_donaciones.columns)}")
+
+    partida_ids = run_all_validations(df_donaciones, engine)
+
+    return build_donaciones_dfs(df_donaciones, partida_ids)
 
 
 def build_donaciones_sql(dfs_limpios: dict, engine: Engine) -> str:
@@ -45,22 +73,40 @@ def build_donaciones_sql(dfs_limpios: dict, engine: Engine) -> str:
         RuntimeError: si alguna validación falla
         KeyError: si la hoja DONACIONES no existe en dfs_limpios
     """
-    if "DONACIONES" not in dfs_limpios:
-        msg = (
-            "La hoja 'DONACIONES' no se encuentra en dfs_limpios. "
-            "Hojas disponibles: " + str(list(dfs_limpios.keys()))
-        )
-        logger.error(msg)
-        raise KeyError(msg)
+    df_ing, df_det, df_egr = _build_donaciones_dfs(dfs_limpios, engine)
 
-    df_donaciones = dfs_limpios["DONACIONES"]
-    logger.info(f"Hoja DONACIONES cargada: {len(df_donaciones)} filas")
-    logger.info(f"Columnas: {list(df_donaciones.columns)}")
+    ruta = export_donaciones_to_sql(df_ing, df_det, df_egr)
 
-    partida_ids = run_all_validations(df_donaciones, engine)
+    return ruta
 
-    df_ing, df_det, df_egr = build_donaciones_dfs(df_donaciones, partida_ids)
 
-    ruta = export_donaciones_to_sql(df_ing, df_det, df_egr)
+def build_donaciones_tsv(dfs_limpios: dict, engine: Engine) -> str:
+    """
+    Igual que build_donaciones_sql, pero el paso 4 genera los TSV y el
+    driver output/donaciones_load.sql (LOAD DATA LOCAL INFILE).
 
-    return ruta
+    Returns:
+        Ruta absoluta del driver .sql
+    """
+    df_ing, df_det, df_egr = _build_donaciones_dfs(dfs_limpios, engine)
+
+    return export_donaciones_to_tsv(df_ing, df_det, df_egr)
+
+
+def load_donaciones_to_db(
+    dfs_limpios: dict, engine: Engine, lote_filas: int = LOTE_FILAS
+) -> dict:
+    """
+    Igual que build_donaciones_sql, pero el paso 4 inserta las 3 tablas
+    directamente en la BD (utils/db_loader.py).
+
+    Returns:
+        {"ingresos": ids, "ingreso_detalles": ids, "egresos": ids}
+
+    Raises:
+        RuntimeError: si alguna validación falla
+        KeyError: si la hoja DONACIONES no existe en dfs_limpios
+    """
+    df_ing, df_det, df_egr = _build_donaciones_dfs(dfs_limpios, engine)
+
+    return export_donaciones_to_db(df_ing, df_det, df_egr, engine, lote_filas)
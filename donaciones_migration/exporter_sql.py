@@ -8,35 +8,91 @@ Cada fila de DONACIONES produce un bloque:
   INSERT ingresos     → SET @ingreso_id = LAST_INSERT_ID();
   INSERT ingreso_det  → SET @detalle_id = LAST_INSERT_ID();
   INSERT egresos      (usa @ingreso_id y @detalle_id)
+
+export_donaciones_to_tsv genera lo mismo para LOAD DATA (un TSV por tabla
+y un driver); export_donaciones_to_db lo carga directamente en la BD (modo
+--directo): las 3 tablas por lotes, enlazando con los ids generados en
+vez de variables MySQL.
 """
 
 import os
 from datetime import datetime
 
 import pandas as pd
+from sqlalchemy.engine import Engine
 
+from utils.db_loader import LOTE_FILAS, conectar, insert_dataframe
 from utils.logger import get_logger
+from utils.sql_render import iter_values
+from utils.sql_writer import (
+    SENTENCIAS_POR_TRANSACCION,
+    SqlStreamWriter,
+    cabecera_importacion,
+    insert_prefix,
+    iter_transacciones,
+    pie_importacion,
+)
+from utils.tsv_writer import (
+    load_data_statement,
+    ruta_driver,
+    write_load_script,
+    write_tsv,
+)
 
 logger = get_logger()
 
 _OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "..", "output")
 
-
-def _v(valor, quote: bool = False) -> str:
-    """Formatea un valor para SQL: NULL, número o 'cadena'."""
-    if valor is None:
-        return "NULL"
-    try:
-        if pd.isna(valor):
-            return "NULL"
-    except Exception:
-        pass
-    s = str(valor).strip()
-    if s in ("", "None", "nan", "NaN"):
-        return "NULL"
-    if quote:
-        return "'" + s.replace("'", "''") + "'"
-    return s
+# (columna, quote) en el orden de cada INSERT; ingreso_id e
+# ingreso_detalle_id se enlazan con @ingreso_id / @detalle_id
+_COLUMNAS_INGRESOS = [
+    ("codigo", True),
+    ("donacion", True),
+    ("almacen_id", False),
+    ("unidad_id", False),
+    ("proveedor", True),
+    ("con_fondos", True),
+    ("fecha_nota", True),
+    ("nro_factura", True),
+    ("fecha_factura", True),
+    ("pedido_interno", True),
+    ("total", False),
+    ("fecha_ingreso", True),
+    ("hora_ingreso", True),
+    ("observaciones", True),
+    ("para", True),
+    ("fecha_registro", True),
+    ("user_id", False),
+    ("created_at", True),
+    ("updated_at", True),
+    ("etapa_ingreso", True),
+]
+_COLUMNAS_DETALLES = [
+    ("almacen_id", False),
+    ("unidad_id", False),
+    ("partida_id", False),
+    ("donacion", True),
+    ("item_id", False),
+    ("unidad_medida_id", False),
+    ("cantidad", False),
+    ("costo", False),
+    ("total", False),
+    ("created_at", True),
+    ("updated_at", True),
+]
+_COLUMNAS_EGRESOS = [
+    ("almacen_id", False),
+    ("partida_id", False),
+    ("item_id", False),
+    ("destino_id", False),
+    ("cantidad", False),
+    ("costo", False),
+    ("total", False),
+    ("fecha_registro", True),
+    ("editable", False),
+    ("created_at", True),
+    ("updated_at", True),
+]
 
 
 def export_donaciones_to_sql(
@@ -44,6 +100,7 @@ def export_donaciones_to_sql(
     df_ingreso_detalles: pd.DataFrame,
     df_egresos: pd.DataFrame,
     filename: str = "donaciones.sql",
+    sentencias_por_transaccion: int = SENTENCIAS_POR_TRANSACCION,
 ) -> str:
     """
     Genera un único archivo SQL con INSERTs encadenados para las 3 tablas.
@@ -53,6 +110,9 @@ def export_donaciones_to_sql(
         df_ingreso_detalles:  DataFrame de ingreso_detalles DONACIONES
         df_egresos:           DataFrame de egresos DONACIONES
         filename:             nombre del archivo en output/
+        sentencias_por_transaccion: INSERTs por bloque START TRANSACTION /
+                              COMMIT (se redondea a filas completas de 3
+                              INSERTs; 0 = formato clásico)
 
     Returns:
         Ruta absoluta del archivo generado
@@ -71,107 +131,171 @@ def export_donaciones_to_sql(
     lineas.append("-- Cada fila genera 1 ingreso + 1 ingreso_detalle + 1 egreso")
     lineas.append("-- ============================================================")
     lineas.append("")
-    lineas.append("SET NAMES utf8mb4;")
-    lineas.append("SET FOREIGN_KEY_CHECKS = 0;")
+    rapida = sentencias_por_transaccion > 0
+    lineas.extend(cabecera_importacion(rapida))
     lineas.append("")
 
-    for i in range(n):
-        ing = df_ingresos.iloc[i]
-        det = df_ingreso_detalles.iloc[i]
-        egr = df_egresos.iloc[i]
-
-        lineas.append(f"-- ---- Fila {i + 1} / {n} ----")
-
-        # ---- INSERT ingresos ----
-        lineas.append(
-            "INSERT INTO `ingresos` "
-            "(`codigo`, `donacion`, `almacen_id`, `unidad_id`, `proveedor`, "
-            "`con_fondos`, `fecha_nota`, `nro_factura`, `fecha_factura`, "
-            "`pedido_interno`, `total`, `fecha_ingreso`, `hora_ingreso`, "
-            "`observaciones`, `para`, `fecha_registro`, `user_id`, "
-            "`created_at`, `updated_at`, `etapa_ingreso`) "
-            "VALUES ("
-            f"{_v(ing.get('codigo'), quote=True)}, "
-            f"{_v(ing.get('donacion'), quote=True)}, "
-            f"{_v(ing.get('almacen_id'))}, "
-            f"{_v(ing.get('unidad_id'))}, "
-            f"{_v(ing.get('proveedor'), quote=True)}, "
-            f"{_v(ing.get('con_fondos'), quote=True)}, "
-            f"{_v(ing.get('fecha_nota'), quote=True)}, "
-            f"{_v(ing.get('nro_factura'), quote=True)}, "
-            f"{_v(ing.get('fecha_factura'), quote=True)}, "
-            f"{_v(ing.get('pedido_interno'), quote=True)}, "
-            f"{_v(ing.get('total'))}, "
-            f"{_v(ing.get('fecha_ingreso'), quote=True)}, "
-            f"{_v(ing.get('hora_ingreso'), quote=True)}, "
-            f"{_v(ing.get('observaciones'), quote=True)}, "
-            f"{_v(ing.get('para'), quote=True)}, "
-            f"{_v(ing.get('fecha_registro'), quote=True)}, "
-            f"{_v(ing.get('user_id'))}, "
-            f"{_v(ing.get('created_at'), quote=True)}, "
-            f"{_v(ing.get('updated_at'), quote=True)}, "
-            f"{_v(ing.get('etapa_ingreso'), quote=True)}"
-            ");"
-        )
-        lineas.append("SET @ingreso_id = LAST_INSERT_ID();")
-        lineas.append("")
-
-        # ---- INSERT ingreso_detalles ----
-        lineas.append(
-            "INSERT INTO `ingreso_detalles` "
-            "(`ingreso_id`, `almacen_id`, `unidad_id`, `partida_id`, `donacion`, "
-            "`item_id`, `unidad_medida_id`, `cantidad`, `costo`, `total`, "
-            "`created_at`, `updated_at`) "
-            "VALUES ("
-            "@ingreso_id, "
-            f"{_v(det.get('almacen_id'))}, "
-            f"{_v(det.get('unidad_id'))}, "
-            f"{_v(det.get('partida_id'))}, "
-            f"{_v(det.get('donacion'), quote=True)}, "
-            f"{_v(det.get('item_id'))}, "
-            f"{_v(det.get('unidad_medida_id'))}, "
-            f"{_v(det.get('cantidad'))}, "
-            f"{_v(det.get('costo'))}, "
-            f"{_v(det.get('total'))}, "
-            f"{_v(det.get('created_at'), quote=True)}, "
-            f"{_v(det.get('updated_at'), quote=True)}"
-            ");"
-        )
-        lineas.append("SET @detalle_id = LAST_INSERT_ID();")
-        lineas.append("")
-
-        # ---- INSERT egresos ----
-        lineas.append(
-            "INSERT INTO `egresos` "
-            "(`ingreso_id`, `ingreso_detalle_id`, `almacen_id`, `partida_id`, "
-            "`item_id`, `destino_id`, `cantidad`, `costo`, `total`, "
-            "`fecha_registro`, `editable`, `created_at`, `updated_at`) "
-            "VALUES ("
-            "@ingreso_id, "
-            "@detalle_id, "
-            f"{_v(egr.get('almacen_id'))}, "
-            f"{_v(egr.get('partida_id'))}, "
-            f"{_v(egr.get('item_id'))}, "
-            f"{_v(egr.get('destino_id'))}, "
-            f"{_v(egr.get('cantidad'))}, "
-            f"{_v(egr.get('costo'))}, "
-            f"{_v(egr.get('total'))}, "
-            f"{_v(egr.get('fecha_registro'), quote=True)}, "
-            f"{_v(egr.get('editable'))}, "
-            f"{_v(egr.get('created_at'), quote=True)}, "
-            f"{_v(egr.get('updated_at'), quote=True)}"
-            ");"
-        )
-        lineas.append("")
+    valores_ing = iter_values(df_ingresos, _COLUMNAS_INGRESOS)
+    valores_det = iter_values(df_ingreso_detalles, _COLUMNAS_DETALLES)
+    valores_egr = iter_values(df_egresos, _COLUMNAS_EGRESOS)
 
-    lineas.append("SET FOREIGN_KEY_CHECKS = 1;")
-    lineas.append("")
+    insert_ing = insert_prefix("ingresos", [c for c, _ in _COLUMNAS_INGRESOS])
+    insert_det = insert_prefix(
+        "ingreso_detalles", ["ingreso_id"] + [c for c, _ in _COLUMNAS_DETALLES]
+    )
+    insert_egr = insert_prefix(
+        "egresos",
+        ["ingreso_id", "ingreso_detalle_id"] + [c for c, _ in _COLUMNAS_EGRESOS],
+    )
+
+    def bloques():
+        for i, (ing, det, egr) in enumerate(
+            zip(valores_ing, valores_det, valores_egr)
+        ):
+            yield "\n".join(
+                [
+                    f"-- ---- Fila {i + 1} / {n} ----",
+                    # ---- INSERT ingresos ----
+                    f"{insert_ing} VALUES ({ing});",
+                    "SET @ingreso_id = LAST_INSERT_ID();",
+                    "",
+                    # ---- INSERT ingreso_detalles ----
+                    f"{insert_det} VALUES (@ingreso_id, {det});",
+                    "SET @detalle_id = LAST_INSERT_ID();",
+                    "",
+                    # ---- INSERT egresos ----
+                    f"{insert_egr} VALUES (@ingreso_id, @detalle_id, {egr});",
+                    "",
+                ]
+            )
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write("\n".join(lineas))
+    # Cada bloque (fila) son 3 INSERTs; una transacción nunca corta un bloque
+    filas_por_transaccion = (
+        max(sentencias_por_transaccion // 3, 1) if rapida else 0
+    )
+
+    # Solo la cabecera vive en memoria; los bloques por fila se renderizan
+    # por tramos y se vuelcan al archivo a medida que se generan
+    with SqlStreamWriter(output_path) as writer:
+        writer.write_lines(lineas)
+        writer.write_lines(iter_transacciones(bloques(), filas_por_transaccion))
+        writer.write_lines([*pie_importacion(rapida), ""])
 
     logger.info(
         f"SQL generado: {output_path} "
         f"({n} ingresos + {n} ingreso_detalles + {n} egresos = {n * 3} INSERTs)"
     )
     return output_path
+
+
+def export_donaciones_to_tsv(
+    df_ingresos: pd.DataFrame,
+    df_ingreso_detalles: pd.DataFrame,
+    df_egresos: pd.DataFrame,
+    filename: str = "donaciones.tsv",
+) -> str:
+    """
+    Genera un TSV por tabla (donaciones_ingresos.tsv,
+    donaciones_ingreso_detalles.tsv, donaciones_egresos.tsv) y el driver
+    output/donaciones_load.sql.
+
+    Sin INSERT por fila no hay LAST_INSERT_ID() por fila: tras cargar cada
+    tabla, LAST_INSERT_ID() es el id de su primera fila, y los detalles y
+    egresos leen su posición (_pos) en @pos para enlazarse con
+    @ingreso_id + @pos y @detalle_id + @pos. Esto supone ids consecutivos
+    dentro de cada LOAD DATA (auto_increment_increment = 1 y nadie más
+    insertando en esas tablas durante la carga, lo mismo que ya asume la
+    migración con ingresos id > 6).
+
+    Returns:
+        Ruta absoluta del driver .sql
+    """
+    os.makedirs(_OUTPUT_DIR, exist_ok=True)
+    base = os.path.splitext(os.path.join(_OUTPUT_DIR, filename))[0]
+    ing_path = f"{base}_ingresos.tsv"
+    det_path = f"{base}_ingreso_detalles.tsv"
+    egr_path = f"{base}_egresos.tsv"
+
+    write_tsv(df_ingresos, _COLUMNAS_INGRESOS, ing_path)
+    write_tsv(df_ingreso_detalles, [("_pos", False)] + _COLUMNAS_DETALLES, det_path)
+    write_tsv(df_egresos, [("_pos", False)] + _COLUMNAS_EGRESOS, egr_path)
+
+    sentencias = [
+        load_data_statement("ingresos", ing_path, [c for c, _ in _COLUMNAS_INGRESOS]),
+        "SET @ingreso_id = LAST_INSERT_ID();",
+        load_data_statement(
+            "ingreso_detalles",
+            det_path,
+            ["@pos"] + [c for c, _ in _COLUMNAS_DETALLES],
+            ["`ingreso_id` = @ingreso_id + @pos"],
+        ),
+        "SET @detalle_id = LAST_INSERT_ID();",
+        load_data_statement(
+            "egresos",
+            egr_path,
+            ["@pos"] + [c for c, _ in _COLUMNAS_EGRESOS],
+            [
+                "`ingreso_id` = @ingreso_id + @pos",
+                "`ingreso_detalle_id` = @detalle_id + @pos",
+            ],
+        ),
+    ]
+    n = len(df_ingresos)
+    driver = write_load_script(
+        ruta_driver(os.path.join(_OUTPUT_DIR, filename)),
+        "DONACIONES — ingresos + ingreso_detalles + egresos",
+        sentencias,
+        n,
+    )
+
+    logger.info(
+        f"TSV generados: {ing_path}, {det_path}, {egr_path} "
+        f"({n} ingresos + {n} ingreso_detalles + {n} egresos)"
+    )
+    return driver
+
+
+def export_donaciones_to_db(
+    df_ingresos: pd.DataFrame,
+    df_ingreso_detalles: pd.DataFrame,
+    df_egresos: pd.DataFrame,
+    engine: Engine,
+    lote_filas: int = LOTE_FILAS,
+) -> dict[str, pd.Series]:
+    """
+    Inserta las 3 tablas de DONACIONES directamente en la BD. Las filas de
+    los 3 DataFrames están alineadas 1:1, así que cada detalle usa el id del
+    ingreso de su misma posición, y cada egreso los de ambos.
+
+    Returns:
+        {"ingresos": ids, "ingreso_detalles": ids, "egresos": ids}
+    """
+    with conectar(engine) as conn:
+        ids_ing = insert_dataframe(
+            conn, "ingresos", df_ingresos, _COLUMNAS_INGRESOS, lote_filas
+        )
+        ids_det = insert_dataframe(
+            conn,
+            "ingreso_detalles",
+            df_ingreso_detalles.assign(ingreso_id=ids_ing),
+            [("ingreso_id", False)] + _COLUMNAS_DETALLES,
+            lote_filas,
+        )
+        ids_egr = insert_dataframe(
+            conn,
+            "egresos",
+            df_egresos.assign(ingreso_id=ids_ing, ingreso_detalle_id=ids_det),
+            [("ingreso_id", False), ("ingreso_detalle_id", False)] + _COLUMNAS_EGRESOS,
+            lote_filas,
+        )
+
+    n = len(df_ingresos)
+    logger.info(
+        f"DONACIONES insertadas en la BD: {n} ingresos + {n} ingreso_detalles "
+        f"+ {n} egresos"
+    )
+    return {
+        "ingresos": pd.Series(ids_ing, name="id"),
+        "ingreso_detalles": pd.Series(ids_det, name="id"),
+        "egresos": pd.Series(ids_egr, name="id"),
+    }
@@ -12,10 +12,12 @@ en cada una de las 3 tablas, enlazadas entre sí.
 
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
 
 from donaciones_migration.validator import ALMACEN_ID_DONACION, USER_ID_ADMIN
 from utils.logger import get_logger
+from utils.numeros import a_numeros
 
 logger = get_logger()
 
@@ -23,19 +25,6 @@ _COL_INGRESO = "INGRESO EN LA GESTION 2025"
 _COL_SALIDA = "SALIDA EN LA GESTION 2025"
 
 
-def _to_num(val, default=0):
-    """Convierte a número; retorna default si no es posible."""
-    try:
-        if pd.isna(val):
-            return default
-    except Exception:
-        pass
-    try:
-        return float(str(val).replace(",", ".").strip())
-    except (ValueError, TypeError):
-        return default
-
-
 def build_donaciones_dfs(
     df_donaciones: pd.DataFrame,
     partida_ids: list[int],
@@ -56,74 +45,76 @@ def build_donaciones_dfs(
     updated_at = ahora.strftime("%Y-%m-%d %H:%M:%S")
 
     n = len(df_donaciones)
+    # Los valores fijos se pasan como escalares: el constructor los repite
+    # sobre el índice, sin armar listas de largo n
+    indice = pd.RangeIndex(n)
 
-    totales_ingreso = [
-        _to_num(df_donaciones.iloc[i].get(_COL_INGRESO), 0) for i in range(n)
-    ]
-    totales_salida = [
-        _to_num(df_donaciones.iloc[i].get(_COL_SALIDA), 0) for i in range(n)
-    ]
+    totales_ingreso = a_numeros(df_donaciones, _COL_INGRESO)
+    totales_salida = a_numeros(df_donaciones, _COL_SALIDA)
 
     # ---- DataFrame 1: ingresos ----
     df_ingresos = pd.DataFrame(
         {
-            "codigo": ["XXX"] * n,
-            "donacion": ["SI"] * n,
-            "almacen_id": [ALMACEN_ID_DONACION] * n,
-            "unidad_id": [None] * n,
-            "proveedor": [None] * n,
-            "con_fondos": [None] * n,
-            "fecha_nota": [None] * n,
-            "nro_factura": [None] * n,
-            "fecha_factura": [None] * n,
-            "pedido_interno": [None] * n,
+            "codigo": "XXX",
+            "donacion": "SI",
+            "almacen_id": ALMACEN_ID_DONACION,
+            "unidad_id": None,
+            "proveedor": None,
+            "con_fondos": None,
+            "fecha_nota": None,
+            "nro_factura": None,
+            "fecha_factura": None,
+            "pedido_interno": None,
             "total": totales_ingreso,
-            "fecha_ingreso": [None] * n,
-            "hora_ingreso": [None] * n,
-            "observaciones": [None] * n,
-            "para": [None] * n,
-            "fecha_registro": [fecha_registro] * n,
-            "user_id": [USER_ID_ADMIN] * n,
-            "created_at": [created_at] * n,
-            "updated_at": [updated_at] * n,
-            "etapa_ingreso": ["2025"] * n,
-        }
+            "fecha_ingreso": None,
+            "hora_ingreso": None,
+            "observaciones": None,
+            "para": None,
+            "fecha_registro": fecha_registro,
+            "user_id": USER_ID_ADMIN,
+            "created_at": created_at,
+            "updated_at": updated_at,
+            "etapa_ingreso": "2025",
+        },
+        index=indice,
     )
 
     # ---- DataFrame 2: ingreso_detalles ----
     df_ingreso_detalles = pd.DataFrame(
         {
-            "_pos": list(range(n)),
-            "almacen_id": [ALMACEN_ID_DONACION] * n,
-            "unidad_id": [None] * n,
+            "_pos": np.arange(n),
+            "almacen_id": ALMACEN_ID_DONACION,
+            "unidad_id": None,
             "partida_id": partida_ids,
-            "donacion": ["SI"] * n,
-            "item_id": [None] * n,
-            "unidad_medida_id": [None] * n,
-            "cantidad": [None] * n,
-            "costo": [None] * n,
+            "donacion": "SI",
+            "item_id": None,
+            "unidad_medida_id": None,
+            "cantidad": None,
+            "costo": None,
             "total": totales_ingreso,
-            "created_at": [created_at] * n,
-            "updated_at": [updated_at] * n,
-        }
+            "created_at": created_at,
+            "updated_at": updated_at,
+        },
+        index=indice,
     )
 
     # ---- DataFrame 3: egresos ----
     df_egresos = pd.DataFrame(
         {
-            "_pos": list(range(n)),
-            "almacen_id": [ALMACEN_ID_DONACION] * n,
+            "_pos": np.arange(n),
+            "almacen_id": ALMACEN_ID_DONACION,
             "partida_id": partida_ids,
-            "item_id": [None] * n,
-            "destino_id": [None] * n,
-            "cantidad": [None] * n,
-            "costo": [None] * n,
+            "item_id": None,
+            "destino_id": None,
+            "cantidad": None,
+            "costo": None,
             "total": totales_salida,
-            "fecha_registro": [fecha_registro] * n,
-            "editable": [1] * n,
-            "created_at": [created_at] * n,
-            "updated_at": [updated_at] * n,
-        }
+            "fecha_registro": fecha_registro,
+            "editable": 1,
+            "created_at": created_at,
+            "updated_at": updated_at,
+        },
+        index=indice,
     )
 
     logger.info(
@@ -8,10 +8,17 @@ Verifica:
   1. almacen_id = 25 → nombre = "DONACION SIN ALMACEN"
   2. user_id = 1    → usuario = "admin"
   3. Cada PARTIDA del Excel tiene exactamente 1 match en tabla partidas
+
+run_all_validations usa una sola conexión y un número fijo de consultas:
+una para el almacén, una para el usuario y una para TODAS las partidas
+(las claves distintas del Excel van en una tabla derivada que se cruza con
+partidas y se agrupa con COUNT, así los 0 y los >1 matches salen de la
+misma consulta). Los problemas de partidas se reportan todos juntos.
 """
 
+import numpy as np
 import pandas as pd
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Connection, Engine
 from sqlalchemy import text
 
 from utils.logger import get_logger
@@ -22,13 +29,11 @@ ALMACEN_ID_DONACION = 25
 USER_ID_ADMIN = 1
 
 
-def validate_almacen(engine: Engine) -> None:
-    """Verifica que almacen_id=25 corresponda a 'DONACION SIN ALMACEN'."""
-    with engine.connect() as conn:
-        row = conn.execute(
-            text("SELECT nombre FROM almacens WHERE id = :id"),
-            {"id": ALMACEN_ID_DONACION},
-        ).fetchone()
+def _validate_almacen(conn: Connection) -> None:
+    row = conn.execute(
+        text("SELECT nombre FROM almacens WHERE id = :id"),
+        {"id": ALMACEN_ID_DONACION},
+    ).fetchone()
 
     if row is None:
         msg = (
@@ -53,13 +58,17 @@ def validate_almacen(engine: Engine) -> None:
     )
 
 
-def validate_user(engine: Engine) -> None:
-    """Verifica que user_id=1 corresponda al usuario 'admin'."""
+def validate_almacen(engine: Engine) -> None:
+    """Verifica que almacen_id=25 corresponda a 'DONACION SIN ALMACEN'."""
     with engine.connect() as conn:
-        row = conn.execute(
-            text("SELECT usuario FROM users WHERE id = :id"),
-            {"id": USER_ID_ADMIN},
-        ).fetchone()
+        _validate_almacen(conn)
+
+
+def _validate_user(conn: Connection) -> None:
+    row = conn.execute(
+        text("SELECT usuario FROM users WHERE id = :id"),
+        {"id": USER_ID_ADMIN},
+    ).fetchone()
 
     if row is None:
         msg = (
@@ -81,79 +90,130 @@ def validate_user(engine: Engine) -> None:
     logger.info(f"Usuario id={USER_ID_ADMIN} verificado: '{row[0]}'")
 
 
-def resolve_partida_ids(
-    df_donaciones: pd.DataFrame, engine: Engine
-) -> list[int]:
+def validate_user(engine: Engine) -> None:
+    """Verifica que user_id=1 corresponda al usuario 'admin'."""
+    with engine.connect() as conn:
+        _validate_user(conn)
+
+
+def _partidas_excel(df_donaciones: pd.DataFrame) -> pd.Series:
     """
-    Para cada fila de DONACIONES, busca el nro_partida en la tabla
-    partidas y devuelve una lista de partida_id (mismo orden que df).
+    PARTIDA de cada fila como texto sin espacios en los extremos (la clave
+    es su versión en minúsculas, como LOWER(TRIM(nro_partida)) en la BD).
 
-    Lanza excepción si alguna partida no se encuentra o tiene duplicados.
+    Lanza excepción si alguna fila tiene PARTIDA vacía/nula.
     """
-    partida_ids: list[int] = []
-    cache: dict[str, int] = {}
+    if "PARTIDA" in df_donaciones.columns:
+        partidas = df_donaciones["PARTIDA"]
+    else:
+        partidas = pd.Series(None, index=df_donaciones.index, dtype=object)
+    texto = partidas.astype(object).where(partidas.notna(), "").astype(str).str.strip()
+
+    vacias = texto == ""
+    if vacias.any():
+        filas = ", ".join(str(idx) for idx in texto.index[vacias])
+        msg = (
+            f"{int(vacias.sum())} fila(s) de DONACIONES tienen PARTIDA vacía/nula "
+            f"(filas {filas}). No se puede continuar."
+        )
+        logger.error(msg)
+        raise RuntimeError(msg)
 
-    with engine.connect() as conn:
-        for idx, row in df_donaciones.iterrows():
-            raw = row.get("PARTIDA")
-            if pd.isna(raw) or str(raw).strip() == "":
-                msg = (
-                    f"Fila {idx} de DONACIONES tiene PARTIDA vacía/nula. "
-                    "No se puede continuar."
-                )
-                logger.error(msg)
-                raise RuntimeError(msg)
-
-            nro = str(raw).strip()
-            nro_norm = nro.lower()
-
-            if nro_norm in cache:
-                partida_ids.append(cache[nro_norm])
-                continue
-
-            rows = conn.execute(
-                text(
-                    "SELECT id FROM partidas "
-                    "WHERE LOWER(TRIM(nro_partida)) = :nro"
-                ),
-                {"nro": nro_norm},
-            ).fetchall()
-
-            if len(rows) == 0:
-                msg = (
-                    f"No se encontró la partida '{nro}' en la tabla partidas "
-                    f"(fila {idx} de DONACIONES). No se puede continuar."
-                )
-                logger.error(msg)
-                raise RuntimeError(msg)
-
-            if len(rows) > 1:
-                msg = (
-                    f"Se encontraron {len(rows)} partidas para '{nro}' "
-                    f"en la tabla partidas (fila {idx} de DONACIONES). "
-                    "Se esperaba exactamente 1. No se puede continuar."
-                )
-                logger.error(msg)
-                raise RuntimeError(msg)
-
-            pid = int(rows[0][0])
-            cache[nro_norm] = pid
-            partida_ids.append(pid)
+    return pd.Series(texto.tolist(), index=texto.index, dtype=object)
+
+
+def _buscar_partidas(conn: Connection, claves: list[str]) -> list[tuple[int, int | None]]:
+    """
+    (cantidad de matches, id más bajo) de cada clave, en el mismo orden,
+    con una sola consulta; las claves sin match vienen con cantidad 0.
+    """
+    if not claves:
+        return []
+    # Se agrupa por posición y no por el texto, para que la collation de
+    # la BD no junte dos claves distintas
+    tabla_claves = " UNION ALL ".join(
+        f"SELECT {i} AS pos, :k{i} AS clave" for i in range(len(claves))
+    )
+    rows = conn.execute(
+        text(
+            "SELECT k.pos, COUNT(p.id), MIN(p.id) "
+            f"FROM ({tabla_claves}) AS k "
+            "LEFT JOIN partidas p ON LOWER(TRIM(p.nro_partida)) = k.clave "
+            "GROUP BY k.pos"
+        ),
+        {f"k{i}": clave for i, clave in enumerate(claves)},
+    ).fetchall()
+    encontradas = [(0, None)] * len(claves)
+    for pos, cantidad, pid in rows:
+        encontradas[int(pos)] = (int(cantidad), pid)
+    return encontradas
+
+
+def _resolve_partida_ids(conn: Connection, df_donaciones: pd.DataFrame) -> list[int]:
+    partidas = _partidas_excel(df_donaciones)
+    codigos, claves = pd.factorize(partidas.str.lower())
+    encontradas = _buscar_partidas(conn, claves.tolist())
+
+    errores = []
+    # Primera fila y valor original de cada clave (para los mensajes)
+    _, primeras = np.unique(codigos, return_index=True)
+    for (cantidad, _), pos in zip(encontradas, primeras.tolist()):
+        idx, nro = partidas.index[pos], partidas.iloc[pos]
+        if cantidad == 0:
+            errores.append(
+                f"No se encontró la partida '{nro}' en la tabla partidas "
+                f"(fila {idx} de DONACIONES)."
+            )
+        elif cantidad > 1:
+            errores.append(
+                f"Se encontraron {cantidad} partidas para '{nro}' "
+                f"en la tabla partidas (fila {idx} de DONACIONES). "
+                "Se esperaba exactamente 1."
+            )
+
+    if errores:
+        for error in errores:
+            logger.error(error)
+        msg = (
+            f"{len(errores)} partida(s) de DONACIONES sin un único match en la "
+            "tabla partidas:\n" + "\n".join(errores) + "\nNo se puede continuar."
+        )
+        raise RuntimeError(msg)
+
+    ids = np.array([int(pid) for _, pid in encontradas], dtype=np.int64)
+    partida_ids = ids[codigos].tolist()
 
     logger.info(
         f"Partidas resueltas: {len(partida_ids)} filas, "
-        f"{len(cache)} partidas únicas"
+        f"{len(claves)} partidas únicas"
     )
     return partida_ids
 
 
+def resolve_partida_ids(
+    df_donaciones: pd.DataFrame, engine: Engine
+) -> list[int]:
+    """
+    Para cada fila de DONACIONES, busca el nro_partida en la tabla
+    partidas y devuelve una lista de partida_id (mismo orden que df).
+
+    Lanza excepción si alguna partida no se encuentra o tiene duplicados
+    (con todas las partidas en ese caso, no solo la primera).
+    """
+    with engine.connect() as conn:
+        return _resolve_partida_ids(conn, df_donaciones)
+
+
 def run_all_validations(
     df_donaciones: pd.DataFrame, engine: Engine
 ) -> list[int]:
     """
     Ejecuta todas las validaciones y retorna la lista de partida_ids.
     Si cualquier validación falla, lanza excepción deteniendo todo.
+
+    Todas las consultas van por la misma conexión (3 en total).
     """
-    validate_almacen(engine)
-    validate_user(engine)
-    return resolve_partida_ids(df_donaciones, engine)
+    with engine.connect() as conn:
+        _validate_almacen(conn)
+        _validate_user(conn)
+        return _resolve_partida_ids(conn, df_donaciones)
@@ -1,41 +1,65 @@
 """
 egresos_migration.exporter_sql
 ===============================
-Genera output/egresos.sql con INSERTs en la tabla `egresos`.
+Genera output/egresos.sql con INSERTs en la tabla `egresos`,
+output/egresos.tsv + egresos_load.sql (LOAD DATA, export_egresos_to_tsv),
+o los inserta directamente en la BD (export_egresos_to_db, modo --directo).
 """
 
 import os
 from datetime import datetime
 
 import pandas as pd
+from sqlalchemy.engine import Engine
 
+from utils.db_loader import LOTE_FILAS, conectar, insert_dataframe
 from utils.logger import get_logger
+from utils.sql_render import iter_rows
+from utils.sql_writer import (
+    MAX_BYTES_INSERT,
+    SENTENCIAS_POR_TRANSACCION,
+    SqlStreamWriter,
+    cabecera_importacion,
+    iter_insert_statements,
+    iter_transacciones,
+    pie_importacion,
+)
+from utils.tsv_writer import (
+    load_data_statement,
+    ruta_driver,
+    write_load_script,
+    write_tsv,
+)
 
 logger = get_logger()
 
 _OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "..", "output")
 
-
-def _v(valor, quote: bool = False) -> str:
-    """Formatea un valor para SQL: NULL, número o 'cadena'."""
-    if valor is None:
-        return "NULL"
-    try:
-        if pd.isna(valor):
-            return "NULL"
-    except Exception:
-        pass
-    s = str(valor).strip()
-    if s in ("", "None", "nan", "NaN"):
-        return "NULL"
-    if quote:
-        return "'" + s.replace("'", "''") + "'"
-    return s
+# (columna, quote) en el orden del INSERT
+_COLUMNAS_SQL = [
+    ("ingreso_id", False),
+    ("ingreso_detalle_id", False),
+    ("almacen_id", False),
+    ("partida_id", False),
+    ("item_id", False),
+    ("destino_id", False),
+    ("cantidad", False),
+    ("costo", False),
+    ("total", False),
+    ("fecha_registro", True),
+    ("editable", False),
+    ("created_at", True),
+    ("updated_at", True),
+]
+_COLUMNAS = [c for c, _ in _COLUMNAS_SQL]
 
 
 def export_egresos_to_sql(
     df: pd.DataFrame,
     filename: str = "egresos.sql",
+    filas_por_insert: int = 1,
+    max_bytes_insert: int = MAX_BYTES_INSERT,
+    sentencias_por_transaccion: int = SENTENCIAS_POR_TRANSACCION,
 ) -> str:
     """
     Genera el archivo SQL para `egresos`.
@@ -43,6 +67,11 @@ def export_egresos_to_sql(
     Args:
         df:      DataFrame de build_egresos_df()
         filename: nombre del archivo en output/
+        filas_por_insert: filas por sentencia INSERT (1 = una por fila)
+        max_bytes_insert: tamaño máximo en bytes de cada sentencia INSERT
+        sentencias_por_transaccion: sentencias por bloque START TRANSACTION /
+                          COMMIT del perfil de importación rápida (0 = formato
+                          clásico, ver utils/sql_writer.py)
 
     Returns:
         Ruta absoluta del archivo generado
@@ -59,41 +88,64 @@ def export_egresos_to_sql(
     lineas.append(f"-- Total de registros: {len(df)}")
     lineas.append("-- ============================================================")
     lineas.append("")
-    lineas.append("SET NAMES utf8mb4;")
-    lineas.append("SET FOREIGN_KEY_CHECKS = 0;")
+    rapida = sentencias_por_transaccion > 0
+    lineas.extend(cabecera_importacion(rapida))
     lineas.append("")
     lineas.append("-- ---- INSERT egresos ----")
 
-    for _, row in df.iterrows():
-        insert = (
-            "INSERT INTO `egresos` "
-            "(`ingreso_id`, `ingreso_detalle_id`, `almacen_id`, `partida_id`, `item_id`, "
-            "`destino_id`, `cantidad`, `costo`, `total`, `fecha_registro`, `editable`, "
-            "`created_at`, `updated_at`) "
-            "VALUES ("
-            f"{_v(row.get('ingreso_id'))}, "
-            f"{_v(row.get('ingreso_detalle_id'))}, "
-            f"{_v(row.get('almacen_id'))}, "
-            f"{_v(row.get('partida_id'))}, "
-            f"{_v(row.get('item_id'))}, "
-            f"{_v(row.get('destino_id'))}, "
-            f"{_v(row.get('cantidad'))}, "
-            f"{_v(row.get('costo'))}, "
-            f"{_v(row.get('total'))}, "
-            f"{_v(row.get('fecha_registro'), quote=True)}, "
-            f"{_v(row.get('editable'))}, "
-            f"{_v(row.get('created_at'), quote=True)}, "
-            f"{_v(row.get('updated_at'), quote=True)}"
-            ");"
+    # Solo la cabecera vive en memoria; los INSERTs se renderizan por
+    # bloques y se vuelcan al archivo a medida que se generan
+    tuplas = iter_rows(df, _COLUMNAS_SQL)
+    with SqlStreamWriter(output_path) as writer:
+        writer.write_lines(lineas)
+        writer.write_lines(
+            iter_transacciones(
+                iter_insert_statements(
+                    "egresos", _COLUMNAS, tuplas, filas_por_insert, max_bytes_insert
+                ),
+                sentencias_por_transaccion,
+            )
         )
-        lineas.append(insert)
-
-    lineas.append("")
-    lineas.append("SET FOREIGN_KEY_CHECKS = 1;")
-    lineas.append("")
-
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write("\n".join(lineas))
+        writer.write_lines(["", *pie_importacion(rapida), ""])
 
     logger.info(f"SQL generado: {output_path} ({len(df)} INSERTs)")
     return output_path
+
+
+def export_egresos_to_tsv(df: pd.DataFrame, filename: str = "egresos.tsv") -> str:
+    """
+    Genera output/egresos.tsv y el driver output/egresos_load.sql que lo
+    carga con LOAD DATA LOCAL INFILE (ver utils/tsv_writer.py).
+
+    Returns:
+        Ruta absoluta del driver .sql
+    """
+    os.makedirs(_OUTPUT_DIR, exist_ok=True)
+    tsv_path = os.path.join(_OUTPUT_DIR, filename)
+
+    write_tsv(df, _COLUMNAS_SQL, tsv_path)
+    driver = write_load_script(
+        ruta_driver(tsv_path),
+        "egresos",
+        [load_data_statement("egresos", tsv_path, _COLUMNAS)],
+        len(df),
+    )
+
+    logger.info(f"TSV generado: {tsv_path} ({len(df)} registros)")
+    return driver
+
+
+def export_egresos_to_db(
+    df: pd.DataFrame, engine: Engine, lote_filas: int = LOTE_FILAS
+) -> pd.Series:
+    """
+    Inserta el DataFrame de `egresos` directamente en la BD, por lotes.
+
+    Returns:
+        Series con el id generado de cada fila (alineada con df)
+    """
+    with conectar(engine) as conn:
+        ids = insert_dataframe(conn, "egresos", df, _COLUMNAS_SQL, lote_filas)
+
+    logger.info(f"egresos insertados en la BD: {len(df)} registros")
+    return pd.Series(ids, index=df.index, name="id")
@@ -9,7 +9,7 @@ Este módulo SOLO se encarga de "sacar" datos de:
 No hace cálculos de negocio, solo prepara tres cosas:
   1) Un DataFrame con todas las SALIDAS del Excel (por almacén)
   2) Un DataFrame con ingreso_detalles (id > 7)
-  3) Un diccionario item_id -> nombre de catalogo_items
+  3) catalogo_items (id, nombre y el nombre ya normalizado)
 """
 
 import json
@@ -19,6 +19,8 @@ import pandas as pd
 from sqlalchemy.engine import Engine
 from sqlalchemy import text
 
+from utils.texto import normalizar_serie
+
 _REL_PATH = os.path.join(
     os.path.dirname(__file__), "..", "utils", "tables.db.relation.json"
 )
@@ -100,6 +102,27 @@ def fetch_ingreso_detalles_gt7(engine: Engine) -> pd.DataFrame:
     )
 
 
+def fetch_catalogo_items(engine: Engine) -> pd.DataFrame:
+    """
+    Lee catalogo_items una sola vez, con el nombre normalizado ya calculado.
+
+    Devuelve un DataFrame con las columnas:
+      id, nombre (sin espacios en los extremos), nombre_norm
+    """
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text("SELECT id, nombre FROM catalogo_items")
+        ).fetchall()
+    df = pd.DataFrame(
+        {
+            "id": pd.Series([int(r[0]) for r in rows], dtype="int64"),
+            "nombre": pd.Series([(r[1] or "").strip() for r in rows], dtype=object),
+        }
+    )
+    df["nombre_norm"] = normalizar_serie(df["nombre"])
+    return df
+
+
 def fetch_catalogo_items_nombres(engine: Engine) -> dict[int, str]:
     """
     Devuelve un diccionario muy simple:
@@ -108,8 +131,5 @@ def fetch_catalogo_items_nombres(engine: Engine) -> dict[int, str]:
     Lo usamos para comparar DESCRIPCION (Excel) con nombre (DB),
     siempre en minúsculas.
     """
-    with engine.connect() as conn:
-        rows = conn.execute(
-            text("SELECT id, nombre FROM catalogo_items")
-        ).fetchall()
-    return {int(r[0]): (r[1] or "").strip() for r in rows}
+    df = fetch_catalogo_items(engine)
+    return dict(zip(df["id"].tolist(), df["nombre"]))
@@ -13,14 +13,24 @@ Y devuelve un DataFrame con la forma exacta de la tabla `egresos`,
 aplicando las validaciones que definiste:
   - (ingreso_id, ingreso_detalle_id) debe ser único
   - DESCRIPCION (Excel) debe coincidir con catalogo_items.nombre
+
+build_egresos_df trabaja por columnas: los dos DataFrames se alinean por
+posición, los nombres se normalizan por columnas (utils.texto.normalizar_serie;
+los de catalogo_items pueden llegar ya normalizados desde el extractor) y
+las validaciones se hacen sobre los arrays completos. Si algo falla se
+reportan TODAS las filas con problema en un solo error.
+verification/check_paridad_transformers.py la compara con la versión
+original fila por fila.
 """
 
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
 
 from utils.logger import get_logger
-import unicodedata
+from utils.numeros import a_numeros
+from utils.texto import normalizar_serie
 
 
 logger = get_logger()
@@ -29,63 +39,91 @@ _COL_CANT = "SALIDA_ALMACENES_CANT"
 _COL_VALOR = "SALIDA_ALMACENES_VALOR"
 _COL_TOTAL = "SALIDA_ALMACENES_TOTAL Bs."
 
+# Filas con problema que se detallan en el mensaje del ValueError
+# (el log las incluye todas)
+_MAX_ERRORES_MENSAJE = 10
 
-def _to_num(val, default=0):
-    """
-    Convierte valores del Excel (strings, números, NaN) a número flotante.
-    Si no se puede convertir, devuelve `default`.
-    """
-    try:
-        if pd.isna(val):
-            return default
-    except Exception:
-        pass
-    try:
-        return float(str(val).replace(",", ".").strip())
-    except (ValueError, TypeError):
-        return default
-
-
-def _norm(s) -> str:
-    """
-    Normaliza texto para comparar:
-      - convierte a string
-      - trim
-      - minúsculas
-      - elimina acentos/diacríticos (NFD)
-      - normaliza espacios
-    """
-    if s is None:
-        return ""
-    try:
-        if pd.isna(s):
-            return ""
-    except Exception:
-        pass
 
-    text = str(s).strip().lower()
+def _validar_entrada(df_ingreso_detalles: pd.DataFrame, df_limpio: pd.DataFrame) -> None:
+    """Mismo número de filas y columna DESCRIPCION presente; si no, ValueError."""
+    n_det = len(df_ingreso_detalles)
+    n_xls = len(df_limpio)
+    if n_det != n_xls:
+        msg = (
+            "No se puede construir egresos por posición porque el número de filas no coincide.\n"
+            f"- df_ingreso_detalles: {n_det} filas\n"
+            f"- df_limpio: {n_xls} filas\n"
+            "Solución: asegúrate de que ambos DataFrames estén alineados 1 a 1 y en el mismo orden."
+        )
+        logger.error(msg)
+        raise ValueError(msg)
+
+    if "DESCRIPCION" not in df_limpio.columns:
+        msg = "df_limpio no tiene la columna requerida 'DESCRIPCION'."
+        logger.error(msg)
+        raise ValueError(msg)
 
-    # 1) Separar letras de sus diacríticos (acentos)
-    text = unicodedata.normalize("NFD", text)
-    # 2) Quitar los diacríticos (categoría Mn)
-    text = "".join(ch for ch in text if unicodedata.category(ch) != "Mn")
-    # 3) Normalizar espacios (opcional, pero útil)
-    text = " ".join(text.split())
 
-    return text
+def _ids_opcionales(df: pd.DataFrame, columna: str) -> np.ndarray:
+    """
+    Columna de ids que admite NULL, con los mismos tipos que daba armar el
+    DataFrame desde dicts con int/None: int64 sin nulos, float64 con NaN si
+    hay alguno, objetos None si son todos nulos (o falta la columna).
+    """
+    if columna not in df.columns:
+        return np.full(len(df), None, dtype=object)
+    serie = df[columna]
+    nulos = serie.isna().to_numpy()
+    if nulos.all():
+        return np.full(len(df), None, dtype=object)
+    if not nulos.any() and pd.api.types.is_integer_dtype(serie):
+        return serie.to_numpy(dtype=np.int64)
+    enteros = np.trunc(serie.to_numpy(dtype=np.float64, na_value=np.nan))
+    return enteros if nulos.any() else enteros.astype(np.int64)
+
+
+def _error_duplicado(i: int, ingreso_id: int, ingreso_detalle_id: int) -> str:
+    return (
+        f"Duplicado detectado: (ingreso_id, ingreso_detalle_id)=({ingreso_id}, {ingreso_detalle_id}).\n"
+        f"- pos i={i}\n"
+    )
+
+
+def _error_descripcion(
+    i: int,
+    ingreso_id: int,
+    ingreso_detalle_id: int,
+    item_id: int,
+    desc_excel_raw,
+    desc_excel_norm: str,
+    nombre_item: str,
+    nombre_norm: str,
+) -> str:
+    return (
+        "Validación DESCRIPCION fallida por posición.\n"
+        f"- pos i={i}\n"
+        f"- ingreso_id={ingreso_id}, ingreso_detalle_id={ingreso_detalle_id}, item_id={item_id}\n"
+        f"- Excel.DESCRIPCION='{desc_excel_raw}' (norm='{desc_excel_norm}')\n"
+        f"- catalogo_items.nombre='{nombre_item}' (norm='{nombre_norm}')\n"
+    )
 
 
 def build_egresos_df(
     df_ingreso_detalles: pd.DataFrame,
     df_limpio: pd.DataFrame,
     item_id_to_nombre: dict[int, str],
+    nombres_norm: pd.Series | None = None,
 ) -> pd.DataFrame:
     """
     Construye el DataFrame final para la tabla `egresos`.
 
+    `nombres_norm` (opcional) es el nombre normalizado por item_id, la
+    columna nombre_norm de extractor.fetch_catalogo_items; si no se pasa,
+    se normalizan aquí los nombres de item_id_to_nombre.
+
     Resumen rápido:
-      1. Por cada fila de `ingreso_detalles` buscamos su fila gemela en el Excel en la misma posición
-         usando:
+      1. Cada fila de `ingreso_detalles` va con la fila del Excel en la misma
+         posición, y se valida:
              - DESCRIPCION normalizada == nombre del item (catalogo_items)
       2. Copiamos:
              SALIDA_ALMACENES_CANT  → cantidad
@@ -93,8 +131,9 @@ def build_egresos_df(
              SALIDA_ALMACENES_TOTAL Bs. → total
       3. Forzamos estas reglas:
            - (ingreso_id, ingreso_detalle_id) no se puede repetir
-           - si no hay coincidencia en Excel → error y se detiene
-           - si hay más de una coincidencia → error y se detiene
+           - la DESCRIPCION tiene que coincidir en todas las posiciones
+         Si alguna falla se registran todas las filas con problema y se
+         detiene con un único ValueError.
       4. Rellenamos destino_id = NULL, editable = 1 y fechas actuales.
     """
 
@@ -103,104 +142,90 @@ def build_egresos_df(
     created_at = ahora.strftime("%Y-%m-%d %H:%M:%S")
     updated_at = ahora.strftime("%Y-%m-%d %H:%M:%S")
 
-    # --- Validación: ambos DF deben tener el mismo número de filas ---
-    n_det = len(df_ingreso_detalles)
-    n_xls = len(df_limpio)
-    if n_det != n_xls:
-        msg = (
-            "No se puede construir egresos por posición porque el número de filas no coincide.\n"
-            f"- df_ingreso_detalles: {n_det} filas\n"
-            f"- df_limpio: {n_xls} filas\n"
-            "Solución: asegúrate de que ambos DataFrames estén alineados 1 a 1 y en el mismo orden."
-        )
-        logger.error(msg)
-        raise ValueError(msg)
-
-    # --- Preparamos df_limpio ---
-    df_limpio = df_limpio.copy()
-
-    if "DESCRIPCION" not in df_limpio.columns:
-        msg = "df_limpio no tiene la columna requerida 'DESCRIPCION'."
-        logger.error(msg)
-        raise ValueError(msg)
-
-    df_limpio["_desc_norm"] = df_limpio["DESCRIPCION"].map(_norm)
-
-    # --- Validación de unicidad de pares (ingreso_id, ingreso_detalle_id) ---
-    seen_pairs: set[tuple[int, int]] = set()
-
-    rows_out = []
-
-    # Recorremos por índice posicional (i)
-    for i, (_, det) in enumerate(df_ingreso_detalles.iterrows()):
-        # IDs principales
-        ingreso_id = int(det["ingreso_id"])
-        ingreso_detalle_id = int(det["id"])
-        pair = (ingreso_id, ingreso_detalle_id)
-
-        if pair in seen_pairs:
-            msg = (
-                f"Duplicado detectado: (ingreso_id, ingreso_detalle_id)=({ingreso_id}, {ingreso_detalle_id}).\n"
-                f"- pos i={i}\n"
-                "Cancelando ejecución."
-            )
-            logger.error(msg)
-            raise ValueError(msg)
-        seen_pairs.add(pair)
-
-        # Campos del detalle
-        almacen_id = int(det["almacen_id"]) if pd.notna(det["almacen_id"]) else None
-
-        partida_id = det["partida_id"] if pd.notna(det.get("partida_id", None)) else None
-        if partida_id is not None:
-            partida_id = int(partida_id)
-
-        item_id = int(det["item_id"])
-        nombre_item = item_id_to_nombre.get(item_id, "")
-        nombre_norm = _norm(nombre_item)
-
-        # 1) Tomamos la fila EXACTA del Excel por posición i
-        row_excel = df_limpio.iloc[i]
-
-        # 2) Validamos descripción
-        desc_excel_raw = row_excel.get("DESCRIPCION", "")
-        desc_excel_norm = row_excel.get("_desc_norm", "")
-
-        if desc_excel_norm != nombre_norm:
-            msg = (
-                "Validación DESCRIPCION fallida por posición.\n"
-                f"- pos i={i}\n"
-                f"- ingreso_id={ingreso_id}, ingreso_detalle_id={ingreso_detalle_id}, item_id={item_id}\n"
-                f"- Excel.DESCRIPCION='{desc_excel_raw}' (norm='{desc_excel_norm}')\n"
-                f"- catalogo_items.nombre='{nombre_item}' (norm='{nombre_norm}')\n"
+    # --- Validación: mismo número de filas y DESCRIPCION presente ---
+    _validar_entrada(df_ingreso_detalles, df_limpio)
+
+    n = len(df_ingreso_detalles)
+    if n == 0:
+        df_out = pd.DataFrame()
+        logger.info(f"DataFrame egresos construido: {len(df_out)} filas")
+        return df_out
+
+    # IDs principales (astype falla con nulos, como int() en la referencia)
+    ingreso_ids = df_ingreso_detalles["ingreso_id"].astype(np.int64).to_numpy()
+    detalle_ids = df_ingreso_detalles["id"].astype(np.int64).to_numpy()
+    item_ids = df_ingreso_detalles["item_id"].astype(np.int64).to_numpy()
+
+    # --- Nombre de catalogo_items de cada item_id (uno por item distinto) ---
+    codigos_item, items_unicos = pd.factorize(item_ids)
+    nombres_unicos = pd.Series(
+        [item_id_to_nombre.get(int(i), "") for i in items_unicos], dtype=object
+    )
+    if nombres_norm is None:
+        norm_unicos = normalizar_serie(nombres_unicos)
+    else:
+        norm_unicos = nombres_norm.reindex(items_unicos).astype(object).fillna("")
+    nombres_item = nombres_unicos.to_numpy()[codigos_item]
+    norm_item = norm_unicos.to_numpy(dtype=object)[codigos_item]
+
+    # --- Validaciones sobre las columnas completas (por posición) ---
+    duplicados = (
+        pd.DataFrame({"ingreso_id": ingreso_ids, "id": detalle_ids})
+        .duplicated()
+        .to_numpy()
+    )
+    descripciones = df_limpio["DESCRIPCION"].to_numpy(dtype=object)
+    descripciones_norm = normalizar_serie(descripciones).to_numpy()
+    distintas = descripciones_norm != norm_item
+
+    errores = []
+    for i in np.flatnonzero(duplicados | distintas).tolist():
+        if duplicados[i]:
+            errores.append(_error_duplicado(i, ingreso_ids[i], detalle_ids[i]))
+        if distintas[i]:
+            errores.append(
+                _error_descripcion(
+                    i,
+                    ingreso_ids[i],
+                    detalle_ids[i],
+                    item_ids[i],
+                    descripciones[i],
+                    descripciones_norm[i],
+                    nombres_item[i],
+                    norm_item[i],
+                )
             )
-            logger.error(msg)
-            raise ValueError(msg)
-
-        # 3) Extraer cantidad / costo / total de ESA MISMA fila
-        cantidad = int(_to_num(row_excel.get(_COL_CANT), 0))
-        costo = _to_num(row_excel.get(_COL_VALOR), 0)
-        total = _to_num(row_excel.get(_COL_TOTAL), 0)
-
-        # 4) Armar salida
-        rows_out.append(
-            {
-                "ingreso_id": ingreso_id,
-                "ingreso_detalle_id": ingreso_detalle_id,
-                "almacen_id": almacen_id,
-                "partida_id": partida_id,
-                "item_id": item_id,
-                "destino_id": None,
-                "cantidad": cantidad,
-                "costo": costo,
-                "total": total,
-                "fecha_registro": fecha_registro,
-                "editable": 1,
-                "created_at": created_at,
-                "updated_at": updated_at,
-            }
+
+    if errores:
+        resumen = (
+            f"Validación de egresos fallida: {int(duplicados.sum())} par(es) "
+            f"(ingreso_id, ingreso_detalle_id) duplicado(s), "
+            f"{int(distintas.sum())} DESCRIPCION que no coincide(n) con catalogo_items.\n"
         )
+        logger.error(resumen + "".join(errores) + "Cancelando ejecución.")
+        msg = resumen + "".join(errores[:_MAX_ERRORES_MENSAJE])
+        if len(errores) > _MAX_ERRORES_MENSAJE:
+            msg += f"... y {len(errores) - _MAX_ERRORES_MENSAJE} más (ver el log)\n"
+        raise ValueError(msg)
 
-    df_out = pd.DataFrame(rows_out)
+    # --- cantidad / costo / total de la misma fila del Excel ---
+    df_out = pd.DataFrame(
+        {
+            "ingreso_id": ingreso_ids,
+            "ingreso_detalle_id": detalle_ids,
+            "almacen_id": _ids_opcionales(df_ingreso_detalles, "almacen_id"),
+            "partida_id": _ids_opcionales(df_ingreso_detalles, "partida_id"),
+            "item_id": item_ids,
+            "destino_id": np.full(n, None, dtype=object),
+            "cantidad": np.trunc(a_numeros(df_limpio, _COL_CANT)).astype(np.int64),
+            "costo": a_numeros(df_limpio, _COL_VALOR),
+            "total": a_numeros(df_limpio, _COL_TOTAL),
+            "fecha_registro": [fecha_registro] * n,
+            "editable": np.ones(n, dtype=np.int64),
+            "created_at": [created_at] * n,
+            "updated_at": [updated_at] * n,
+        }
+    )
     logger.info(f"DataFrame egresos construido: {len(df_out)} filas")
     return df_out
+
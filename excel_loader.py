@@ -6,17 +6,101 @@ Carga y limpieza centralizada de todas las hojas del Excel SEDEGES.
 Antes esta lógica vivía en run_catalogo_items.py; ahora es un módulo
 independiente para que cualquier script de migración lo reutilice.
 
+Caché: las hojas ya limpias se guardan en cache/excel/<clave>/ (una
+por archivo, Parquet o pickle) y se reutilizan en las siguientes
+ejecuciones. La clave es el hash SHA-256 del .xlsx más el de las reglas de
+limpieza (rules.py y este módulo), así que basta con cambiar el Excel o
+las reglas para que la caché se regenere sola. La caché es por hoja: si
+una ejecución pide hojas que aún no están guardadas, solo esas se leen
+del Excel y se agregan.
+
 Uso:
     from excel_loader import load_dfs_limpios
     dfs = load_dfs_limpios()
+    dfs = load_dfs_limpios(usar_cache=False)  # fuerza releer el Excel
+    dfs = load_dfs_limpios(workers=4)         # hojas en paralelo
+    dfs = load_dfs_limpios(hojas=["FARMACIA"])  # solo algunas hojas
+    dfs = load_dfs_limpios(streaming=True)    # libros muy grandes, por bloques
+    dfs = load_dfs_limpios(motor="openpyxl")  # fuerza el motor de lectura
+
+Solo se leen las hojas configuradas (RANGE_COLUMNS_*) y, de cada una,
+solo su rango de columnas: el resto del libro no llega a parsearse.
+
+Las columnas de montos (COLUMNAS_NUMERICAS) se convierten a float64 una
+sola vez, después de limpiar la hoja (utils/numeros.py: comas decimales,
+separadores de miles, vacíos). Así quedan en la caché y las etapas
+siguientes no vuelven a parsear texto. Los valores que no se pueden
+convertir quedan en NaN y se informan por hoja y columna.
+
+Con workers > 1 cada hoja configurada se lee y limpia en un proceso
+aparte; el resultado vuelve serializado en Parquet (o pickle si la hoja no
+lo admite), el mismo formato que usa la caché.
+
+Con streaming=True las hojas se leen por bloques de filas con openpyxl en
+modo read-only (ver excel_stream.py): el resultado es el mismo, pero la
+memoria no crece con el tamaño de la hoja.
+
+Motor de lectura: con motor="auto" (por defecto) se usa calamine
+(python-calamine, escrito en Rust y mucho más rápido) si está instalado, y
+openpyxl si no lo está o si calamine falla al leer el libro; lo que se
+lee así no se guarda en la caché, cuya clave es la del motor pedido. La
+paridad entre ambos motores se verifica con
+verification/check_motores_excel.py.
+El modo streaming siempre usa openpyxl.
 """
 
+import hashlib
+import io
+import json
+import os
+import pickle
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
 import pandas as pd
 
-from rules import clean_detalle, clean_farmacia, clean_contable
+from excel_stream import CHUNK_FILAS, abrir_libro, leer_hoja_limpia
+from rules import (
+    clean_contable,
+    clean_detalle,
+    clean_farmacia,
+    marcar_contable,
+    marcar_detalle,
+    marcar_farmacia,
+)
+from utils.numeros import convertir_columnas
+
+try:
+    import pyarrow  # noqa: F401  (solo para saber si hay soporte Parquet)
+
+    _HAY_PARQUET = True
+except ImportError:
+    _HAY_PARQUET = False
+
+try:
+    import python_calamine  # noqa: F401  (motor rápido opcional)
+
+    _HAY_CALAMINE = True
+except ImportError:
+    _HAY_CALAMINE = False
 
 ARCHIVO_URL = "data/exel_sedeges.xlsx"
 
+MOTORES = ("auto", "calamine", "openpyxl")
+
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+_CACHE_DIR = os.path.join(_BASE_DIR, "cache", "excel")
+_MANIFIESTO = "manifest.json"
+# Archivos cuyo contenido define las reglas de limpieza: si cambian, la
+# caché deja de ser válida
+_FUENTES_REGLAS = [
+    "rules.py",
+    "excel_loader.py",
+    "excel_stream.py",
+    os.path.join("utils", "numeros.py"),
+]
+
 RANGE_COLUMNS_DETAILS = {
     "ANEXO-1A": range(0, 17),
     "PCVH MUJER": range(0, 17),
@@ -41,16 +125,34 @@ RANGE_COLUMNS_CONTABLE = {
     "DONACIONES": range(0, 5),
 }
 
+# Columnas de montos: se guardan como float64 (NaN = vacío o no convertible)
+COLUMNAS_NUMERICAS = [
+    "SALDO_AL_01_DE_ENERO_DE_2025_CANT",
+    "SALDO_AL_01_DE_ENERO_DE_2025_valor",
+    "SALDO_AL_01_DE_ENERO_DE_2025_TOTAL Bs.",
+    "INGRESO_ALMACENES_CANT",
+    "INGRESO_ALMACENES_VALOR",
+    "INGRESO_ALMACENES_TOTAL Bs.",
+    "SALIDA_ALMACENES_CANT",
+    "SALIDA_ALMACENES_VALOR",
+    "SALIDA_ALMACENES_TOTAL Bs.",
+    "SALDO_AL_31_DE_DICIEMBRE_DE_2025_CANT",
+    "SALDO_AL_31_DE_DICIEMBRE_DE_2025_valor",
+    "SALDO_AL_31_DE_DICIEMBRE_DE_2025_TOTAL Bs.",
+    # DONACIONES
+    "INGRESO EN LA GESTION 2025",
+    "SALIDA EN LA GESTION 2025",
+    "SALDOS AL 31-12-2025",
+]
+
 DETALLES = set(RANGE_COLUMNS_DETAILS.keys())
 CONTABLES = set(RANGE_COLUMNS_CONTABLE.keys())
 
+# Rango de columnas a leer de cada hoja configurada
+_RANGOS = {**RANGE_COLUMNS_DETAILS, **RANGE_COLUMNS_CONTABLE}
+
 
-def _wipe_sheet(libro: dict, name_sheet: str) -> pd.DataFrame:
-    df = libro[name_sheet]
-    if name_sheet in RANGE_COLUMNS_DETAILS:
-        df = df.iloc[:, RANGE_COLUMNS_DETAILS[name_sheet]]
-    if name_sheet in RANGE_COLUMNS_CONTABLE:
-        df = df.iloc[:, RANGE_COLUMNS_CONTABLE[name_sheet]]
+def _wipe_sheet(df: pd.DataFrame, name_sheet: str) -> pd.DataFrame:
     if name_sheet == "FARMACIA":
         return clean_farmacia(df)
     if name_sheet in CONTABLES:
@@ -58,12 +160,335 @@ def _wipe_sheet(libro: dict, name_sheet: str) -> pd.DataFrame:
     return clean_detalle(df)
 
 
-def load_dfs_limpios() -> dict:
-    """Carga y limpia todas las hojas del Excel."""
-    libro = pd.read_excel(ARCHIVO_URL, sheet_name=None)
+def _marcador(name_sheet: str):
+    """Regla marcar_* de la hoja, para la lectura por bloques."""
+    if name_sheet == "FARMACIA":
+        return marcar_farmacia
+    if name_sheet in CONTABLES:
+        return marcar_contable
+    return marcar_detalle
+
+
+def _resolver_motor(motor: str) -> str:
+    """Traduce "auto" al motor disponible y valida el pedido."""
+    if motor not in MOTORES:
+        raise ValueError(f"Motor de Excel desconocido: {motor!r} (opciones: {MOTORES})")
+    if motor == "auto":
+        return "calamine" if _HAY_CALAMINE else "openpyxl"
+    if motor == "calamine" and not _HAY_CALAMINE:
+        raise ImportError("motor='calamine' requiere: pip install python-calamine")
+    return motor
+
+
+def _clave_cache(archivo: str, motor: str) -> str:
+    """SHA-256 del Excel + reglas de limpieza + versión de pandas + motor."""
+    h = hashlib.sha256()
+    with open(archivo, "rb") as f:
+        for bloque in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloque)
+    for fuente in _FUENTES_REGLAS:
+        with open(os.path.join(_BASE_DIR, fuente), "rb") as f:
+            h.update(f.read())
+    h.update(pd.__version__.encode())
+    h.update(motor.encode())
+    return h.hexdigest()
+
+
+def _mismo_frame(a: pd.DataFrame, b: pd.DataFrame) -> bool:
+    return (
+        a.columns.equals(b.columns)
+        and a.dtypes.equals(b.dtypes)
+        and a.equals(b)
+    )
+
+
+def _serializar_hoja(df: pd.DataFrame) -> tuple[str, bytes]:
+    """
+    Serializa una hoja limpia y devuelve (formato, bytes).
+
+    Se intenta Parquet; si la hoja tiene columnas con tipos mezclados
+    (p. ej. fechas y textos en la misma columna) pyarrow no la puede
+    guardar o no la devuelve idéntica, y entonces se usa pickle.
+    """
+    if _HAY_PARQUET:
+        try:
+            datos = df.to_parquet()
+            if _mismo_frame(pd.read_parquet(io.BytesIO(datos)), df):
+                return "parquet", datos
+        except (ValueError, TypeError, NotImplementedError, pyarrow.ArrowException):
+            pass
+    return "pkl", pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _deserializar_hoja(formato: str, datos: bytes) -> pd.DataFrame:
+    if formato == "parquet":
+        return pd.read_parquet(io.BytesIO(datos))
+    return pickle.loads(datos)
+
+
+# ------------------------------------------------------------------ #
+#  Caché en disco                                                     #
+# ------------------------------------------------------------------ #
+def _leer_manifiesto(directorio: str) -> dict | None:
+    """
+    Devuelve {"orden": [hojas del libro], "hojas": {nombre: {archivo, formato}}}
+    o None si la caché no existe o está dañada.
+    """
+    ruta = os.path.join(directorio, _MANIFIESTO)
+    if not os.path.exists(ruta):
+        return None
+    try:
+        with open(ruta, encoding="utf-8") as f:
+            manifiesto = json.load(f)
+        if not isinstance(manifiesto["orden"], list) or not isinstance(
+            manifiesto["hojas"], dict
+        ):
+            raise ValueError("formato desconocido")
+    except (OSError, ValueError, KeyError) as e:
+        print(f"[excel_loader] WARN: manifiesto de caché inválido ({e}); se ignora")
+        return None
+    return manifiesto
+
+
+def _leer_cache(directorio: str, manifiesto: dict, nombres: list[str]) -> dict:
+    """Lee de la caché las hojas pedidas que estén guardadas."""
+    dfs_limpios = {}
+    for nombre in nombres:
+        hoja = manifiesto["hojas"].get(nombre)
+        if hoja is None:
+            continue
+        ruta = os.path.join(directorio, f"{hoja['archivo']}.{hoja['formato']}")
+        try:
+            with open(ruta, "rb") as f:
+                dfs_limpios[nombre] = _deserializar_hoja(hoja["formato"], f.read())
+        except Exception as e:  # archivo dañado o incompleto → se relee del Excel
+            print(f"[excel_loader] WARN: caché inválida para '{nombre}' ({e})")
+    return dfs_limpios
+
+
+def _escribir_cache(directorio: str, orden: list[str], serializadas: dict) -> None:
+    """
+    Agrega hojas serializadas a la caché de `directorio`.
+
+    Cada archivo se escribe con un nombre temporal y se renombra al final
+    (igual que el manifiesto), para que una ejecución interrumpida nunca
+    deje una hoja a medias.
+    """
+    # Solo se conserva la caché vigente
+    if os.path.isdir(_CACHE_DIR):
+        for viejo in os.listdir(_CACHE_DIR):
+            if viejo != os.path.basename(directorio):
+                shutil.rmtree(os.path.join(_CACHE_DIR, viejo), ignore_errors=True)
+    os.makedirs(directorio, exist_ok=True)
+
+    manifiesto = _leer_manifiesto(directorio) or {"orden": orden, "hojas": {}}
+    manifiesto["orden"] = orden
+
+    for nombre, (formato, datos) in serializadas.items():
+        archivo = f"{list(_RANGOS).index(nombre):02d}"
+        ruta = os.path.join(directorio, f"{archivo}.{formato}")
+        with open(ruta + ".tmp", "wb") as f:
+            f.write(datos)
+        os.replace(ruta + ".tmp", ruta)
+        manifiesto["hojas"][nombre] = {"archivo": archivo, "formato": formato}
+
+    ruta = os.path.join(directorio, _MANIFIESTO)
+    with open(ruta + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifiesto, f, ensure_ascii=False, indent=2)
+    os.replace(ruta + ".tmp", ruta)
+
+
+# ------------------------------------------------------------------ #
+#  Lectura del Excel                                                  #
+# ------------------------------------------------------------------ #
+def _hojas_configuradas(motor: str) -> list[str]:
+    """Hojas del libro que tienen rango configurado, en el orden del libro."""
+    try:
+        with pd.ExcelFile(ARCHIVO_URL, engine=motor) as xls:
+            return [h for h in xls.sheet_names if h in _RANGOS]
+    except Exception:
+        if motor != "calamine":
+            raise
+        return _hojas_configuradas("openpyxl")
+
+
+def _parsear_hojas(archivo: str, nombres: list[str], motor: str) -> dict:
+    dfs_limpios = {}
+    with pd.ExcelFile(archivo, engine=motor) as xls:
+        for sheet_name in nombres:
+            df = xls.parse(sheet_name, usecols=list(_RANGOS[sheet_name]))
+            dfs_limpios[sheet_name] = _wipe_sheet(df, sheet_name)
+    return dfs_limpios
+
+
+def _leer_hojas(
+    archivo: str, nombres: list[str], motor: str, chunk_filas: int | None = None
+) -> tuple[dict, str]:
+    """
+    Lee (solo el rango de columnas configurado) y limpia cada hoja.
+    Con chunk_filas, la hoja se lee por bloques de ese tamaño (openpyxl).
+    Si calamine falla, se reintenta con openpyxl.
+
+    Returns:
+        (dict {nombre_hoja: DataFrame}, motor que realmente leyó las hojas)
+    """
     dfs_limpios = {}
-    for sheet_name in libro.keys():
-        if sheet_name in RANGE_COLUMNS_DETAILS or sheet_name in RANGE_COLUMNS_CONTABLE:
-            dfs_limpios[sheet_name] = _wipe_sheet(libro, sheet_name)
+    if chunk_filas:
+        wb = abrir_libro(archivo)
+        try:
+            for sheet_name in nombres:
+                dfs_limpios[sheet_name] = leer_hoja_limpia(
+                    wb,
+                    sheet_name,
+                    _RANGOS[sheet_name],
+                    _marcador(sheet_name),
+                    chunk_filas,
+                )
+        finally:
+            wb.close()
+        return dfs_limpios, "openpyxl"
+
+    if motor != "calamine":
+        return _parsear_hojas(archivo, nombres, motor), motor
+    try:
+        return _parsear_hojas(archivo, nombres, "calamine"), "calamine"
+    except Exception as e:
+        print(f"[excel_loader] WARN: calamine no pudo leer el libro ({e}); se usa openpyxl")
+        return _parsear_hojas(archivo, nombres, "openpyxl"), "openpyxl"
+
+
+def _procesar_hojas(
+    archivo: str, nombres: list[str], motor: str, chunk_filas: int | None = None
+) -> tuple[dict, str]:
+    """
+    Lee y limpia cada hoja y convierte sus columnas de montos a float64.
+
+    Returns:
+        (dict {nombre_hoja: DataFrame}, motor que realmente leyó las hojas)
+    """
+    dfs_limpios, motor_usado = _leer_hojas(archivo, nombres, motor, chunk_filas)
+    for sheet_name, df in dfs_limpios.items():
+        no_convertidos = convertir_columnas(df, COLUMNAS_NUMERICAS)
+        for columna, cantidad in no_convertidos.items():
+            print(
+                f"[excel_loader] WARN: [{sheet_name}] {columna}: "
+                f"{cantidad} valor(es) no numérico(s) → NaN"
+            )
+    return dfs_limpios, motor_usado
+
+
+def _procesar_hoja(
+    archivo: str, sheet_name: str, motor: str, chunk_filas: int | None
+) -> tuple[tuple[str, bytes], str]:
+    """Lee y limpia una sola hoja (se ejecuta en un proceso worker)."""
+    dfs, motor_usado = _procesar_hojas(archivo, [sheet_name], motor, chunk_filas)
+    return _serializar_hoja(dfs[sheet_name]), motor_usado
+
+
+def _procesar_hojas_paralelo(
+    nombres: list[str], workers: int, motor: str, chunk_filas: int | None
+) -> dict:
+    """
+    Lee y limpia las hojas en paralelo, una por proceso.
+
+    Returns:
+        dict {nombre_hoja: ((formato, bytes), motor que leyó la hoja)}
+    """
+    workers = max(1, min(workers, len(nombres)))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        resultados = pool.map(
+            _procesar_hoja,
+            repeat(ARCHIVO_URL),
+            nombres,
+            repeat(motor),
+            repeat(chunk_filas),
+        )
+        return dict(zip(nombres, resultados))
+
+
+def load_dfs_limpios(
+    usar_cache: bool = True,
+    workers: int | None = 1,
+    hojas: list[str] | None = None,
+    streaming: bool = False,
+    chunk_filas: int = CHUNK_FILAS,
+    motor: str = "auto",
+) -> dict:
+    """
+    Carga y limpia las hojas configuradas del Excel.
+
+    Args:
+        usar_cache: si es True, reutiliza las hojas limpias guardadas en
+                    cache/excel/ cuando el Excel y las reglas no cambiaron
+        workers:    procesos para leer y limpiar las hojas en paralelo
+                    (1 = en serie, None = uno por núcleo)
+        hojas:      subconjunto de hojas a cargar (None = todas las
+                    configuradas en RANGE_COLUMNS_DETAILS/RANGE_COLUMNS_CONTABLE)
+        streaming:  si es True, lee cada hoja por bloques de `chunk_filas`
+                    filas en vez de cargarla completa con pd.read_excel
+        chunk_filas: filas por bloque en modo streaming
+        motor:      "auto" (calamine si está instalado), "calamine" u "openpyxl"
+
+    Returns:
+        dict {nombre_hoja: DataFrame limpio}, en el orden del libro
+    """
+    if hojas is not None:
+        desconocidas = [h for h in hojas if h not in _RANGOS]
+        if desconocidas:
+            raise ValueError(f"Hojas sin rango configurado: {desconocidas}")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    bloque = chunk_filas if streaming else None
+    motor = "openpyxl" if streaming else _resolver_motor(motor)
+
+    directorio = None
+    manifiesto = None
+    if usar_cache:
+        directorio = os.path.join(_CACHE_DIR, _clave_cache(ARCHIVO_URL, motor))
+        manifiesto = _leer_manifiesto(directorio)
+
+    # El orden de las hojas sale del manifiesto si la caché existe, así un
+    # acierto completo no necesita abrir el Excel
+    orden = manifiesto["orden"] if manifiesto else _hojas_configuradas(motor)
+    pedidas = [h for h in orden if hojas is None or h in hojas]
+
+    dfs_limpios = _leer_cache(directorio, manifiesto, pedidas) if manifiesto else {}
+    faltantes = [h for h in pedidas if h not in dfs_limpios]
+    if dfs_limpios:
+        print(f"[excel_loader] {len(dfs_limpios)} hoja(s) leídas de caché: {directorio}")
+
+    if faltantes:
+        if workers > 1 and len(faltantes) > 1:
+            leidas = _procesar_hojas_paralelo(faltantes, workers, motor, bloque)
+            serializadas = {h: hoja for h, (hoja, _) in leidas.items()}
+            motores = {h: motor_usado for h, (_, motor_usado) in leidas.items()}
+            for nombre, hoja in serializadas.items():
+                dfs_limpios[nombre] = _deserializar_hoja(*hoja)
+        else:
+            serializadas = None
+            leidas, motor_usado = _procesar_hojas(ARCHIVO_URL, faltantes, motor, bloque)
+            motores = dict.fromkeys(faltantes, motor_usado)
+            dfs_limpios.update(leidas)
+
+        if directorio is not None:
+            # La clave de la caché incluye el motor: lo que leyó openpyxl
+            # tras una falla de calamine no se guarda como si fuera de calamine
+            guardar = [h for h in faltantes if motores[h] == motor]
+            if len(guardar) < len(faltantes):
+                print(
+                    f"[excel_loader] WARN: {len(faltantes) - len(guardar)} hoja(s) "
+                    f"no leídas con {motor}; no se guardan en caché"
+                )
+            if serializadas is None:
+                serializadas = {h: _serializar_hoja(dfs_limpios[h]) for h in guardar}
+            if guardar:
+                try:
+                    _escribir_cache(
+                        directorio, orden, {h: serializadas[h] for h in guardar}
+                    )
+                except OSError as e:
+                    print(f"[excel_loader] WARN: no se pudo escribir la caché: {e}")
+
+    dfs_limpios = {h: dfs_limpios[h] for h in pedidas}
     print("Hojas procesadas:", list(dfs_limpios.keys()))
     return dfs_limpios
@@ -0,0 +1,308 @@
+"""
+excel_stream.py
+===============
+Lectura por bloques (streaming) de hojas grandes del Excel SEDEGES.
+
+pd.read_excel materializa la hoja completa (más el modelo de celdas de
+openpyxl) antes de limpiarla. Aquí la hoja se recorre en modo read-only
+con iter_rows(values_only=True) y se procesa en bloques de `chunk_filas`
+filas:
+  1. cada bloque se tipa con el mismo TextParser que usa pd.read_excel
+     (mismos valores nulos, mismos nombres "Unnamed: i" / "COL.1")
+  2. se le aplican las reglas marcar_* de rules.py, arrastrando el ffill de
+     PARTIDA_CODIGO / GRUPO de un bloque al siguiente
+  3. solo se guardan las filas conservadas, ya tipadas
+
+Cada bloque se tipa por separado, así que una columna puede salir con
+dtypes distintos en cada bloque (p. ej. int64 en uno y object en otro,
+o float64 si el bloque tiene vacíos). pd.read_excel infiere el dtype de
+cada columna viendo todas las filas de la hoja, también las descartadas
+(cabeceras, totales, vacías). Por eso, de cada bloque completo se guardan
+unos pocos "testigos" por columna (los valores que deciden la inferencia:
+vacíos, el mínimo y máximo entero, un decimal, un texto, una fecha...) y
+al final el dtype de la hoja sale de tipar solo esos testigos. Cada
+bloque conservado se convierte una vez a ese dtype; cuando el destino es
+object se recuperan los valores originales de la celda (enteros como int,
+fechas como datetime, y los textos numéricos / booleanos que el bloque
+convirtió a número, que se guardan aparte); como pandas en las columnas
+object, 1/True y 0/False toman la forma del primero que aparece en la
+hoja. Así el resultado es idéntico al de la lectura completa (salvo
+enteros fuera del rango de int64, que el Excel no tiene) y la memoria
+depende del bloque y de las filas conservadas ya tipadas, no del tamaño
+de la hoja: cada fila se tipa una sola vez y no se guardan filas crudas.
+
+Uso:
+    from excel_stream import abrir_libro, leer_hoja_limpia
+    wb = abrir_libro(archivo)
+    df = leer_hoja_limpia(wb, "FARMACIA", range(0, 17), marcar_farmacia)
+    wb.close()
+"""
+
+from collections.abc import Callable, Iterator
+from datetime import datetime
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+from openpyxl.cell.cell import ERROR_CODES
+from pandas.io.parsers import TextParser
+
+from rules import aplicar_marcas
+
+# Filas de Excel procesadas por bloque
+CHUNK_FILAS = 20_000
+
+_ERRORES = frozenset(ERROR_CODES)
+
+
+def _celda(valor):
+    """Convierte una celda igual que el lector openpyxl de pandas."""
+    if valor is None:
+        return ""
+    if isinstance(valor, bool):
+        return valor
+    if isinstance(valor, (int, float)):
+        entero = int(valor)
+        return entero if entero == valor else float(valor)
+    # con values_only las celdas de error llegan como texto ("#DIV/0!")
+    if isinstance(valor, str) and valor in _ERRORES:
+        return np.nan
+    return valor
+
+
+def _iter_filas(ws, columnas: range) -> Iterator[list]:
+    """
+    Recorre la hoja devolviendo las celdas de `columnas` ya convertidas.
+
+    Como pd.read_excel, descarta las filas vacías del final de la hoja
+    (se decide con la fila completa, no solo con las columnas leídas) y
+    rellena con "" las filas más cortas.
+    """
+    ancho = len(columnas)
+    vacias = 0
+    for fila in ws.iter_rows(values_only=True):
+        if all(v is None or v == "" for v in fila):
+            vacias += 1
+            continue
+        for _ in range(vacias):
+            yield [""] * ancho
+        vacias = 0
+        celdas = [_celda(v) for v in fila[columnas.start : columnas.stop]]
+        celdas.extend([""] * (ancho - len(celdas)))
+        yield celdas
+
+
+def _tipar(filas: list[list]) -> pd.DataFrame:
+    """Primera fila = cabecera; mismos argumentos que usa pd.read_excel."""
+    return TextParser(filas, header=0, skip_blank_lines=False).read()
+
+
+def _es_texto(dtype) -> bool:
+    """object o el dtype de texto de pandas (str / string)."""
+    return dtype == object or pd.api.types.is_string_dtype(dtype)
+
+
+def _testigos(crudos: list, serie: pd.Series) -> dict:
+    """
+    Valores crudos que, tipados juntos, dan el mismo dtype que `serie`
+    (y que sumados a los de otros bloques dan el dtype de la hoja), por
+    clase de valor: {clave: valor}.
+    """
+    if serie.dtype == object:
+        # un texto junto a un número siempre queda en object
+        return {"texto": "x", "numero": 0}
+    if _es_texto(serie.dtype):
+        return {"texto": "x", **({"vacio": ""} if serie.hasnans else {})}
+
+    testigos: dict = {}
+    for valor, nulo in zip(crudos, serie.isna().tolist()):
+        if isinstance(valor, bool):
+            clave = ("bool", valor)
+        elif isinstance(valor, int):
+            testigos["min"] = min(testigos.get("min", valor), valor)
+            testigos["max"] = max(testigos.get("max", valor), valor)
+            continue
+        elif nulo:
+            clave, valor = "vacio", ""
+        elif isinstance(valor, str):
+            # un texto numérico no es lo mismo que un número al mezclarse
+            # con otros textos; entero y decimal tampoco ("12" vs "12.0")
+            clave = ("texto", valor.strip().lstrip("+-").isdigit())
+        elif isinstance(valor, float):
+            clave = "decimal"
+        else:
+            clave = type(valor)
+        testigos.setdefault(clave, valor)
+    return testigos
+
+
+def _sumar_testigos(acumulados: dict, nuevos: dict) -> None:
+    for clave, valor in nuevos.items():
+        if clave == "min" and "min" in acumulados:
+            acumulados["min"] = min(acumulados["min"], valor)
+        elif clave == "max" and "max" in acumulados:
+            acumulados["max"] = max(acumulados["max"], valor)
+        else:
+            acumulados.setdefault(clave, valor)
+
+
+def _sumar_ceros_unos(crudos: list, vistos: dict) -> None:
+    """
+    Primer 0/False y primer 1/True de la columna, y los tipos con que
+    aparecen: en una columna object pandas reemplaza cada uno por el
+    primero que vio (1 y True son la misma clave al tipar).
+    """
+    for valor in crudos:
+        if type(valor) in (bool, int) and valor in (0, 1):
+            vistos.setdefault(int(valor), (valor, set()))[1].add(type(valor))
+
+
+def _dtype_hoja(testigos: list) -> np.dtype:
+    """dtype que pd.read_excel daría a una columna con esos valores."""
+    return _tipar([["c"]] + [[v] for v in testigos])["c"].dtype
+
+
+def _originales(crudas: list[list], tipado: pd.DataFrame) -> dict:
+    """
+    {columna: {fila: valor}} de las celdas de texto o booleanas que el
+    bloque convirtió a número (no recuperables desde el número).
+    """
+    originales: dict = {}
+    for i, col in enumerate(tipado.columns):
+        serie = tipado[col]
+        if _es_texto(serie.dtype) or pd.api.types.is_bool_dtype(serie.dtype):
+            continue
+        nulos = serie.isna().tolist()
+        valores = {
+            fila: celdas[i]
+            for fila, celdas in enumerate(crudas)
+            if isinstance(celdas[i], (str, bool)) and not nulos[fila]
+        }
+        if valores:
+            originales[col] = valores
+    return originales
+
+
+def _a_objeto(serie: pd.Series) -> pd.Series:
+    """Valores originales de la celda a partir de la columna tipada."""
+    if pd.api.types.is_datetime64_dtype(serie.dtype):
+        valores = [np.nan if pd.isna(v) else v.to_pydatetime() for v in serie]
+    elif pd.api.types.is_float_dtype(serie.dtype):
+        # _celda deja como int todo número entero
+        valores = [
+            int(v) if np.isfinite(v) and v == int(v) else v for v in serie.tolist()
+        ]
+    else:
+        valores = serie.tolist()
+    return pd.Series(valores, index=serie.index, dtype=object)
+
+
+def _unificar_ceros_unos(serie: pd.Series, ceros_unos: dict) -> pd.Series:
+    """0/False y 1/True → el primero de la hoja (ver _sumar_ceros_unos)."""
+    canon = {k: primero for k, (primero, tipos) in ceros_unos.items() if len(tipos) > 1}
+    if not canon:
+        return serie
+    valores = [
+        canon.get(int(v), v) if type(v) in (bool, int) and v in (0, 1) else v
+        for v in serie.tolist()
+    ]
+    return pd.Series(valores, index=serie.index, dtype=object)
+
+
+def _convertir(
+    serie: pd.Series, dtype, originales: dict, ceros_unos: dict
+) -> pd.Series:
+    """Lleva la columna de un bloque al dtype de la hoja."""
+    if serie.dtype == dtype:
+        return _unificar_ceros_unos(serie, ceros_unos) if dtype == object else serie
+    if serie.isna().all():
+        return pd.Series([np.nan] * len(serie), index=serie.index, dtype=dtype)
+    if _es_texto(dtype):
+        serie = _a_objeto(serie)
+        for fila, valor in originales.items():
+            serie.iat[fila] = valor
+        if dtype != object:
+            return serie.astype(dtype)
+        return _unificar_ceros_unos(serie, ceros_unos)
+    return serie.astype(dtype)
+
+
+def abrir_libro(archivo: str):
+    """Abre el libro en modo read-only, con las mismas opciones que pandas."""
+    return load_workbook(archivo, read_only=True, data_only=True, keep_links=False)
+
+
+def leer_hoja_limpia(
+    wb,
+    sheet_name: str,
+    columnas: range,
+    marcar: Callable[[pd.DataFrame, dict], tuple[pd.DataFrame, np.ndarray]],
+    chunk_filas: int = CHUNK_FILAS,
+) -> pd.DataFrame:
+    """
+    Lee y limpia una hoja por bloques.
+
+    Args:
+        wb:          libro abierto con abrir_libro()
+        sheet_name:  hoja a leer
+        columnas:    rango contiguo de columnas a leer (p. ej. range(0, 17))
+        marcar:      regla de rules.py (marcar_detalle, marcar_farmacia, ...)
+        chunk_filas: filas de Excel por bloque
+
+    Returns:
+        DataFrame limpio, igual al de clean_*(pd.read_excel(...))
+    """
+    ws = wb[sheet_name]
+    ws.reset_dimensions()
+    filas = _iter_filas(ws, columnas)
+
+    cabecera = next(filas, None)
+    estado: dict = {}
+    bloques: list[tuple[pd.DataFrame, dict]] = []
+    testigos: dict = {}  # {columna: {clave: valor}}, ver _testigos
+    ceros_unos: dict = {}  # {columna: {0|1: (primero, tipos)}}
+    extras: list[pd.DataFrame] = []
+
+    while bloque := list(islice(filas, chunk_filas)):
+        tipado = _tipar([cabecera] + bloque)
+        nuevas, mantener = marcar(tipado, estado)
+
+        for i, col in enumerate(tipado.columns):
+            crudos = [fila[i] for fila in bloque]
+            _sumar_testigos(testigos.setdefault(col, {}), _testigos(crudos, tipado[col]))
+            _sumar_ceros_unos(crudos, ceros_unos.setdefault(col, {}))
+
+        filas_ok = np.flatnonzero(mantener)
+        conservadas = tipado.take(filas_ok).reset_index(drop=True)
+        crudas = [bloque[i] for i in filas_ok.tolist()]
+        bloques.append((conservadas, _originales(crudas, conservadas)))
+        extras.append(nuevas[mantener])
+        del bloque, crudas, tipado, nuevas
+
+    if not extras:
+        # hoja vacía o solo con cabecera: mismo resultado que la lectura completa
+        base = _tipar([cabecera]) if cabecera is not None else pd.DataFrame()
+        return aplicar_marcas(base, *marcar(base, {}))
+
+    dtypes = {col: _dtype_hoja(list(v.values())) for col, v in testigos.items()}
+    partes = []
+    while bloques:
+        conservadas, originales = bloques.pop(0)
+        partes.append(
+            pd.DataFrame(
+                {
+                    col: _convertir(
+                        conservadas[col],
+                        dtypes[col],
+                        originales.get(col, {}),
+                        ceros_unos[col],
+                    )
+                    for col in conservadas.columns
+                }
+            )
+        )
+        del conservadas
+    df = pd.concat(partes, ignore_index=True)
+    extra = pd.concat(extras).reset_index(drop=True)
+    return pd.concat([df, extra], axis=1)
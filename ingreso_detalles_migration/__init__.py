@@ -9,7 +9,7 @@ y `unidad_medidas` de la DB (con inserción automática si no hay match).
 
 Uso:
     from ingreso_detalles_migration import build_ingreso_detalles_df
-    df, etapas = build_ingreso_detalles_df(dfs_limpios, engine)
+    df = build_ingreso_detalles_df(dfs_limpios, engine)
 """
 
 from ingreso_detalles_migration.transformer import build_ingreso_detalles_df
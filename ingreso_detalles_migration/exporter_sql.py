@@ -1,49 +1,79 @@
 """
 ingreso_detalles_migration.exporter_sql
 =========================================
-Genera output/ingreso_detalles.sql con:
-  1. INSERTs en `ingreso_detalles`
-  2. UPDATEs de `ingresos.total` (suma de totales por ingreso_id)
-  3. UPDATEs de `ingresos.etapa_ingreso` ('ANTES 2025' | 'DESPUES 2025')
+Genera output/ingreso_detalles.sql con los INSERTs en `ingreso_detalles`.
+ingresos.total e ingresos.etapa_ingreso ya vienen calculados desde
+ingresos_migration (utils/montos.py), así que no hay UPDATEs de ingresos.
+
+export_ingreso_detalles_to_tsv genera lo mismo para LOAD DATA (TSV +
+driver).
+
+export_ingreso_detalles_to_db hace lo mismo directamente en la BD
+(modo --directo).
 """
 
 import os
 from datetime import datetime
 
 import pandas as pd
+from sqlalchemy.engine import Engine
+
+from utils.db_loader import LOTE_FILAS, conectar, insert_dataframe
+from utils.sql_render import iter_rows
+from utils.sql_writer import (
+    MAX_BYTES_INSERT,
+    SENTENCIAS_POR_TRANSACCION,
+    SqlStreamWriter,
+    cabecera_importacion,
+    iter_insert_statements,
+    iter_transacciones,
+    pie_importacion,
+)
+from utils.tsv_writer import (
+    load_data_statement,
+    ruta_driver,
+    write_load_script,
+    write_tsv,
+)
 
 _OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "..", "output")
 
-
-def _v(valor, quote: bool = False) -> str:
-    """Formatea un valor para SQL: NULL, número o 'cadena'."""
-    if valor is None:
-        return "NULL"
-    try:
-        if pd.isna(valor):
-            return "NULL"
-    except Exception:
-        pass
-    s = str(valor).strip()
-    if s in ("", "None", "nan", "NaN"):
-        return "NULL"
-    if quote:
-        return "'" + s.replace("'", "''") + "'"
-    return s
+# (columna, quote) en el orden del INSERT
+_COLUMNAS_SQL = [
+    ("ingreso_id", False),
+    ("almacen_id", False),
+    ("unidad_id", False),
+    ("partida_id", False),
+    ("donacion", True),
+    ("item_id", False),
+    ("unidad_medida_id", False),
+    ("cantidad", False),
+    ("costo", False),
+    ("total", False),
+    ("created_at", True),
+    ("updated_at", True),
+]
+_COLUMNAS = [c for c, _ in _COLUMNAS_SQL]
 
 
 def export_ingreso_detalles_to_sql(
     df: pd.DataFrame,
-    etapas_df: pd.DataFrame,
     filename: str = "ingreso_detalles.sql",
+    filas_por_insert: int = 1,
+    max_bytes_insert: int = MAX_BYTES_INSERT,
+    sentencias_por_transaccion: int = SENTENCIAS_POR_TRANSACCION,
 ) -> str:
     """
     Genera el archivo SQL para `ingreso_detalles`.
 
     Args:
         df:        DataFrame de build_ingreso_detalles_df()
-        etapas_df: DataFrame con columnas [ingreso_id, _etapa]
         filename:  nombre del archivo en output/
+        filas_por_insert: filas por sentencia INSERT (1 = una por fila)
+        max_bytes_insert: tamaño máximo en bytes de cada sentencia INSERT
+        sentencias_por_transaccion: sentencias por bloque START TRANSACTION /
+                   COMMIT del perfil de importación rápida (0 = formato
+                   clásico, ver utils/sql_writer.py)
 
     Returns:
         Ruta absoluta del archivo generado
@@ -60,78 +90,92 @@ def export_ingreso_detalles_to_sql(
     lineas.append(f"-- Total de registros: {len(df)}")
     lineas.append("-- ============================================================")
     lineas.append("")
-    lineas.append("SET NAMES utf8mb4;")
-    lineas.append("SET FOREIGN_KEY_CHECKS = 0;")
+    rapida = sentencias_por_transaccion > 0
+    lineas.extend(cabecera_importacion(rapida))
     lineas.append("")
 
-    # ---- 1. INSERTs ingreso_detalles --------------------------------
-    lineas.append("-- ---- INSERT ingreso_detalles ----")
-    for _, row in df.iterrows():
-        insert = (
-            "INSERT INTO `ingreso_detalles` "
-            "(`ingreso_id`, `almacen_id`, `unidad_id`, `partida_id`, `donacion`, "
-            "`item_id`, `unidad_medida_id`, `cantidad`, `costo`, `total`, "
-            "`created_at`, `updated_at`) "
-            "VALUES ("
-            f"{_v(row.get('ingreso_id'))}, "
-            f"{_v(row.get('almacen_id'))}, "
-            f"{_v(row.get('unidad_id'))}, "
-            f"{_v(row.get('partida_id'))}, "
-            f"{_v(row.get('donacion'), quote=True)}, "
-            f"{_v(row.get('item_id'))}, "
-            f"{_v(row.get('unidad_medida_id'))}, "
-            f"{_v(row.get('cantidad'))}, "
-            f"{_v(row.get('costo'))}, "
-            f"{_v(row.get('total'))}, "
-            f"{_v(row.get('created_at'), quote=True)}, "
-            f"{_v(row.get('updated_at'), quote=True)}"
-            ");"
+    # Solo la cabecera vive en memoria; el resto se vuelca al archivo a
+    # medida que se genera
+    with SqlStreamWriter(output_path) as writer:
+        writer.write_lines(lineas)
+
+        # ---- 1. INSERTs ingreso_detalles ----------------------------
+        writer.write_line("-- ---- INSERT ingreso_detalles ----")
+        writer.write_lines(
+            iter_transacciones(
+                iter_insert_statements(
+                    "ingreso_detalles",
+                    _COLUMNAS,
+                    iter_rows(df, _COLUMNAS_SQL),
+                    filas_por_insert,
+                    max_bytes_insert,
+                ),
+                sentencias_por_transaccion,
+            )
         )
-        lineas.append(insert)
-
-    lineas.append("")
+        writer.write_lines(["", *pie_importacion(rapida), ""])
 
-    # ---- 2. UPDATE ingresos.total (suma de totales por ingreso_id) ---
-    lineas.append("-- ---- UPDATE ingresos.total ----")
-    totales_grouped = (
-        df.groupby("ingreso_id")["total"]
-        .sum()
-        .reset_index()
-        .rename(columns={"total": "suma_total"})
+    print(
+        f"[ingreso_detalles_migration] SQL generado: {output_path} "
+        f"({len(df)} INSERTs)"
     )
-    for _, row in totales_grouped.iterrows():
-        lineas.append(
-            f"UPDATE `ingresos` SET `total` = {float(row['suma_total']):.2f} "
-            f"WHERE `id` = {int(row['ingreso_id'])};"
-        )
+    return output_path
 
-    lineas.append("")
 
-    # ---- 3. UPDATE ingresos.etapa_ingreso ---------------------------
-    lineas.append("-- ---- UPDATE ingresos.etapa_ingreso ----")
-    # Para cada ingreso_id tomamos la etapa (si hay mix tomamos la primera)
-    etapa_grouped = (
-        etapas_df.groupby("ingreso_id")["_etapa"]
-        .first()
-        .reset_index()
-        .rename(columns={"_etapa": "etapa"})
+def export_ingreso_detalles_to_tsv(
+    df: pd.DataFrame,
+    filename: str = "ingreso_detalles.tsv",
+) -> str:
+    """
+    Genera output/ingreso_detalles.tsv y el driver
+    output/ingreso_detalles_load.sql que lo carga con LOAD DATA LOCAL
+    INFILE (ver utils/tsv_writer.py).
+
+    Returns:
+        Ruta absoluta del driver .sql
+    """
+    os.makedirs(_OUTPUT_DIR, exist_ok=True)
+    tsv_path = os.path.join(_OUTPUT_DIR, filename)
+
+    write_tsv(df, _COLUMNAS_SQL, tsv_path)
+    driver = write_load_script(
+        ruta_driver(tsv_path),
+        "ingreso_detalles",
+        [load_data_statement("ingreso_detalles", tsv_path, _COLUMNAS)],
+        len(df),
+    )
+
+    print(
+        f"[ingreso_detalles_migration] TSV generado: {tsv_path} "
+        f"({len(df)} registros)"
     )
-    for _, row in etapa_grouped.iterrows():
-        lineas.append(
-            f"UPDATE `ingresos` SET `etapa_ingreso` = '{row['etapa']}' "
-            f"WHERE `id` = {int(row['ingreso_id'])};"
-        )
+    return driver
 
-    lineas.append("")
-    lineas.append("SET FOREIGN_KEY_CHECKS = 1;")
-    lineas.append("")
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write("\n".join(lineas))
+def export_ingreso_detalles_to_db(
+    df: pd.DataFrame,
+    engine: Engine,
+    lote_filas: int = LOTE_FILAS,
+) -> pd.DataFrame:
+    """
+    Inserta `ingreso_detalles` directamente en la BD, por lotes.
 
-    print(
-        f"[ingreso_detalles_migration] SQL generado: {output_path} "
-        f"({len(df)} INSERTs, {len(totales_grouped)} UPDATEs total, "
-        f"{len(etapa_grouped)} UPDATEs etapa)"
+    Returns:
+        DataFrame [id, ingreso_id, almacen_id, partida_id, item_id] de los
+        detalles insertados, en el orden de df (la misma forma que
+        egresos_migration.fetch_ingreso_detalles_gt7, sin volver a
+        consultarlo)
+    """
+    with conectar(engine) as conn:
+        ids = insert_dataframe(conn, "ingreso_detalles", df, _COLUMNAS_SQL, lote_filas)
+
+    print(f"[ingreso_detalles_migration] {len(df)} registros insertados en la BD")
+    return pd.DataFrame(
+        {
+            "id": ids,
+            "ingreso_id": df["ingreso_id"].to_numpy(),
+            "almacen_id": df["almacen_id"].to_numpy(),
+            "partida_id": df["partida_id"].to_numpy(),
+            "item_id": df["item_id"].to_numpy(),
+        }
     )
-    return output_path
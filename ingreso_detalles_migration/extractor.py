@@ -11,16 +11,42 @@ Realiza merges con las tablas de la DB:
 
 Si algún valor no tiene par en la DB, se inserta automáticamente
 y se registra un log de advertencia.
+
+Los nombres de catalogo_items se comparan con utils.texto.normalizar_serie
+(sin acentos ni espacios repetidos), la misma clave con la que
+items_migration deduplica el catálogo y egresos_migration valida las
+descripciones. La columna normalizada de catalogo_items se calcula una
+vez por carga de la tabla.
+
+partidas y unidad_medidas se comparan en la DB con
+LOWER(TRIM(columna)) = clave, como la consulta original por fila: la
+comparación usa la collation de la columna (las utf8mb4 por defecto no
+distinguen acentos, así 'Pzá' encuentra 'pza'), y si varias filas
+coinciden se usa la de id más bajo. Antes de insertar, las claves
+faltantes que la collation considera iguales (dos grafías nuevas del
+mismo valor) se agrupan en la DB y se inserta una sola fila por grupo,
+igual que la consulta por fila, que insertaba la primera y encontraba
+esa misma fila para la segunda.
+
+La resolución se hace en bloque: cada tabla se consulta una sola vez
+(catalogo_items completa en un diccionario {clave_normalizada: id}; las
+otras con una sola consulta que une las claves distintas del Excel con la
+tabla), los faltantes se insertan con un único INSERT multi-fila y sus IDs
+se recuperan con un único SELECT (en catalogo_items solo las filas con id
+mayor que el MAX(id) tomado antes del INSERT). El número de consultas a
+la DB es fijo, sin importar cuántas filas tenga el Excel.
 """
 
 import json
 import os
-from datetime import datetime, date
+from datetime import datetime
 
 import pandas as pd
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Connection, Engine
 from sqlalchemy import text
 
+from utils.texto import normalizar_serie
+
 # ------------------------------------------------------------------ #
 # Configuración                                                        #
 # ------------------------------------------------------------------ #
@@ -45,120 +71,246 @@ _DATE_STR = datetime.now().strftime("%Y-%m-%d")
 
 
 # ------------------------------------------------------------------ #
-# Helpers de fallback                                                  #
+# Parámetros de INSERT para cada dimensión                             #
+# ------------------------------------------------------------------ #
+
+
+def _params_partida(nro: str) -> dict:
+    return {
+        "nro": nro,
+        "nombre": f"Partida {nro}",
+        "fr": _DATE_STR,
+        "ca": _NOW_STR,
+        "ua": _NOW_STR,
+    }
+
+
+def _params_catalogo_item(nombre: str) -> dict:
+    return {"nombre": nombre, "fr": _DATE_STR, "ca": _NOW_STR, "ua": _NOW_STR}
+
+
+def _params_unidad_medida(nombre: str) -> dict:
+    return {
+        "nombre": nombre,
+        "abr": nombre[:10],
+        "fr": _DATE_STR,
+        "ca": _NOW_STR,
+        "ua": _NOW_STR,
+    }
+
+
+# (tabla, columna clave, INSERT parametrizado, constructor de parámetros)
+_DIMENSIONES = {
+    "partidas": (
+        "nro_partida",
+        "INSERT INTO partidas (nro_partida, nombre, fecha_registro, created_at, updated_at) "
+        "VALUES (:nro, :nombre, :fr, :ca, :ua)",
+        _params_partida,
+    ),
+    "catalogo_items": (
+        "nombre",
+        "INSERT INTO catalogo_items (nombre, fecha_registro, created_at, updated_at) "
+        "VALUES (:nombre, :fr, :ca, :ua)",
+        _params_catalogo_item,
+    ),
+    "unidad_medidas": (
+        "nombre",
+        "INSERT INTO unidad_medidas (nombre, abreviatura, fecha_registro, created_at, updated_at) "
+        "VALUES (:nombre, :abr, :fr, :ca, :ua)",
+        _params_unidad_medida,
+    ),
+}
+
+
+# ------------------------------------------------------------------ #
+# Resolución en bloque                                                 #
 # ------------------------------------------------------------------ #
 
 
-def _ensure_catalogo_item(nombre: str, engine: Engine) -> int:
+def _norm_key(serie: pd.Series) -> pd.Series:
+    """Clave de comparación: equivalente a LOWER(TRIM(...)) en MySQL."""
+    return serie.astype(str).str.strip().str.lower()
+
+
+def _norm_nombre_item(serie: pd.Series) -> pd.Series:
+    """Clave de catalogo_items: la misma normalización que el deduplicador."""
+    return normalizar_serie(serie)
+
+
+# Tablas cuya clave no se puede expresar en SQL (se filtran en Python)
+_CLAVES_PYTHON = {"catalogo_items": _norm_nombre_item}
+
+
+def _clave(tabla: str, serie: pd.Series) -> pd.Series:
+    return _CLAVES_PYTHON.get(tabla, _norm_key)(serie)
+
+
+def _buscar_claves(conn: Connection, tabla: str, columna: str, claves: list) -> dict:
     """
-    Busca el nombre en catalogo_items (normalizado).
-    Si no existe, lo inserta y retorna el nuevo ID.
+    {clave: id} comparando en la DB con LOWER(TRIM(columna)) = clave (la
+    collation de la columna decide la igualdad), el id más bajo por clave.
+
+    Las claves van en una tabla derivada con su posición, así cada clave del
+    Excel recibe su propio resultado aunque la collation considere iguales
+    a dos de ellas.
     """
-    nombre_norm = nombre.strip().lower()
-    with engine.connect() as conn:
-        row = conn.execute(
-            text(
-                "SELECT id FROM catalogo_items WHERE LOWER(TRIM(nombre)) = :n LIMIT 1"
-            ),
-            {"n": nombre_norm},
-        ).fetchone()
-        if row:
-            return row[0]
-        # No encontrado → insertar
-        result = conn.execute(
-            text(
-                "INSERT INTO catalogo_items (nombre, fecha_registro, created_at, updated_at) "
-                "VALUES (:nombre, :fr, :ca, :ua)"
-            ),
-            {
-                "nombre": nombre.strip(),
-                "fr": _DATE_STR,
-                "ca": _NOW_STR,
-                "ua": _NOW_STR,
-            },
-        )
-        conn.commit()
-        new_id = result.lastrowid
-        print(
-            f"[WARN] catalogo_items: '{nombre_norm}' no encontrado "
-            f"→ insertando en DB y extrayendo id={new_id}"
-        )
-        return new_id
+    if not claves:
+        return {}
+    derivada = " UNION ALL ".join(
+        f"SELECT {i} AS pos, :c{i} AS clave" for i in range(len(claves))
+    )
+    stmt = text(
+        f"SELECT k.pos, MIN(t.id) FROM ({derivada}) k "
+        f"JOIN {tabla} t ON LOWER(TRIM(t.{columna})) = k.clave "
+        "GROUP BY k.pos"
+    )
+    rows = conn.execute(stmt, {f"c{i}": c for i, c in enumerate(claves)}).fetchall()
+    return {claves[pos]: id_ for pos, id_ in rows}
 
 
-def _ensure_unidad_medida(nombre: str, engine: Engine) -> int:
+def _expr_collation(conn: Connection, tabla: str, columna: str) -> str | None:
     """
-    Busca el nombre en unidad_medidas (normalizado).
-    Si no existe, lo inserta y retorna el nuevo ID.
+    Plantilla SQL que compara un valor con la collation de tabla.columna,
+    p. ej. "CONVERT({} USING utf8mb4) COLLATE utf8mb4_0900_ai_ci".
+
+    None si la DB no es MySQL o la columna no tiene collation (se compara
+    tal cual, como la clave en Python).
     """
-    nombre_norm = nombre.strip().lower()
-    with engine.connect() as conn:
-        row = conn.execute(
-            text(
-                "SELECT id FROM unidad_medidas WHERE LOWER(TRIM(nombre)) = :n LIMIT 1"
-            ),
-            {"n": nombre_norm},
-        ).fetchone()
-        if row:
-            return row[0]
-        result = conn.execute(
-            text(
-                "INSERT INTO unidad_medidas (nombre, abreviatura, fecha_registro, created_at, updated_at) "
-                "VALUES (:nombre, :abr, :fr, :ca, :ua)"
-            ),
-            {
-                "nombre": nombre.strip(),
-                "abr": nombre.strip()[:10],
-                "fr": _DATE_STR,
-                "ca": _NOW_STR,
-                "ua": _NOW_STR,
-            },
-        )
-        conn.commit()
-        new_id = result.lastrowid
-        print(
-            f"[WARN] unidad_medidas: '{nombre_norm}' no encontrado "
-            f"→ insertando en DB y extrayendo id={new_id}"
-        )
-        return new_id
+    if conn.dialect.name != "mysql":
+        return None
+    row = conn.execute(
+        text(
+            "SELECT CHARACTER_SET_NAME, COLLATION_NAME FROM information_schema.COLUMNS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :t AND COLUMN_NAME = :c"
+        ),
+        {"t": tabla, "c": columna},
+    ).fetchone()
+    if row is None or row[1] is None:
+        return None
+    return f"CONVERT({{}} USING {row[0]}) COLLATE {row[1]}"
 
 
-def _ensure_partida(nro: str, engine: Engine) -> int | None:
+def _agrupar_claves(conn: Connection, tabla: str, columna: str, claves: list) -> list:
     """
-    Busca el nro_partida en partidas (normalizado).
-    Si no existe, lo inserta y retorna el nuevo ID.
-    Retorna None si nro es nulo/vacío.
+    Para cada clave, la primera de `claves` que la collation de la columna
+    considera igual (ella misma si no hay otra). Una sola consulta.
     """
-    if pd.isna(nro) or str(nro).strip() == "":
-        return None
-    nro_norm = str(nro).strip().lower()
-    with engine.connect() as conn:
-        row = conn.execute(
-            text("SELECT id FROM partidas WHERE LOWER(TRIM(nro_partida)) = :n LIMIT 1"),
-            {"n": nro_norm},
-        ).fetchone()
-        if row:
-            return row[0]
-        result = conn.execute(
-            text(
-                "INSERT INTO partidas (nro_partida, nombre, fecha_registro, created_at, updated_at) "
-                "VALUES (:nro, :nombre, :fr, :ca, :ua)"
-            ),
-            {
-                "nro": str(nro).strip(),
-                "nombre": f"Partida {str(nro).strip()}",
-                "fr": _DATE_STR,
-                "ca": _NOW_STR,
-                "ua": _NOW_STR,
-            },
+    if tabla in _CLAVES_PYTHON or len(claves) < 2:
+        return list(claves)
+    expr = _expr_collation(conn, tabla, columna)
+    if expr is None:
+        return list(claves)
+    derivada = " UNION ALL ".join(
+        f"SELECT {i} AS pos, :c{i} AS clave" for i in range(len(claves))
+    )
+    stmt = text(
+        f"SELECT k.pos, MIN(j.pos) FROM ({derivada}) k "
+        f"JOIN ({derivada}) j ON {expr.format('k.clave')} = {expr.format('j.clave')} "
+        "GROUP BY k.pos"
+    )
+    rows = conn.execute(stmt, {f"c{i}": c for i, c in enumerate(claves)}).fetchall()
+    grupo = dict(rows)
+    return [claves[grupo.get(i, i)] for i in range(len(claves))]
+
+
+def _load_dimension(
+    conn: Connection,
+    tabla: str,
+    columna: str,
+    claves: list | None = None,
+    desde_id: int = 0,
+) -> dict:
+    """
+    Carga {clave_normalizada: id} de una tabla (o solo de `claves` si se
+    indican). Si hay duplicados en la DB se conserva el id más bajo.
+
+    Las tablas sin clave en Python (partidas, unidad_medidas) solo se
+    consultan por `claves`, con la comparación de la DB (_buscar_claves).
+    En catalogo_items solo se leen las filas con id > `desde_id`.
+    """
+    if tabla not in _CLAVES_PYTHON:
+        return _buscar_claves(conn, tabla, columna, claves or [])
+
+    stmt = text(f"SELECT id, {columna} FROM {tabla} WHERE id > :desde ORDER BY id ASC")
+    rows = conn.execute(stmt, {"desde": desde_id}).fetchall()
+    if not rows:
+        return {}
+    df = pd.DataFrame(rows, columns=["id", "valor"]).dropna(subset=["valor"])
+    df["clave"] = _clave(tabla, df["valor"])
+    df = df.drop_duplicates(subset="clave", keep="first")
+    if claves is not None:
+        df = df[df["clave"].isin(claves)]
+    return dict(zip(df["clave"], df["id"]))
+
+
+def _resolve_dimension(conn: Connection, tabla: str, valores: pd.Series) -> pd.Series:
+    """
+    Resuelve una columna del Excel contra una tabla dimensión de la DB.
+
+    Round trips fijos por tabla: un SELECT (la tabla completa o las claves
+    del Excel, ver _load_dimension), la agrupación de los faltantes por la
+    collation (_agrupar_claves; en catalogo_items, el MAX(id) previo), un
+    INSERT multi-fila con un faltante por grupo y un SELECT de los IDs
+    nuevos.
+
+    Args:
+        conn:    conexión abierta a la DB
+        tabla:   'partidas' | 'catalogo_items' | 'unidad_medidas'
+        valores: Series con los valores del Excel (NaN → id nulo)
+
+    Returns:
+        Series de IDs alineada con `valores`
+    """
+    columna, insert_sql, build_params = _DIMENSIONES[tabla]
+
+    validos = valores.notna() & (valores.astype(str).str.strip() != "")
+    texto = valores[validos].astype(str).str.strip()
+    claves = _clave(tabla, texto)
+
+    mapa = _load_dimension(conn, tabla, columna, claves=claves.unique().tolist())
+
+    # Un representante (primer valor tal cual aparece) por clave faltante
+    faltantes = (
+        pd.DataFrame({"clave": claves, "valor": texto})
+        .drop_duplicates(subset="clave", keep="first")
+        .loc[lambda d: ~d["clave"].isin(mapa.keys())]
+    )
+
+    if len(faltantes) > 0:
+        faltantes["grupo"] = _agrupar_claves(
+            conn, tabla, columna, faltantes["clave"].tolist()
+        )
+        insertar = faltantes[faltantes["clave"] == faltantes["grupo"]]
+        desde_id = 0
+        if tabla in _CLAVES_PYTHON:
+            # Los nuevos quedan por encima del MAX(id) actual
+            desde_id = conn.execute(
+                text(f"SELECT COALESCE(MAX(id), 0) FROM {tabla}")
+            ).scalar()
+        # executemany con pymysql se reescribe como un único INSERT multi-fila
+        conn.execute(
+            text(insert_sql), [build_params(v) for v in insertar["valor"]]
         )
         conn.commit()
-        new_id = result.lastrowid
-        print(
-            f"[WARN] partidas: '{nro_norm}' no encontrado "
-            f"→ insertando en DB y extrayendo id={new_id}"
+        nuevos = _load_dimension(
+            conn, tabla, columna, claves=insertar["clave"].tolist(), desde_id=desde_id
         )
-        return new_id
+        for clave, grupo in zip(faltantes["clave"], faltantes["grupo"]):
+            mapa[clave] = nuevos.get(grupo)
+            if clave != grupo:
+                print(
+                    f"[WARN] {tabla}: '{clave}' no encontrado "
+                    f"→ igual a '{grupo}' en la DB, id={mapa[clave]}"
+                )
+                continue
+            print(
+                f"[WARN] {tabla}: '{clave}' no encontrado "
+                f"→ insertando en DB y extrayendo id={mapa[clave]}"
+            )
+
+    ids = pd.Series(None, index=valores.index, dtype=object)
+    ids[validos] = claves.map(mapa)
+    return pd.Series(ids.tolist(), index=valores.index)
 
 
 # ------------------------------------------------------------------ #
@@ -201,38 +353,35 @@ def extract_ingreso_detalles(dfs_limpios: dict, engine: Engine) -> pd.DataFrame:
         f"[ingreso_detalles_migration] Total filas extraídas de hojas detalle: {len(df_all)}"
     )
 
-    # ---- Resolver partida_id ----------------------------------------
-    print("[ingreso_detalles_migration] Resolviendo partida_id...")
-    partida_ids = []
-    for _, row in df_all.iterrows():
-        nro = row.get("PARTIDA_CODIGO")
-        partida_ids.append(_ensure_partida(nro, engine))
-    df_all["partida_id"] = partida_ids
-
-    # ---- Resolver item_id (catalogo_items) --------------------------
-    print("[ingreso_detalles_migration] Resolviendo item_id (catalogo_items)...")
-    item_ids = []
-    for _, row in df_all.iterrows():
-        desc = row.get("DESCRIPCION")
-        if pd.isna(desc) or str(desc).strip() == "":
-            item_ids.append(None)
-        else:
-            item_ids.append(_ensure_catalogo_item(str(desc), engine))
-    df_all["item_id"] = item_ids
-
-    # ---- Resolver unidad_medida_id ----------------------------------
-    print(
-        "[ingreso_detalles_migration] Resolviendo unidad_medida_id (unidad_medidas)..."
-    )
-    unidad_ids = []
-    for _, row in df_all.iterrows():
-        unidad = row.get("UNIDAD")
-        if pd.isna(unidad) or str(unidad).strip() == "":
-            # Fallback si no hay unidad: insertar 'DESCONOCIDO'
-            unidad_ids.append(_ensure_unidad_medida("DESCONOCIDO", engine))
-        else:
-            unidad_ids.append(_ensure_unidad_medida(str(unidad), engine))
-    df_all["unidad_medida_id"] = unidad_ids
+    def _columna(nombre: str) -> pd.Series:
+        if nombre in df_all.columns:
+            return df_all[nombre]
+        return pd.Series(None, index=df_all.index, dtype=object)
+
+    with engine.connect() as conn:
+        # ---- Resolver partida_id ------------------------------------
+        print("[ingreso_detalles_migration] Resolviendo partida_id...")
+        df_all["partida_id"] = _resolve_dimension(
+            conn, "partidas", _columna("PARTIDA_CODIGO")
+        )
+
+        # ---- Resolver item_id (catalogo_items) ----------------------
+        print("[ingreso_detalles_migration] Resolviendo item_id (catalogo_items)...")
+        df_all["item_id"] = _resolve_dimension(
+            conn, "catalogo_items", _columna("DESCRIPCION")
+        )
+
+        # ---- Resolver unidad_medida_id ------------------------------
+        print(
+            "[ingreso_detalles_migration] Resolviendo unidad_medida_id (unidad_medidas)..."
+        )
+        unidades = _columna("UNIDAD")
+        # Fallback si no hay unidad: insertar 'DESCONOCIDO'
+        sin_unidad = unidades.isna() | (unidades.astype(str).str.strip() == "")
+        unidades = unidades.astype(object).where(~sin_unidad, "DESCONOCIDO")
+        df_all["unidad_medida_id"] = _resolve_dimension(
+            conn, "unidad_medidas", unidades
+        )
 
     print(
         f"[ingreso_detalles_migration] Extracción y enriquecimiento completo: {len(df_all)} filas"
@@ -3,14 +3,14 @@ ingreso_detalles_migration.transformer
 =======================================
 Construye el DataFrame final para la tabla `ingreso_detalles`.
 
-Lógica principal:
-  - Si SALDO_AL_01_DE_ENERO_DE_2025_TOTAL Bs. > 0:
-        cantidad/costo/total = columnas de SALDO  → etapa = 'ANTES 2025'
-  - Sino:
-        cantidad/costo/total = columnas de INGRESO → etapa = 'DESPUES 2025'
+cantidad/costo/total salen de utils/montos.py (calcular_montos, por
+columnas: columnas de SALDO si su total es > 0, si no las de INGRESO),
+el mismo paso del que ingresos_migration toma el total y la
+etapa_ingreso de cada ingreso.
 
 El ingreso_id y almacen_id se toman de los registros recién insertados
-en la tabla `ingresos` (id > 6).
+en la tabla `ingresos` (id > 6), o del DataFrame [id, almacen_id] que
+devuelve export_ingresos_to_db en el modo --directo.
 """
 
 from datetime import datetime
@@ -20,27 +20,7 @@ from sqlalchemy.engine import Engine
 from sqlalchemy import text
 
 from ingreso_detalles_migration.extractor import extract_ingreso_detalles
-
-_COL_SALDO_TOTAL = "SALDO_AL_01_DE_ENERO_DE_2025_TOTAL Bs."
-_COL_SALDO_CANT = "SALDO_AL_01_DE_ENERO_DE_2025_CANT"
-_COL_SALDO_VALOR = "SALDO_AL_01_DE_ENERO_DE_2025_valor"
-
-_COL_ING_TOTAL = "INGRESO_ALMACENES_TOTAL Bs."
-_COL_ING_CANT = "INGRESO_ALMACENES_CANT"
-_COL_ING_VALOR = "INGRESO_ALMACENES_VALOR"
-
-
-def _to_num(val, default=0):
-    """Convierte a número; retorna default si no es posible."""
-    try:
-        if pd.isna(val):
-            return default
-    except Exception:
-        pass
-    try:
-        return float(str(val).replace(",", ".").strip())
-    except (ValueError, TypeError):
-        return default
+from utils.montos import calcular_montos
 
 
 def _fetch_new_ingresos(engine: Engine) -> pd.DataFrame:
@@ -60,15 +40,17 @@ def _fetch_new_ingresos(engine: Engine) -> pd.DataFrame:
 
 
 def build_ingreso_detalles_df(
-    dfs_limpios: dict, engine: Engine
-) -> tuple[pd.DataFrame, pd.Series]:
+    dfs_limpios: dict, engine: Engine, df_ingresos: pd.DataFrame | None = None
+) -> pd.DataFrame:
     """
     Construye el DataFrame para `ingreso_detalles`.
 
+    Args:
+        df_ingresos: [id, almacen_id] de los ingresos ya insertados; si es
+                     None se consultan en la BD (id > 6)
+
     Returns:
-        (df_detalles, etapas_series)
-        - df_detalles: DataFrame listo para INSERT en ingreso_detalles
-        - etapas_series: Series con (ingreso_id, etapa) para UPDATE de ingresos
+        DataFrame listo para INSERT en ingreso_detalles
     """
     ahora = datetime.now()
     created_at = ahora.strftime("%Y-%m-%d %H:%M:%S")
@@ -78,7 +60,8 @@ def build_ingreso_detalles_df(
     df_raw = extract_ingreso_detalles(dfs_limpios, engine)
 
     # Paso 2: Traer los ingresos recién insertados
-    df_ingresos = _fetch_new_ingresos(engine)
+    if df_ingresos is None:
+        df_ingresos = _fetch_new_ingresos(engine)
 
     if len(df_ingresos) != len(df_raw):
         print(
@@ -93,21 +76,7 @@ def build_ingreso_detalles_df(
     df_ingresos = df_ingresos.iloc[:n].reset_index(drop=True)
 
     # Paso 3: Calcular cantidad/costo/total/etapa con la condicional
-    cantidades, costos, totales, etapas = [], [], [], []
-
-    for _, row in df_raw.iterrows():
-        saldo_total = _to_num(row.get(_COL_SALDO_TOTAL), 0)
-
-        if saldo_total > 0:
-            cantidades.append(_to_num(row.get(_COL_SALDO_CANT), 0))
-            costos.append(_to_num(row.get(_COL_SALDO_VALOR), 0))
-            totales.append(saldo_total)
-            etapas.append("ANTES 2025")
-        else:
-            cantidades.append(_to_num(row.get(_COL_ING_CANT), 0))
-            costos.append(_to_num(row.get(_COL_ING_VALOR), 0))
-            totales.append(_to_num(row.get(_COL_ING_TOTAL), 0))
-            etapas.append("2025")
+    montos = calcular_montos(df_raw)
 
     # Paso 4: Construir DataFrame final
     df_final = pd.DataFrame(
@@ -119,19 +88,18 @@ def build_ingreso_detalles_df(
             "donacion": ["NO"] * n,
             "item_id": df_raw["item_id"].values,
             "unidad_medida_id": df_raw["unidad_medida_id"].values,
-            "cantidad": cantidades,
-            "costo": costos,
-            "total": totales,
+            "cantidad": montos["cantidad"].values,
+            "costo": montos["costo"].values,
+            "total": montos["total"].values,
             "created_at": [created_at] * n,
             "updated_at": [updated_at] * n,
-            "_etapa": etapas,
         }
     )
 
     print(f"[ingreso_detalles_migration] DataFrame final: {len(df_final)} filas")
-    etapa_counts = pd.Series(etapas).value_counts()
+    etapa_counts = montos["_etapa"].value_counts()
     print(
         f"[ingreso_detalles_migration] Distribución etapas:\n{etapa_counts.to_string()}"
     )
 
-    return df_final, df_final[["ingreso_id", "_etapa"]].copy()
+    return df_final
@@ -1,36 +1,81 @@
 """
 ingresos_migration.exporter_sql
 ================================
-Exporta el DataFrame de `ingresos` a output/ingresos.sql
+Exporta el DataFrame de `ingresos` a output/ingresos.sql, a
+output/ingresos.tsv + ingresos_load.sql (LOAD DATA, export_ingresos_to_tsv)
+o directamente a la BD (export_ingresos_to_db, modo --directo).
 """
 
 import os
 from datetime import datetime
 
 import pandas as pd
+from sqlalchemy.engine import Engine
 
-_OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "..", "output")
+from utils.db_loader import LOTE_FILAS, conectar, insert_dataframe
+from utils.sql_render import iter_rows
+from utils.sql_writer import (
+    MAX_BYTES_INSERT,
+    SENTENCIAS_POR_TRANSACCION,
+    SqlStreamWriter,
+    cabecera_importacion,
+    iter_insert_statements,
+    iter_transacciones,
+    pie_importacion,
+)
+from utils.tsv_writer import (
+    load_data_statement,
+    ruta_driver,
+    write_load_script,
+    write_tsv,
+)
 
+_OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "..", "output")
 
-def _v(valor, quote: bool = False) -> str:
-    """Formatea un valor para SQL: NULL o 'valor' o número."""
-    if valor is None or (isinstance(valor, float) and pd.isna(valor)):
-        return "NULL"
-    s = str(valor).strip()
-    if s == "" or s == "None" or s == "nan":
-        return "NULL"
-    if quote:
-        return "'" + s.replace("'", "''") + "'"
-    return s
+# (columna, quote) en el orden del INSERT
+_COLUMNAS_SQL = [
+    ("codigo", True),
+    ("donacion", True),
+    ("almacen_id", False),
+    ("unidad_id", False),
+    ("proveedor", True),
+    ("con_fondos", True),
+    ("fecha_nota", True),
+    ("nro_factura", True),
+    ("fecha_factura", True),
+    ("pedido_interno", True),
+    ("total", False),
+    ("fecha_ingreso", True),
+    ("hora_ingreso", True),
+    ("observaciones", True),
+    ("para", True),
+    ("fecha_registro", True),
+    ("user_id", False),
+    ("created_at", True),
+    ("updated_at", True),
+    ("etapa_ingreso", True),
+]
+_COLUMNAS = [c for c, _ in _COLUMNAS_SQL]
 
 
-def export_ingresos_to_sql(df: pd.DataFrame, filename: str = "ingresos.sql") -> str:
+def export_ingresos_to_sql(
+    df: pd.DataFrame,
+    filename: str = "ingresos.sql",
+    filas_por_insert: int = 1,
+    max_bytes_insert: int = MAX_BYTES_INSERT,
+    sentencias_por_transaccion: int = SENTENCIAS_POR_TRANSACCION,
+) -> str:
     """
     Genera el archivo SQL con INSERTs para la tabla `ingresos`.
 
     Args:
         df:       DataFrame construido por ingresos_migration.transformer
         filename: nombre de archivo destino en output/
+        filas_por_insert: filas por sentencia INSERT (1 = una por fila)
+        max_bytes_insert: tamaño máximo en bytes de cada sentencia INSERT
+        sentencias_por_transaccion: sentencias por bloque START TRANSACTION /
+                          COMMIT del perfil de importación rápida (0 = formato
+                          clásico, ver utils/sql_writer.py)
 
     Returns:
         Ruta absoluta del archivo generado
@@ -48,49 +93,65 @@ def export_ingresos_to_sql(df: pd.DataFrame, filename: str = "ingresos.sql") ->
     lineas.append("-- Una fila por cada registro de datos de las hojas detalle")
     lineas.append("-- ============================================================")
     lineas.append("")
-    lineas.append("SET NAMES utf8mb4;")
-    lineas.append("SET FOREIGN_KEY_CHECKS = 0;")
+    rapida = sentencias_por_transaccion > 0
+    lineas.extend(cabecera_importacion(rapida))
     lineas.append("")
 
-    for _, row in df.iterrows():
-        insert = (
-            "INSERT INTO `ingresos` "
-            "(`codigo`, `donacion`, `almacen_id`, `unidad_id`, `proveedor`, "
-            "`con_fondos`, `fecha_nota`, `nro_factura`, `fecha_factura`, "
-            "`pedido_interno`, `total`, `fecha_ingreso`, `hora_ingreso`, "
-            "`observaciones`, `para`, `fecha_registro`, `user_id`, "
-            "`created_at`, `updated_at`, `etapa_ingreso`) "
-            "VALUES ("
-            f"{_v(row.get('codigo'), quote=True)}, "
-            f"{_v(row.get('donacion'), quote=True)}, "
-            f"{_v(row.get('almacen_id'))}, "
-            f"{_v(row.get('unidad_id'))}, "
-            f"{_v(row.get('proveedor'), quote=True)}, "
-            f"{_v(row.get('con_fondos'), quote=True)}, "
-            f"{_v(row.get('fecha_nota'), quote=True)}, "
-            f"{_v(row.get('nro_factura'), quote=True)}, "
-            f"{_v(row.get('fecha_factura'), quote=True)}, "
-            f"{_v(row.get('pedido_interno'), quote=True)}, "
-            f"{_v(row.get('total'))}, "
-            f"{_v(row.get('fecha_ingreso'), quote=True)}, "
-            f"{_v(row.get('hora_ingreso'), quote=True)}, "
-            f"{_v(row.get('observaciones'), quote=True)}, "
-            f"{_v(row.get('para'), quote=True)}, "
-            f"{_v(row.get('fecha_registro'), quote=True)}, "
-            f"{_v(row.get('user_id'))}, "
-            f"{_v(row.get('created_at'), quote=True)}, "
-            f"{_v(row.get('updated_at'), quote=True)}, "
-            f"{_v(row.get('etapa_ingreso'), quote=True)}"
-            ");"
+    # Solo la cabecera vive en memoria; los INSERTs se renderizan por
+    # bloques y se vuelcan al archivo a medida que se generan
+    tuplas = iter_rows(df, _COLUMNAS_SQL)
+    with SqlStreamWriter(output_path) as writer:
+        writer.write_lines(lineas)
+        writer.write_lines(
+            iter_transacciones(
+                iter_insert_statements(
+                    "ingresos", _COLUMNAS, tuplas, filas_por_insert, max_bytes_insert
+                ),
+                sentencias_por_transaccion,
+            )
         )
-        lineas.append(insert)
-
-    lineas.append("")
-    lineas.append("SET FOREIGN_KEY_CHECKS = 1;")
-    lineas.append("")
-
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write("\n".join(lineas))
+        writer.write_lines(["", *pie_importacion(rapida), ""])
 
     print(f"[ingresos_migration] SQL generado: {output_path} ({len(df)} registros)")
     return output_path
+
+
+def export_ingresos_to_tsv(df: pd.DataFrame, filename: str = "ingresos.tsv") -> str:
+    """
+    Genera output/ingresos.tsv y el driver output/ingresos_load.sql que lo
+    carga con LOAD DATA LOCAL INFILE (ver utils/tsv_writer.py).
+
+    Returns:
+        Ruta absoluta del driver .sql
+    """
+    os.makedirs(_OUTPUT_DIR, exist_ok=True)
+    tsv_path = os.path.join(_OUTPUT_DIR, filename)
+
+    write_tsv(df, _COLUMNAS_SQL, tsv_path)
+    driver = write_load_script(
+        ruta_driver(tsv_path),
+        "ingresos",
+        [load_data_statement("ingresos", tsv_path, _COLUMNAS)],
+        len(df),
+    )
+
+    print(f"[ingresos_migration] TSV generado: {tsv_path} ({len(df)} registros)")
+    return driver
+
+
+def export_ingresos_to_db(
+    df: pd.DataFrame, engine: Engine, lote_filas: int = LOTE_FILAS
+) -> pd.DataFrame:
+    """
+    Inserta el DataFrame de `ingresos` directamente en la BD, por lotes
+    (ver utils/db_loader.py).
+
+    Returns:
+        DataFrame [id, almacen_id] de los ingresos insertados, en el orden
+        de df (lo que ingreso_detalles necesita, sin volver a consultarlo)
+    """
+    with conectar(engine) as conn:
+        ids = insert_dataframe(conn, "ingresos", df, _COLUMNAS_SQL, lote_filas)
+
+    print(f"[ingresos_migration] {len(df)} registros insertados en la BD")
+    return pd.DataFrame({"id": ids, "almacen_id": df["almacen_id"].to_numpy()})
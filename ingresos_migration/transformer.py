@@ -3,14 +3,34 @@ ingresos_migration.transformer
 ===============================
 Construye el DataFrame para la tabla `ingresos`.
 Genera una fila por cada registro de datos de todas las hojas detalle.
+
+FECHA INGRESO se convierte por columnas (parse_fechas): la columna se
+factoriza, los valores distintos se parsean de una vez probando formatos
+explícitos (_FORMATOS_FECHA) y el resultado se reparte por código. Lo que
+ningún formato reconoce pasa por _parse_fecha, la conversión original de
+un valor suelto, así que el resultado es el mismo que aplicar _parse_fecha
+fila por fila (verification/check_paridad_transformers.py lo compara).
+
+El texto con el año primero ("2025-03-04") se lee año-mes-día; antes
+dayfirst lo convertía en 2025-04-03. Solo si esa lectura falla se prueba
+día primero.
+
+total y etapa_ingreso se calculan aquí con utils/montos.py (calcular_montos),
+el mismo paso que usa ingreso_detalles: cada ingreso tiene exactamente un
+detalle (la misma fila del Excel), así que el total del ingreso es el de
+su detalle y ingresos.sql ya lleva los valores finales.
 """
 
 import json
 import os
+import re
 from datetime import datetime, date
 
+import numpy as np
 import pandas as pd
 
+from utils.montos import calcular_montos
+
 # ------------------------------------------------------------------ #
 # Carga el mapeo hoja → almacen_id                                   #
 # ------------------------------------------------------------------ #
@@ -25,6 +45,21 @@ _DETALLES_ALMACEN: dict = _RELACION.get("detalles", {})
 # Hojas que son de tipo detalle
 HOJAS_DETALLE: set = set(_DETALLES_ALMACEN.keys())
 
+# Formatos de texto que se prueban en orden (día primero, como _parse_fecha).
+# Sin años de dos dígitos: strptime lleva 69-99 a 19xx y dateutil (el de
+# _parse_fecha) usa una ventana alrededor del año actual; van por _parse_fecha.
+_FORMATOS_FECHA = (
+    "%d/%m/%Y",
+    "%d-%m-%Y",
+    "%d.%m.%Y",
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%d/%m/%Y %H:%M:%S",
+)
+
+# Año primero ("2025-03-04", "2025/03/04"): dayfirst no aplica
+_ANIO_PRIMERO = re.compile(r"\d{4}[-/.]")
+
 
 def _parse_fecha(valor) -> str | None:
     """
@@ -43,8 +78,13 @@ def _parse_fecha(valor) -> str | None:
         except Exception:
             return None
     # Intentar parsear desde string
+    texto = str(valor).strip()
     try:
-        ts = pd.to_datetime(str(valor).strip(), dayfirst=True, errors="coerce")
+        ts = pd.NaT
+        if _ANIO_PRIMERO.match(texto):
+            ts = pd.to_datetime(texto, errors="coerce")
+        if pd.isna(ts):
+            ts = pd.to_datetime(texto, dayfirst=True, errors="coerce")
         if pd.isna(ts):
             return None
         return ts.strftime("%Y-%m-%d")
@@ -52,12 +92,71 @@ def _parse_fecha(valor) -> str | None:
         return None
 
 
+def _formatear(valores: list) -> list:
+    """'YYYY-MM-DD' (o None) de una lista de fechas, en una sola llamada."""
+    ts = pd.to_datetime(pd.Series(valores, dtype=object), errors="coerce")
+    return ts.dt.strftime("%Y-%m-%d").astype(object).where(ts.notna(), None).tolist()
+
+
+def parse_fechas(serie: pd.Series) -> tuple[pd.Series, int]:
+    """
+    _parse_fecha aplicado a una columna completa, por valores distintos.
+
+    Returns:
+        (Series 'YYYY-MM-DD' / None alineada con `serie`,
+         cantidad de valores no vacíos que no se pudieron interpretar)
+    """
+    codigos, unicos = pd.factorize(serie)
+    valores = unicos.tolist()
+    fechas: list = [None] * len(valores)
+    resto = []  # posiciones de `valores` que van por _parse_fecha
+
+    # Fechas ya cargadas como datetime/date: una sola conversión
+    es_fecha = [isinstance(v, (datetime, date)) for v in valores]
+    posiciones = [i for i, f in enumerate(es_fecha) if f]
+    if posiciones:
+        for i, fecha in zip(posiciones, _formatear([valores[i] for i in posiciones])):
+            fechas[i] = fecha
+            if fecha is None:
+                resto.append(i)
+
+    # Textos: cada formato explícito sobre los que siguen sin reconocer
+    pendientes = [i for i, v in enumerate(valores) if isinstance(v, str)]
+    textos = pd.Series([valores[i].strip() for i in pendientes], dtype=object)
+    for formato in _FORMATOS_FECHA:
+        if not pendientes:
+            break
+        ts = pd.to_datetime(textos, format=formato, errors="coerce")
+        ok = ts.notna().to_numpy()
+        for i, fecha in zip(np.array(pendientes)[ok], ts[ok].dt.strftime("%Y-%m-%d")):
+            fechas[i] = fecha
+        pendientes = [i for i, o in zip(pendientes, ok) if not o]
+        textos = textos[~ok].reset_index(drop=True)
+
+    resto += pendientes
+    resto += [i for i, v in enumerate(valores) if not es_fecha[i] and not isinstance(v, str)]
+    for i in resto:
+        fechas[i] = _parse_fecha(valores[i])
+
+    # Vacíos ("", "   ") no cuentan como no interpretados
+    sin_fecha = np.array(
+        [f is None and str(v).strip() != "" for f, v in zip(fechas, valores)] + [False]
+    )
+    resultado = np.array(fechas + [None], dtype=object)
+    # codigo -1 (nulo) → última posición: None
+    return (
+        pd.Series(resultado[codigos], index=serie.index, dtype=object),
+        int(sin_fecha[codigos].sum()),
+    )
+
+
 def build_ingresos_df(dfs_limpios: dict) -> pd.DataFrame:
     """
     Recorre todas las hojas detalle y construye el DataFrame de `ingresos`.
 
     Una fila de `ingresos` por cada fila de datos de todas las hojas detalle.
-    El almacen_id se toma del mapeo en tables.db.relation.json.
+    El almacen_id se toma del mapeo en tables.db.relation.json; total y
+    etapa_ingreso, de calcular_montos sobre la misma fila.
 
     Args:
         dfs_limpios: dict {nombre_hoja: DataFrame} ya limpiados por rules.py
@@ -79,12 +178,21 @@ def build_ingresos_df(dfs_limpios: dict) -> pd.DataFrame:
         almacen_id = _DETALLES_ALMACEN[nombre_hoja]["almacen_id"]
         n = len(df)
 
-        # Extraer y normalizar FECHA INGRESO fila a fila
+        # Normalizar FECHA INGRESO (una vez por valor distinto)
         if "FECHA INGRESO" in df.columns:
-            fechas = df["FECHA INGRESO"].apply(_parse_fecha)
+            fechas, no_interpretadas = parse_fechas(df["FECHA INGRESO"])
+            if no_interpretadas:
+                print(
+                    f"[ingresos_migration] WARN: [{nombre_hoja}] FECHA INGRESO: "
+                    f"{no_interpretadas} valor(es) no interpretado(s) → NULL"
+                )
         else:
             fechas = pd.Series([None] * n)
 
+        # total (redondeado a 2 decimales) y etapa de la fila de detalle
+        montos = calcular_montos(df)
+        totales = [round(t, 2) for t in montos["total"].tolist()]
+
         fragmento = pd.DataFrame(
             {
                 "codigo": ["XXX"] * n,
@@ -97,7 +205,7 @@ def build_ingresos_df(dfs_limpios: dict) -> pd.DataFrame:
                 "nro_factura": [None] * n,
                 "fecha_factura": [None] * n,
                 "pedido_interno": [None] * n,
-                "total": [1] * n,
+                "total": totales,
                 "fecha_ingreso": fechas.values,
                 "hora_ingreso": [None] * n,
                 "observaciones": [None] * n,
@@ -106,7 +214,7 @@ def build_ingresos_df(dfs_limpios: dict) -> pd.DataFrame:
                 "user_id": [1] * n,
                 "created_at": [created_at] * n,
                 "updated_at": [updated_at] * n,
-                "etapa_ingreso": [None] * n,
+                "etapa_ingreso": montos["_etapa"].values,
                 "_hoja_origen": [nombre_hoja] * n,
             }
         )
@@ -11,17 +11,29 @@ Uso principal:
 
 from items_migration.extractor import extract_items_from_detalle
 from items_migration.transformer import transform_items
+from items_migration.deduplicator import deduplicate_items, export_dedup_report
+from items_migration.similares import buscar_similares, export_similares_report
 from items_migration.exporter_sql import export_items_to_sql, export_items_to_db
 
 
-def build_catalogo_items_df(dfs_limpios: dict):
+def build_catalogo_items_df(
+    dfs_limpios: dict,
+    reporte: str | None = "catalogo_items_duplicados.csv",
+    similares: str | None = "catalogo_items_similares.csv",
+):
     """
     Pipeline completo:
       1. Extrae ítems de las hojas detalle
       2. Aplica transformaciones (nombre, grupo, abreviatura)
+      3. Reporta los nombres casi iguales (índice MinHash, ver similares.py)
+      4. Colapsa los ítems con el mismo nombre normalizado
 
     Args:
         dfs_limpios: dict de {nombre_hoja: DataFrame} ya limpiados por rules.py
+        reporte:     CSV en output/ con las filas que colapsaron
+                     (None → no se escribe)
+        similares:   CSV en output/ con los pares de nombres casi iguales
+                     (None → no se escribe)
 
     Returns:
         DataFrame listo para exportar a catalogo_items
@@ -32,6 +44,16 @@ def build_catalogo_items_df(dfs_limpios: dict):
     # Paso 2: transformar y generar columnas finales
     df_final = transform_items(df_raw)
 
+    # Paso 3: pares de nombres casi iguales (solo reporte)
+    if similares is not None:
+        pares = buscar_similares(df_final["nombre"])
+        export_similares_report(pares, filename=similares)
+
+    # Paso 4: un ítem por nombre normalizado
+    df_final, df_mapeo = deduplicate_items(df_final, df_raw)
+    if reporte is not None:
+        export_dedup_report(df_mapeo, filename=reporte)
+
     return df_final
 
 
@@ -39,6 +61,10 @@ __all__ = [
     "build_catalogo_items_df",
     "extract_items_from_detalle",
     "transform_items",
+    "deduplicate_items",
+    "export_dedup_report",
+    "buscar_similares",
+    "export_similares_report",
     "export_items_to_sql",
     "export_items_to_db",
 ]
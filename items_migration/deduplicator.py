@@ -0,0 +1,134 @@
+"""
+items.migration.deduplicator
+============================
+Elimina los ítems repetidos del catálogo antes de exportarlo.
+
+El mismo ítem aparece en varias hojas detalle (y varias veces en una misma
+hoja). Dos filas son el mismo ítem si su `nombre` coincide después de
+normalizarlo con utils.texto.normalizar_serie (la misma comparación que usa
+egresos_migration contra catalogo_items.nombre).
+
+La agrupación es por hash: se factorizan los nombres, se normaliza una vez
+cada nombre distinto y se vuelve a factorizar por la clave normalizada. Los
+ítems quedan en el orden de su primera aparición (orden de hojas y de filas).
+
+Regla de sobreviviente (determinística):
+    nombre       → el de la primera aparición
+    grupo        → el de la primera aparición
+    abreviatura  → la primera no nula, en orden de aparición
+
+El reporte de mapeo (una fila por fila del Excel que colapsó con otras)
+indica a qué ítem fue a parar cada fila y con qué grupo/abreviatura.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils.texto import normalizar_serie
+
+# ------------------------------------------------------------------ #
+#  Carpeta de salida                                                  #
+# ------------------------------------------------------------------ #
+_OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "..", "output")
+
+_COLUMNAS_MAPEO = [
+    "item",
+    "nombre",
+    "hoja_origen",
+    "fila_hoja",
+    "descripcion_original",
+    "grupo_original",
+    "abreviatura_original",
+    "grupo",
+    "abreviatura",
+    "sobreviviente",
+]
+
+
+def _claves_items(nombres: pd.Series) -> np.ndarray:
+    """Número de ítem (0..n-1, en orden de primera aparición) por fila."""
+    codigos, unicos = pd.factorize(nombres)
+    claves = normalizar_serie(pd.Series(unicos, dtype=object))
+    # nombres distintos (acentos, espacios) pueden compartir clave
+    item_de_nombre, _ = pd.factorize(claves)
+    return item_de_nombre[codigos]
+
+
+def deduplicate_items(
+    df_items: pd.DataFrame, df_raw: pd.DataFrame
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Colapsa los ítems con el mismo nombre normalizado.
+
+    Args:
+        df_items: DataFrame de transform_items() [nombre, grupo, abreviatura]
+        df_raw:   DataFrame de extract_items_from_detalle(), alineado con
+                  df_items (aporta hoja_origen, fila_hoja, DESCRIPCION)
+
+    Returns:
+        (df_unicos, df_mapeo)
+          df_unicos: [nombre, grupo, abreviatura], un ítem por nombre
+          df_mapeo:  filas que colapsaron con otras (_COLUMNAS_MAPEO);
+                     `item` es la posición 1..n del ítem en df_unicos
+    """
+    columnas = ["nombre", "grupo", "abreviatura"]
+    if df_items.empty:
+        return df_items[columnas].copy(), pd.DataFrame(columns=_COLUMNAS_MAPEO)
+
+    item = _claves_items(df_items["nombre"])
+    _, primeras, repeticiones = np.unique(item, return_index=True, return_counts=True)
+
+    df_unicos = df_items[["nombre", "grupo"]].iloc[primeras].reset_index(drop=True)
+    abreviaturas = df_items["abreviatura"].groupby(item).first()
+    df_unicos["abreviatura"] = pd.Series(
+        abreviaturas.astype(object).where(abreviaturas.notna(), None).tolist(),
+        dtype=object,
+    )
+
+    # ---- Reporte: solo las filas de ítems que aparecen más de una vez ----
+    colapsadas = np.flatnonzero(repeticiones[item] > 1)
+    item_colapsado = item[colapsadas]
+    df_mapeo = pd.DataFrame(
+        {
+            "item": item_colapsado + 1,
+            "nombre": df_unicos["nombre"].to_numpy()[item_colapsado],
+            "hoja_origen": df_raw["hoja_origen"].to_numpy()[colapsadas],
+            "fila_hoja": df_raw["fila_hoja"].to_numpy()[colapsadas],
+            "descripcion_original": df_raw["DESCRIPCION"].to_numpy()[colapsadas],
+            "grupo_original": df_items["grupo"].to_numpy()[colapsadas],
+            "abreviatura_original": df_items["abreviatura"].to_numpy()[colapsadas],
+            "grupo": df_unicos["grupo"].to_numpy()[item_colapsado],
+            "abreviatura": df_unicos["abreviatura"].to_numpy()[item_colapsado],
+            "sobreviviente": colapsadas == primeras[item_colapsado],
+        }
+    )
+    # orden estable: agrupado por ítem y, dentro, en orden de aparición
+    df_mapeo = df_mapeo.sort_values("item", kind="stable").reset_index(drop=True)
+
+    conflictos = int(
+        (df_mapeo["grupo_original"].astype(object) != df_mapeo["grupo"].astype(object)).sum()
+    )
+    print(
+        f"[deduplicator] {len(df_items)} filas → {len(df_unicos)} ítems únicos "
+        f"({len(df_items) - len(df_unicos)} duplicadas, "
+        f"{conflictos} con grupo distinto al del sobreviviente)"
+    )
+    return df_unicos, df_mapeo
+
+
+def export_dedup_report(
+    df_mapeo: pd.DataFrame, filename: str = "catalogo_items_duplicados.csv"
+) -> str:
+    """
+    Escribe el reporte de mapeo de deduplicate_items() en output/.
+
+    Returns:
+        ruta del CSV generado
+    """
+    os.makedirs(_OUTPUT_DIR, exist_ok=True)
+    output_path = os.path.join(_OUTPUT_DIR, filename)
+    df_mapeo.to_csv(output_path, index=False, encoding="utf-8")
+    print(f"[deduplicator] Reporte de duplicados en: {output_path} ({len(df_mapeo)} filas)")
+    return output_path
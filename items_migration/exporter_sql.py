@@ -9,6 +9,9 @@ Exporta el DataFrame de catálogo de ítems a:
   B) (Opcional) Directamente a la base de datos MySQL usando SQLAlchemy.
      La conexión se construye leyendo las variables de entorno definidas en .env
 
+  C) Un TSV para LOAD DATA LOCAL INFILE y su driver
+     → output/catalogo_items.tsv + output/catalogo_items_load.sql
+
 Campos generados automáticamente:
     fecha_registro  → fecha actual  SIN hora  (DATE)
     created_at      → datetime actual CON hora (TIMESTAMP)
@@ -22,6 +25,23 @@ import pandas as pd
 from sqlalchemy import create_engine
 from dotenv import load_dotenv
 
+from utils.sql_render import iter_values
+from utils.sql_writer import (
+    MAX_BYTES_INSERT,
+    SENTENCIAS_POR_TRANSACCION,
+    SqlStreamWriter,
+    cabecera_importacion,
+    iter_insert_statements,
+    iter_transacciones,
+    pie_importacion,
+)
+from utils.tsv_writer import (
+    load_data_statement,
+    ruta_driver,
+    write_load_script,
+    write_tsv,
+)
+
 # Cargar variables de entorno desde .env en la raíz del proyecto
 load_dotenv()
 
@@ -30,6 +50,10 @@ load_dotenv()
 # ------------------------------------------------------------------ #
 _OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "..", "output")
 
+# Columnas tomadas del DataFrame: (nombre, quote)
+_COLUMNAS_DF = [("nombre", True), ("grupo", True), ("abreviatura", True)]
+_COLUMNAS = [c for c, _ in _COLUMNAS_DF] + ["fecha_registro", "created_at", "updated_at"]
+
 
 def _get_engine():
     """
@@ -52,25 +76,13 @@ def _get_engine():
     return create_engine(url)
 
 
-def _escape_sql_string(valor) -> str:
-    """
-    Escapa una cadena de texto para uso seguro dentro de un INSERT SQL.
-    Reemplaza comillas simples por dos comillas simples (estándar SQL).
-
-    Args:
-        valor: valor a escapar (puede ser str, None, NaN)
-
-    Returns:
-        'valor_escapado' o NULL si es nulo/vacío
-    """
-    if pd.isna(valor) or str(valor).strip() == "" or str(valor) == "None":
-        return "NULL"
-    # Escapar comillas simples duplicándolas
-    escapado = str(valor).replace("'", "''")
-    return f"'{escapado}'"
-
-
-def export_items_to_sql(df: pd.DataFrame, filename: str = "catalogo_items.sql") -> str:
+def export_items_to_sql(
+    df: pd.DataFrame,
+    filename: str = "catalogo_items.sql",
+    filas_por_insert: int = 1,
+    max_bytes_insert: int = MAX_BYTES_INSERT,
+    sentencias_por_transaccion: int = SENTENCIAS_POR_TRANSACCION,
+) -> str:
     """
     Genera un archivo .sql con sentencias INSERT INTO para la tabla
     `catalogo_items`, incluyendo los campos de auditoría con la fecha actual.
@@ -78,6 +90,11 @@ def export_items_to_sql(df: pd.DataFrame, filename: str = "catalogo_items.sql")
     Args:
         df:       DataFrame con columnas [nombre, grupo, abreviatura]
         filename: nombre del archivo SQL a generar en la carpeta output/
+        filas_por_insert: filas por sentencia INSERT (1 = una por fila)
+        max_bytes_insert: tamaño máximo en bytes de cada sentencia INSERT
+        sentencias_por_transaccion: sentencias por bloque START TRANSACTION /
+                          COMMIT del perfil de importación rápida (0 = formato
+                          clásico, ver utils/sql_writer.py)
 
     Returns:
         Ruta absoluta del archivo SQL generado
@@ -102,43 +119,71 @@ def export_items_to_sql(df: pd.DataFrame, filename: str = "catalogo_items.sql")
     lineas.append(f"-- Total de registros: {len(df)}")
     lineas.append("-- ============================================================")
     lineas.append("")
-    lineas.append("SET NAMES utf8mb4;")
-    lineas.append("SET FOREIGN_KEY_CHECKS = 0;")
+    rapida = sentencias_por_transaccion > 0
+    lineas.extend(cabecera_importacion(rapida))
     lineas.append("")
 
-    # Una sentencia INSERT por fila para mayor legibilidad y seguridad
-    for _, row in df.iterrows():
-        nombre = _escape_sql_string(row.get("nombre"))
-        grupo = _escape_sql_string(row.get("grupo"))
-        abreviatura = _escape_sql_string(row.get("abreviatura"))
-
-        insert = (
-            f"INSERT INTO `catalogo_items` "
-            f"(`nombre`, `grupo`, `abreviatura`, `fecha_registro`, `created_at`, `updated_at`) "
-            f"VALUES ("
-            f"{nombre}, "
-            f"{grupo}, "
-            f"{abreviatura}, "
-            f"'{fecha_registro}', "
-            f"'{created_at}', "
-            f"'{updated_at}'"
-            f");"
+    # Por defecto una sentencia INSERT por fila (legible); con
+    # filas_por_insert > 1 se agrupan varias filas por sentencia.
+    # Solo la cabecera vive en memoria; los INSERTs se renderizan por
+    # bloques y se vuelcan al archivo a medida que se generan
+    auditoria = f"'{fecha_registro}', '{created_at}', '{updated_at}'"
+    tuplas = (f"({valores}, {auditoria})" for valores in iter_values(df, _COLUMNAS_DF))
+    with SqlStreamWriter(output_path) as writer:
+        writer.write_lines(lineas)
+        writer.write_lines(
+            iter_transacciones(
+                iter_insert_statements(
+                    "catalogo_items", _COLUMNAS, tuplas, filas_por_insert, max_bytes_insert
+                ),
+                sentencias_por_transaccion,
+            )
         )
-        lineas.append(insert)
-
-    lineas.append("")
-    lineas.append("SET FOREIGN_KEY_CHECKS = 1;")
-    lineas.append("")
-
-    # Escribir el archivo con encoding UTF-8
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write("\n".join(lineas))
+        writer.write_lines(["", *pie_importacion(rapida), ""])
 
     print(f"[exporter_sql] SQL generado en: {output_path} ({len(df)} registros)")
     return output_path
 
 
-def export_items_to_db(df: pd.DataFrame, tabla: str = "catalogo_items"):
+def export_items_to_tsv(df: pd.DataFrame, filename: str = "catalogo_items.tsv") -> str:
+    """
+    Genera output/catalogo_items.tsv y el driver que lo carga con LOAD DATA
+    LOCAL INFILE (ver utils/tsv_writer.py). Los campos de auditoría no van
+    en el TSV: el driver los asigna con la cláusula SET.
+
+    Returns:
+        Ruta absoluta del driver .sql
+    """
+    os.makedirs(_OUTPUT_DIR, exist_ok=True)
+    tsv_path = os.path.join(_OUTPUT_DIR, filename)
+
+    ahora = datetime.now()
+    fecha_registro = ahora.strftime("%Y-%m-%d")
+    created_at = ahora.strftime("%Y-%m-%d %H:%M:%S")
+    updated_at = ahora.strftime("%Y-%m-%d %H:%M:%S")
+
+    write_tsv(df, _COLUMNAS_DF, tsv_path)
+    sentencia = load_data_statement(
+        "catalogo_items",
+        tsv_path,
+        [c for c, _ in _COLUMNAS_DF],
+        [
+            f"`fecha_registro` = '{fecha_registro}'",
+            f"`created_at` = '{created_at}'",
+            f"`updated_at` = '{updated_at}'",
+        ],
+    )
+    driver = write_load_script(
+        ruta_driver(tsv_path), "catalogo_items", [sentencia], len(df)
+    )
+
+    print(f"[exporter_sql] TSV generado en: {tsv_path} ({len(df)} registros)")
+    return driver
+
+
+def export_items_to_db(
+    df: pd.DataFrame, tabla: str = "catalogo_items", engine=None
+):
     """
     Inserta el DataFrame directamente en la base de datos usando SQLAlchemy.
     La conexión se obtiene de las variables de entorno en .env
@@ -149,8 +194,10 @@ def export_items_to_db(df: pd.DataFrame, tabla: str = "catalogo_items"):
     Args:
         df:    DataFrame con columnas [nombre, grupo, abreviatura]
         tabla: nombre de la tabla destino en MySQL
+        engine: SQLAlchemy engine (opcional; si None se crea con .env)
     """
-    engine = _get_engine()
+    if engine is None:
+        engine = _get_engine()
 
     # Agregar columnas de auditoría al DataFrame antes de insertar
     ahora = datetime.now()
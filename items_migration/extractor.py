@@ -45,14 +45,16 @@ def extract_items_from_detalle(dfs_limpios: dict) -> pd.DataFrame:
         - UNIDAD       → unidad de medida en texto (ej. "PIEZA", "SERVICIO")
         - GRUPO        → solo disponible en FARMACIA (ya está en el df)
 
-    SE Agrego la columna `hoja_origen` para trazabilidad.
+    SE Agrego la columna `hoja_origen` para trazabilidad, y `fila_hoja`
+    (posición de la fila en la hoja limpia) para el reporte de duplicados.
 
     Args:
         dfs_limpios: dict {nombre_hoja: DataFrame} producido por procesar_etl()
 
     Returns:
         DataFrame consolidado con columnas:
-            hoja_origen, DESCRIPCION, CODIGO, UNIDAD, GRUPO (NaN si no aplica)
+            hoja_origen, fila_hoja, DESCRIPCION, CODIGO, UNIDAD,
+            GRUPO (NaN si no aplica)
     """
     fragmentos = []
 
@@ -77,13 +79,16 @@ def extract_items_from_detalle(dfs_limpios: dict) -> pd.DataFrame:
 
         # Marca de qué hoja proviene (útil para debug)
         fragmento["hoja_origen"] = nombre_hoja
+        fragmento["fila_hoja"] = range(len(df))
 
         fragmentos.append(fragmento)
 
     if not fragmentos:
         # Si no encontró ninguna hoja detalle retorna df vacío
         return pd.DataFrame(
-            columns=["hoja_origen", "DESCRIPCION", "CODIGO", "UNIDAD", "GRUPO"]
+            columns=[
+                "hoja_origen", "fila_hoja", "DESCRIPCION", "CODIGO", "UNIDAD", "GRUPO"
+            ]
         )
 
     # Unir todos los fragmentos en un solo DataFrame
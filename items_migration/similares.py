@@ -0,0 +1,256 @@
+"""
+items.migration.similares
+=========================
+Detección de ítems casi duplicados en el catálogo.
+
+La deduplicación exacta (deduplicator.py) no junta nombres que difieren
+en plurales, letras cambiadas o palabras de más ("papel bond" / "papeles
+bond" / "papel bnd"). Compararlos todos contra todos es O(n²); aquí se usa
+un índice MinHash con bandas (LSH) para comparar solo pares plausibles:
+
+  1. cada nombre normalizado (utils.texto.normalizar_serie) se convierte
+     en su conjunto de n-gramas de caracteres
+  2. firma MinHash de NUM_PERMUTACIONES valores por nombre (numpy)
+  3. la firma se corta en BANDAS bandas; dos nombres son candidatos si
+     coinciden en alguna banda completa
+  4. a cada par candidato se le calcula la similitud de Jaccard exacta
+     de sus n-gramas (primero se filtran por la similitud que estima la
+     firma)
+
+Con 20 bandas de 6 filas, un par con Jaccard 0.6 sale como candidato con
+probabilidad ~0.94, uno con 0.7 con ~0.98 y uno con 0.8 con ~1.
+
+Los pares solo se reportan (export_similares_report) para revisarlos a
+mano; no se fusionan automáticamente. catalogo_items.nombre es la clave
+con la que ingreso_detalles y egresos encuentran cada ítem (nombre
+normalizado == DESCRIPCION normalizada), así que juntar dos nombres
+distintos en un solo ítem dejaría filas del Excel sin su ítem.
+
+Uso:
+    pares = buscar_similares(df_items["nombre"])
+    export_similares_report(pares)
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils.texto import normalizar_serie
+
+# ------------------------------------------------------------------ #
+#  Parámetros del índice                                              #
+# ------------------------------------------------------------------ #
+# n-gramas de caracteres (máximo 3: cada n-grama se empaqueta en un int64)
+NGRAMA = 3
+NUM_PERMUTACIONES = 120
+BANDAS = 20
+# Similitud mínima para que un par aparezca en el reporte
+UMBRAL_REPORTE = 0.6
+# Un bucket con más nombres que esto solo se compara entre vecinos
+# cercanos (evita que un bucket enorme vuelva cuadrático el índice)
+MAX_BUCKET = 50
+# Margen del filtro previo por firma (la estimación MinHash tiene un
+# desvío de ~0.05 con 120 permutaciones)
+_MARGEN_ESTIMACION = 0.15
+# Pares estimados por bloque (cada par compara NUM_PERMUTACIONES valores)
+_BLOQUE_PARES = 200_000
+
+_PRIMO = (1 << 31) - 1
+_SEMILLA = 20250101
+
+_OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "..", "output")
+
+_COLUMNAS_PARES = ["nombre_a", "nombre_b", "clave_a", "clave_b", "similitud"]
+
+
+def _unicos(valores: np.ndarray) -> np.ndarray:
+    """Valores distintos ordenados (sort + máscara; más rápido que np.unique)."""
+    ordenados = np.sort(valores)
+    return ordenados[np.r_[True, ordenados[1:] != ordenados[:-1]]]
+
+
+def _shingles(claves: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    n-gramas distintos de cada clave como (dueño, id de n-grama), ordenados
+    por dueño. Cada clave se rodea de espacios (" papel ") y se rellena
+    hasta NGRAMA caracteres; los n-gramas se leen por posición sobre los
+    code points de todas las claves concatenadas.
+    """
+    textos = [f" {c} ".ljust(NGRAMA) for c in claves]
+    largos = np.fromiter((len(t) for t in textos), dtype=np.int64, count=len(textos))
+    puntos = np.frombuffer("".join(textos).encode("utf-32-le"), dtype=np.uint32)
+    puntos = puntos.astype(np.int64)
+
+    por_clave = largos - NGRAMA + 1
+    inicio_texto = np.cumsum(largos) - largos
+    inicio_grama = np.cumsum(por_clave) - por_clave
+    duenos = np.repeat(np.arange(len(claves), dtype=np.int64), por_clave)
+    posiciones = np.arange(len(duenos)) + (inicio_texto - inicio_grama)[duenos]
+
+    # code points < 2^21 → NGRAMA × 21 bits
+    gramas = np.zeros(len(duenos), dtype=np.int64)
+    for t in range(NGRAMA):
+        gramas = (gramas << 21) | puntos[posiciones + t]
+    ids, vocabulario = pd.factorize(gramas)
+
+    # un n-grama repetido en el mismo nombre cuenta una vez
+    combinado = _unicos(duenos * len(vocabulario) + ids)
+    return combinado // len(vocabulario), combinado % len(vocabulario)
+
+
+def _firmas(duenos: np.ndarray, ids: np.ndarray, n: int) -> np.ndarray:
+    """
+    Matriz (n, NUM_PERMUTACIONES) de MinHash; h(x) = (a·x + b) mod p.
+
+    El hash se calcula una vez por n-grama del vocabulario (son pocos miles)
+    y luego se reparte a cada nombre por índice.
+    """
+    rng = np.random.default_rng(_SEMILLA)
+    a = rng.integers(1, _PRIMO, size=(NUM_PERMUTACIONES, 1), dtype=np.uint64)
+    b = rng.integers(0, _PRIMO, size=(NUM_PERMUTACIONES, 1), dtype=np.uint64)
+    x = np.arange(int(ids.max()) + 1, dtype=np.uint64)
+    # a, b, x < p = 2^31 - 1 → a·x + b < 2^63, no desborda
+    tabla = ((a * x + b) % np.uint64(_PRIMO)).astype(np.uint32)
+
+    inicios = np.flatnonzero(np.r_[True, duenos[1:] != duenos[:-1]])
+    firmas = np.empty((n, NUM_PERMUTACIONES), dtype=np.uint32)
+    for k in range(NUM_PERMUTACIONES):
+        firmas[:, k] = np.minimum.reduceat(tabla[k][ids], inicios)
+    return firmas
+
+
+def _candidatos(firmas: np.ndarray) -> np.ndarray:
+    """Pares (i, j) con i < j que coinciden en al menos una banda."""
+    n = len(firmas)
+    filas = NUM_PERMUTACIONES // BANDAS
+    pesos = np.random.default_rng(_SEMILLA + 1).integers(
+        1, 1 << 63, size=filas, dtype=np.uint64
+    )
+    codificados = []
+    for banda in range(BANDAS):
+        # hash de la banda: combinación lineal con desborde (mod 2^64)
+        clave = firmas[:, banda * filas : (banda + 1) * filas].astype(np.uint64) @ pesos
+        orden = np.argsort(clave, kind="stable")
+        ordenada = clave[orden]
+        for d in range(1, MAX_BUCKET):
+            mismo = ordenada[d:] == ordenada[:-d]
+            if not mismo.any():
+                break
+            i, j = orden[:-d][mismo], orden[d:][mismo]
+            codificados.append(np.minimum(i, j) * n + np.maximum(i, j))
+    if not codificados:
+        return np.empty((0, 2), dtype=np.int64)
+    unicos = _unicos(np.concatenate(codificados))
+    return np.column_stack([unicos // n, unicos % n])
+
+
+def _estimar(pares: np.ndarray, firmas: np.ndarray) -> np.ndarray:
+    """Jaccard estimada: fracción de valores de firma iguales."""
+    estimada = np.empty(len(pares), dtype=np.float64)
+    for desde in range(0, len(pares), _BLOQUE_PARES):
+        i, j = pares[desde : desde + _BLOQUE_PARES].T
+        estimada[desde : desde + len(i)] = (firmas[i] == firmas[j]).mean(axis=1)
+    return estimada
+
+
+def _jaccard(
+    pares: np.ndarray, duenos: np.ndarray, ids: np.ndarray, n: int
+) -> np.ndarray:
+    """
+    Similitud de Jaccard exacta de los n-gramas de cada par.
+
+    (dueño, n-grama) codificado como dueño·V + id está ordenado, así que
+    cada n-grama de `i` se busca en `j` con searchsorted y la intersección
+    se cuenta con bincount, por bloques de pares.
+    """
+    v = int(ids.max()) + 1
+    codificado = duenos * v + ids
+    limites = np.searchsorted(duenos, np.arange(n + 1))
+    largos = np.diff(limites)
+
+    similitud = np.empty(len(pares), dtype=np.float64)
+    for desde in range(0, len(pares), _BLOQUE_PARES):
+        i, j = pares[desde : desde + _BLOQUE_PARES].T
+        cuantos = largos[i]
+        par = np.repeat(np.arange(len(i)), cuantos)
+        # posición de cada n-grama de i dentro de `ids`
+        pos = np.arange(len(par)) + np.repeat(limites[i] - (np.cumsum(cuantos) - cuantos), cuantos)
+        buscado = j[par] * v + ids[pos]
+        hallado = np.searchsorted(codificado, buscado)
+        hallado[hallado == len(codificado)] = 0
+        comunes = np.bincount(par, weights=codificado[hallado] == buscado, minlength=len(i))
+        similitud[desde : desde + len(i)] = comunes / (cuantos + largos[j] - comunes)
+    return similitud
+
+
+def buscar_similares(
+    nombres: pd.Series, umbral: float = UMBRAL_REPORTE
+) -> pd.DataFrame:
+    """
+    Busca pares de nombres casi iguales.
+
+    Los nombres se normalizan y se comparan por clave (los que ya tienen la
+    misma clave no son pares: esos los junta deduplicate_items).
+
+    Args:
+        nombres: Series de nombres (con repetidos, en orden de aparición)
+        umbral:  similitud de Jaccard mínima para reportar un par
+
+    Returns:
+        DataFrame [nombre_a, nombre_b, clave_a, clave_b, similitud],
+        ordenado por similitud descendente. `a` es siempre el nombre que
+        aparece primero; nombre_* es la primera forma original de la clave.
+    """
+    _, unicos = pd.factorize(nombres)
+    item_de_nombre, claves = pd.factorize(normalizar_serie(pd.Series(unicos, dtype=object)))
+    _, primer_nombre = np.unique(item_de_nombre, return_index=True)
+    claves = claves.tolist()
+    n = len(claves)
+    if n < 2:
+        return pd.DataFrame(columns=_COLUMNAS_PARES)
+
+    duenos, ids = _shingles(claves)
+    firmas = _firmas(duenos, ids, n)
+    pares = _candidatos(firmas)
+    # la similitud exacta solo para los que la firma deja cerca del umbral
+    pares = pares[_estimar(pares, firmas) >= umbral - _MARGEN_ESTIMACION]
+    similitud = _jaccard(pares, duenos, ids, n)
+    ok = similitud >= umbral
+    pares, similitud = pares[ok], similitud[ok].round(4)
+    # similitud descendente; a igual similitud, en orden de aparición
+    orden = np.lexsort((pares[:, 1], pares[:, 0], -similitud))
+    pares, similitud = pares[orden], similitud[orden]
+
+    claves_arr = np.asarray(claves, dtype=object)
+    originales = np.asarray(unicos.tolist(), dtype=object)[primer_nombre]
+    resultado = pd.DataFrame(
+        {
+            "nombre_a": pd.Series(originales[pares[:, 0]], dtype=object),
+            "nombre_b": pd.Series(originales[pares[:, 1]], dtype=object),
+            "clave_a": pd.Series(claves_arr[pares[:, 0]], dtype=object),
+            "clave_b": pd.Series(claves_arr[pares[:, 1]], dtype=object),
+            "similitud": similitud,
+        }
+    )
+    print(
+        f"[similares] {n} nombres distintos → {len(resultado)} pares "
+        f"con similitud ≥ {umbral}"
+    )
+    return resultado
+
+
+def export_similares_report(
+    pares: pd.DataFrame, filename: str = "catalogo_items_similares.csv"
+) -> str:
+    """
+    Escribe los pares de buscar_similares() en output/.
+
+    Returns:
+        ruta del CSV generado
+    """
+    os.makedirs(_OUTPUT_DIR, exist_ok=True)
+    output_path = os.path.join(_OUTPUT_DIR, filename)
+    pares.to_csv(output_path, index=False, encoding="utf-8")
+    print(f"[similares] Reporte de similares en: {output_path} ({len(pares)} pares)")
+    return output_path
@@ -7,9 +7,16 @@ y construye las columnas finales para la tabla `catalogo_items`:
     nombre      → DESCRIPCION en minúsculas (str.lower + strip)
     grupo       → Determinado por reglas de negocio (ver _asignar_grupo)
     abreviatura → Parte alfabética del CODIGO (ej. "ALM-10" → "ALM")
+
+Las reglas se aplican por columnas (np.select / str.match / str.extract).
+_asignar_grupo y _extraer_abreviatura se conservan como versión de
+referencia fila por fila; verification/check_paridad_transformers.py
+compara ambas.
 """
 
 import re
+
+import numpy as np
 import pandas as pd
 
 
@@ -22,6 +29,10 @@ import pandas as pd
 #   3. TRAMITE   → si descripcion empieza con "cierre"
 #   4. PRODUCTO  → valor por defecto
 
+_RE_SERVICIO = r"registro\b"
+_RE_TRAMITE = r"cierre\b"
+_RE_ABREVIATURA = r"^([A-Za-záéíóúÁÉÍÓÚñÑ]+)"
+
 
 def _asignar_grupo(row: pd.Series) -> str:
     """
@@ -53,12 +64,12 @@ def _asignar_grupo(row: pd.Series) -> str:
         return "servicio"
 
     # Condición B: la descripción empieza con "registro"
-    if re.match(r"^registro\b", descripcion, flags=re.IGNORECASE):
+    if re.match("^" + _RE_SERVICIO, descripcion, flags=re.IGNORECASE):
         return "servicio"
 
     # --- Regla 3: TRAMITE ---
     # La descripción empieza con "cierre"
-    if re.match(r"^cierre\b", descripcion, flags=re.IGNORECASE):
+    if re.match("^" + _RE_TRAMITE, descripcion, flags=re.IGNORECASE):
         return "tramite"
 
     # --- Regla 4: Por defecto es producto ---
@@ -87,12 +98,71 @@ def _extraer_abreviatura(codigo) -> str | None:
         return None
 
     # Busca uno o más caracteres alfabéticos al inicio, opcionalmente seguidos de guion
-    match = re.match(r"^([A-Za-záéíóúÁÉÍÓÚñÑ]+)", str(codigo).strip())
+    match = re.match(_RE_ABREVIATURA, str(codigo).strip())
     if match:
         return match.group(1).upper()  # devolvemos en mayúsculas (ej. "LIM")
     return None
 
 
+# ------------------------------------------------------------------ #
+# VERSIÓN POR COLUMNAS                                                #
+# ------------------------------------------------------------------ #
+
+
+def _texto(serie: pd.Series) -> pd.Series:
+    """
+    str(valor).strip() por columna. Se trabaja en dtype object para usar
+    las mismas reglas de Python (re, strip, lower, upper) que la versión
+    fila por fila, también con pandas 3 (donde str usa pyarrow).
+    """
+    return serie.astype(str).astype(object).str.strip()
+
+
+def asignar_grupos(df: pd.DataFrame) -> pd.Series:
+    """Equivalente a df.apply(_asignar_grupo, axis=1), por columnas."""
+    n = len(df)
+
+    def _col(nombre: str) -> pd.Series:
+        if nombre in df.columns:
+            return df[nombre]
+        return pd.Series([""] * n, index=df.index, dtype=object)
+
+    hoja = _texto(_col("hoja_origen")).str.upper()
+    descripcion = _texto(_col("DESCRIPCION")).str.lower()
+    unidad = _texto(_col("UNIDAD")).str.upper()
+    grupo = _col("GRUPO")
+    grupo_txt = _texto(grupo)
+
+    es_farmacia = hoja.eq("FARMACIA").to_numpy()
+    grupo_valido = (grupo.notna() & grupo_txt.ne("")).to_numpy()
+
+    condiciones = [
+        es_farmacia & grupo_valido,  # 1. FARMACIA con GRUPO
+        es_farmacia,  # 1. FARMACIA sin GRUPO
+        unidad.eq("SERVICIO").to_numpy(),  # 2A. SERVICIO por unidad
+        descripcion.str.match(_RE_SERVICIO, case=False, na=False).to_numpy(dtype=bool),
+        descripcion.str.match(_RE_TRAMITE, case=False, na=False).to_numpy(dtype=bool),
+    ]
+    opciones = [
+        grupo_txt.str.lower().to_numpy(dtype=object),
+        "producto",
+        "servicio",
+        "servicio",
+        "tramite",
+    ]
+    grupos = np.select(condiciones, opciones, default="producto").astype(object)
+    return pd.Series(grupos, index=df.index)
+
+
+def extraer_abreviaturas(codigos: pd.Series) -> pd.Series:
+    """Equivalente a codigos.apply(_extraer_abreviatura), por columnas."""
+    texto = _texto(codigos)
+    abreviatura = texto.str.extract(_RE_ABREVIATURA, expand=False).str.upper()
+    valida = (codigos.notna() & texto.ne("") & abreviatura.notna()).to_numpy()
+    valores = np.where(valida, abreviatura.to_numpy(dtype=object), None)
+    return pd.Series(valores, index=codigos.index)
+
+
 # ------------------------------------------------------------------ #
 # FUNCIÓN PRINCIPAL                                                   #
 # ------------------------------------------------------------------ #
@@ -119,11 +189,11 @@ def transform_items(df: pd.DataFrame) -> pd.DataFrame:
     # --- nombre: DESCRIPCION en minúsculas y sin espacios extremos ---
     resultado["nombre"] = df["DESCRIPCION"].astype(str).str.strip().str.lower()
 
-    # --- grupo: aplicar reglas fila por fila ---
-    resultado["grupo"] = df.apply(_asignar_grupo, axis=1)
+    # --- grupo: reglas de negocio aplicadas por columnas ---
+    resultado["grupo"] = asignar_grupos(df)
 
     # --- abreviatura: parte alfabética del CODIGO ---
-    resultado["abreviatura"] = df["CODIGO"].apply(_extraer_abreviatura)
+    resultado["abreviatura"] = extraer_abreviaturas(df["CODIGO"])
 
     print(f"[transformer] DataFrame transformado: {len(resultado)} filas")
     print(
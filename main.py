@@ -12,10 +12,22 @@ Ejecuta en orden:
   5. donaciones       → output/donaciones.sql
                         (ingresos + ingreso_detalles + egresos para DONACIONES)
 
+Con --directo no se generan archivos: cada etapa inserta en la BD por
+lotes (utils/db_loader.py) y le pasa a la siguiente los ids generados,
+sin consultar ingresos id > 6 / ingreso_detalles id > 7.
+
+Con --formato tsv cada etapa genera, en lugar del .sql de INSERTs, un TSV
+y un driver output/<tabla>_load.sql que lo carga con LOAD DATA LOCAL
+INFILE (utils/tsv_writer.py). Se ejecutan en el mismo orden que los .sql.
+--formato y --directo no se combinan.
+
 Uso:
     python main.py
+    python main.py --formato tsv
+    python main.py --directo [--lote 1000]
 """
 
+import argparse
 import os
 
 from dotenv import load_dotenv
@@ -28,6 +40,7 @@ import run_egresos
 import run_ingresos
 import run_ingreso_detalles
 import run_donaciones
+from utils.db_loader import LOTE_FILAS
 
 load_dotenv()
 
@@ -41,36 +54,93 @@ def _get_engine():
     return create_engine(url)
 
 
+def _main_directo(dfs_limpios: dict, lote_filas: int):
+    engine = _get_engine()
+
+    run_catalogo_items.run(dfs_limpios, engine=engine, directo=True)
+    df_ingresos = run_ingresos.run(
+        dfs_limpios, engine=engine, directo=True, lote_filas=lote_filas
+    )
+    df_detalles = run_ingreso_detalles.run(
+        dfs_limpios,
+        engine,
+        directo=True,
+        df_ingresos=df_ingresos,
+        lote_filas=lote_filas,
+    )
+    run_egresos.run(
+        dfs_limpios,
+        engine,
+        directo=True,
+        df_ingreso_detalles=df_detalles,
+        lote_filas=lote_filas,
+    )
+    run_donaciones.run(dfs_limpios, engine, directo=True, lote_filas=lote_filas)
+
+    print("\n" + "=" * 60)
+    print("Pipeline completa. Datos insertados directamente en la BD.")
+    print("=" * 60)
+
+
 def main():
+    parser = argparse.ArgumentParser(description="ETL SEDEGES")
+    parser.add_argument(
+        "--directo",
+        action="store_true",
+        help="insertar directamente en la BD en vez de generar los .sql",
+    )
+    parser.add_argument(
+        "--formato",
+        choices=["sql", "tsv"],
+        help="sql: INSERTs (default); tsv: TSV + driver LOAD DATA LOCAL INFILE "
+        "(no aplica con --directo)",
+    )
+    parser.add_argument(
+        "--lote",
+        type=int,
+        default=LOTE_FILAS,
+        help=f"filas por lote / transacción con --directo (default {LOTE_FILAS})",
+    )
+    args = parser.parse_args()
+    if args.directo and args.formato is not None:
+        parser.error("--formato no aplica con --directo (los datos van directo a la BD)")
+
     print("=" * 60)
     print("ETL SEDEGES — Pipeline completa")
     print("=" * 60)
 
-    dfs_limpios = load_dfs_limpios()
+    dfs_limpios = load_dfs_limpios(workers=None)  # una hoja por núcleo
+
+    if args.directo:
+        _main_directo(dfs_limpios, args.lote)
+        return
+
+    formato = args.formato or "sql"
 
     # 1. catalogo_items
-    run_catalogo_items.run(dfs_limpios)
+    run_catalogo_items.run(dfs_limpios, formato=formato)
 
     # 2. ingresos
-    run_ingresos.run(dfs_limpios)
+    run_ingresos.run(dfs_limpios, formato=formato)
 
     # 3. ingreso_detalles (necesita la DB para lookups y renombrar columna)
     engine = _get_engine()
-    run_ingreso_detalles.run(dfs_limpios, engine)
+    run_ingreso_detalles.run(dfs_limpios, engine, formato=formato)
 
     # 4. egresos (requiere ingreso_detalles con id > 7 en la DB)
-    run_egresos.run(dfs_limpios, engine)
+    run_egresos.run(dfs_limpios, engine, formato=formato)
 
     # 5. donaciones (ingresos + ingreso_detalles + egresos para DONACIONES)
-    run_donaciones.run(dfs_limpios, engine)
+    run_donaciones.run(dfs_limpios, engine, formato=formato)
 
+    sufijo = ".sql" if formato == "sql" else "_load.sql (+ .tsv)"
     print("\n" + "=" * 60)
     print("Pipeline completa. Archivos generados en output/:")
-    print("  - catalogo_items.sql")
-    print("  - ingresos.sql")
-    print("  - ingreso_detalles.sql")
-    print("  - egresos.sql")
-    print("  - donaciones.sql")
+    print(f"  - catalogo_items{sufijo}")
+    print(f"  - ingresos{sufijo}")
+    print(f"  - ingreso_detalles{sufijo}")
+    print(f"  - egresos{sufijo}")
+    print(f"  - donaciones{sufijo}")
     print("=" * 60)
 
 
@@ -1,3 +1,6 @@
+import re
+
+import numpy as np
 import pandas as pd
 
 FARMACIA_GRUPOS = [
@@ -10,82 +13,200 @@ FARMACIA_GRUPOS = [
     "LABORATORIO",
 ]
 
+# Las funciones marcar_* devuelven (columnas nuevas, máscara de filas a
+# conservar) sin copiar la hoja; aplicar_marcas arma el resultado. El
+# argumento `estado` (dict) permite limpiar una hoja por bloques: guarda el
+# último PARTIDA_CODIGO / GRUPO visto para continuar el ffill en el bloque
+# siguiente.
+
+# ------------------------------------------------------------------ #
+#  Clasificador de filas                                              #
+# ------------------------------------------------------------------ #
+# Un solo patrón por tipo de hoja, aplicado una vez a cada celda de la
+# columna 0. Cada regla es un lookahead opcional con su grupo con nombre,
+# así todas se evalúan desde el inicio del texto en la misma pasada:
+#   codigo         "PARTIDA N° 123" en cualquier parte (distingue mayúsculas)
+#   partida        "PARTIDA N° 123" al inicio (ignora mayúsculas)
+#   total_partida  "TOTAL PARTIDA" en cualquier parte (ignora mayúsculas)
+#   total_general  "TOTAL GENERAL" en cualquier parte (ignora mayúsculas)
+#   total          la palabra TOTAL en cualquier parte (ignora mayúsculas)
+#   totales        la palabra TOTALES en cualquier parte (ignora mayúsculas)
+#   grupo          el texto completo es un grupo de FARMACIA_GRUPOS
+_PARTIDA = r"PARTIDA\s*N[°º]\s*"
+
+
+def _en_cualquier_parte(nombre: str, patron: str) -> str:
+    return rf"(?=(?:.*?(?P<{nombre}>{patron}))?)"
+
+
+def _al_inicio(nombre: str, patron: str) -> str:
+    return rf"(?=(?P<{nombre}>{patron})?)"
+
+
+_CODIGO = _en_cualquier_parte("codigo", _PARTIDA + r"(?P<numero>\d+)")
+_CABECERA = _al_inicio("partida", rf"(?i:{_PARTIDA}\d+)")
+
+_RE_DETALLE = re.compile(
+    "(?s)"
+    + _CODIGO
+    + _CABECERA
+    + _en_cualquier_parte("total_partida", r"(?i:TOTAL\s+PARTIDA)")
+    + _en_cualquier_parte("total_general", r"(?i:TOTAL\s+GENERAL)")
+)
+_RE_FARMACIA = re.compile(
+    "(?s)"
+    + _CODIGO
+    + _CABECERA
+    + _en_cualquier_parte("total", r"(?i:\bTOTAL\b)")
+    + _al_inicio(
+        "grupo",
+        "(?:" + "|".join(re.escape(g.strip()) for g in FARMACIA_GRUPOS) + r")\Z",
+    )
+)
+_RE_CONTABLE = re.compile(
+    "(?s)"
+    + _en_cualquier_parte("total", r"(?i:\bTOTAL\b)")
+    + _en_cualquier_parte("totales", r"(?i:\bTOTALES\b)")
+)
+
+# Etiquetas de fila (si varias reglas aplican, gana la primera)
+FILA_DATO = 0
+FILA_PARTIDA = 1
+FILA_TOTAL_PARTIDA = 2
+FILA_TOTAL_GENERAL = 3
+FILA_TOTAL = 4
+FILA_GRUPO = 5
+
+_ETIQUETAS = [
+    ("grupo", FILA_GRUPO),
+    ("partida", FILA_PARTIDA),
+    ("total_partida", FILA_TOTAL_PARTIDA),
+    ("total_general", FILA_TOTAL_GENERAL),
+    ("total", FILA_TOTAL),
+    ("totales", FILA_TOTAL),
+]
+
+
+def clasificar_filas(
+    col0: pd.Series, patron: re.Pattern
+) -> tuple[np.ndarray, pd.Series]:
+    """
+    Clasifica cada fila con una sola pasada del patrón sobre la columna 0.
+
+    La columna se factoriza primero: el patrón se aplica una vez por texto
+    distinto (los números de ítem, cabeceras y totales se repiten entre
+    partidas) y el resultado se reparte a las filas por código.
+
+    Args:
+        col0:   columna 0 ya convertida a texto (ver _col0_str)
+        patron: _RE_DETALLE, _RE_FARMACIA o _RE_CONTABLE
+
+    Returns:
+        (etiquetas FILA_* como int8, número de partida extraído o NaN)
+    """
+    grupos = [(patron.groupindex[g], e) for g, e in _ETIQUETAS if g in patron.groupindex]
+    i_numero = patron.groupindex.get("numero")
+
+    codigos, unicos = pd.factorize(col0)
+    etiquetas = np.zeros(len(unicos), dtype=np.int8)
+    numeros = np.full(len(unicos), np.nan, dtype=object)
+    for i, texto in enumerate(unicos.tolist()):
+        m = patron.match(texto)
+        for grupo, etiqueta in grupos:
+            if m.start(grupo) >= 0:
+                etiquetas[i] = etiqueta
+                break
+        if i_numero is not None and m.start(i_numero) >= 0:
+            numeros[i] = m.group(i_numero)
+
+    return (
+        etiquetas[codigos],
+        pd.Series(numeros[codigos], index=col0.index, dtype=col0.dtype),
+    )
+
 
+# ------------------------------------------------------------------ #
+#  Reglas                                                             #
+# ------------------------------------------------------------------ #
 def _col0_str(df: pd.DataFrame) -> pd.Series:
     return df.iloc[:, 0].astype(str).fillna("").str.strip()
 
 
-def clean_detalle(df: pd.DataFrame) -> pd.DataFrame:
-    # reglas para todas las hojas detalle
-    col0 = _col0_str(df)
+def _ffill(serie: pd.Series, estado: dict | None, clave: str) -> pd.Series:
+    if estado is None:
+        return serie.ffill()
+    # el valor arrastrado del bloque anterior entra como primera celda
+    if len(serie) and pd.isna(serie.iloc[0]) and estado.get(clave) is not None:
+        serie = serie.copy()
+        serie.iloc[0] = estado[clave]
+    serie = serie.ffill()
+    if len(serie) and pd.notna(serie.iloc[-1]):
+        estado[clave] = serie.iloc[-1]
+    return serie
 
-    df = df.copy()
-    df["PARTIDA_CODIGO"] = col0.str.extract(r"PARTIDA\s*N[°º]\s*(\d+)", expand=False)
-    df["PARTIDA_CODIGO"] = df["PARTIDA_CODIGO"].ffill()
 
-    mask_partida_header = col0.str.contains(
-        r"^PARTIDA\s*N[°º]\s*\d+", case=False, regex=True
-    )
-    mask_total_partida = col0.str.contains(r"TOTAL\s+PARTIDA", case=False, na=False)
-    mask_total_general = col0.str.contains(r"TOTAL\s+GENERAL", case=False, na=False)
+def _codigo_vacio(df: pd.DataFrame) -> np.ndarray:
+    codigo = df["CODIGO"]
+    return (codigo.isna() | (codigo.astype(str).str.strip() == "")).to_numpy(dtype=bool)
 
-    mask_codigo_vacio = df["CODIGO"].isna() | (
-        df["CODIGO"].astype(str).str.strip() == ""
-    )
 
-    out = df[
-        ~(
-            mask_partida_header
-            | mask_total_partida
-            | mask_total_general
-            | mask_codigo_vacio
-        )
-    ].copy()
+def aplicar_marcas(
+    df: pd.DataFrame, nuevas: pd.DataFrame, mantener: np.ndarray
+) -> pd.DataFrame:
+    # única copia: solo las filas conservadas
+    filas = np.flatnonzero(mantener)
+    out = df.take(filas)
     out.reset_index(drop=True, inplace=True)
+    for col in nuevas.columns:
+        out[col] = nuevas[col].take(filas).reset_index(drop=True)
     return out
 
 
-def clean_farmacia(df: pd.DataFrame) -> pd.DataFrame:
-    # hoja detalle farmacia con reglas especiales
-    col0 = _col0_str(df)
-    df = df.copy()
+def marcar_detalle(
+    df: pd.DataFrame, estado: dict | None = None
+) -> tuple[pd.DataFrame, np.ndarray]:
+    # reglas para todas las hojas detalle
+    etiquetas, numeros = clasificar_filas(_col0_str(df), _RE_DETALLE)
 
-    grupos_set = set(g.strip() for g in FARMACIA_GRUPOS)
-    mask_grupo_header = col0.isin(grupos_set)
+    nuevas = pd.DataFrame(index=df.index)
+    nuevas["PARTIDA_CODIGO"] = _ffill(numeros, estado, "PARTIDA_CODIGO")
 
-    df["GRUPO"] = col0.where(mask_grupo_header)
-    df["GRUPO"] = df["GRUPO"].ffill()
+    mantener = (etiquetas == FILA_DATO) & ~_codigo_vacio(df)
+    return nuevas, mantener
 
-    df["PARTIDA_CODIGO"] = col0.str.extract(r"PARTIDA\s*N[°º]\s*(\d+)", expand=False)
-    df["PARTIDA_CODIGO"] = df["PARTIDA_CODIGO"].ffill()
 
-    mask_partida_header = col0.str.contains(
-        r"^PARTIDA\s*N[°º]\s*\d+", case=False, regex=True
-    )
-    mask_total_any = col0.str.contains(r"\bTOTAL\b", case=False, regex=True)
+def clean_detalle(df: pd.DataFrame, estado: dict | None = None) -> pd.DataFrame:
+    return aplicar_marcas(df, *marcar_detalle(df, estado))
 
-    mask_codigo_vacio = df["CODIGO"].isna() | (
-        df["CODIGO"].astype(str).str.strip() == ""
-    )
 
-    out = df[
-        ~(mask_grupo_header | mask_partida_header | mask_total_any | mask_codigo_vacio)
-    ].copy()
-    out.reset_index(drop=True, inplace=True)
-    return out
+def marcar_farmacia(
+    df: pd.DataFrame, estado: dict | None = None
+) -> tuple[pd.DataFrame, np.ndarray]:
+    # hoja detalle farmacia con reglas especiales
+    col0 = _col0_str(df)
+    etiquetas, numeros = clasificar_filas(col0, _RE_FARMACIA)
 
+    nuevas = pd.DataFrame(index=df.index)
+    nuevas["GRUPO"] = _ffill(col0.where(etiquetas == FILA_GRUPO), estado, "GRUPO")
+    nuevas["PARTIDA_CODIGO"] = _ffill(numeros, estado, "PARTIDA_CODIGO")
 
-def clean_contable(df: pd.DataFrame) -> pd.DataFrame:
-    # reglas para hojas contables
-    df = df.copy()
-    col0 = _col0_str(df)
+    mantener = (etiquetas == FILA_DATO) & ~_codigo_vacio(df)
+    return nuevas, mantener
 
-    mask_total = col0.str.contains(r"\bTOTAL\b", case=False, regex=True)
-    mask_totales = col0.str.contains(r"\bTOTALES\b", case=False, regex=True)
 
-    out = df[~mask_total & ~mask_totales].copy()
+def clean_farmacia(df: pd.DataFrame, estado: dict | None = None) -> pd.DataFrame:
+    return aplicar_marcas(df, *marcar_farmacia(df, estado))
 
-    out = out.dropna(how="all").copy()
 
-    out.reset_index(drop=True, inplace=True)
-    return out
+def marcar_contable(
+    df: pd.DataFrame, estado: dict | None = None
+) -> tuple[pd.DataFrame, np.ndarray]:
+    # reglas para hojas contables (sin ffill: `estado` no se usa)
+    etiquetas, _ = clasificar_filas(_col0_str(df), _RE_CONTABLE)
+
+    mantener = (etiquetas == FILA_DATO) & ~df.isna().all(axis=1).to_numpy(dtype=bool)
+    return pd.DataFrame(index=df.index), mantener
+
+
+def clean_contable(df: pd.DataFrame, estado: dict | None = None) -> pd.DataFrame:
+    return aplicar_marcas(df, *marcar_contable(df, estado))
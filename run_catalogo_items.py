@@ -10,14 +10,26 @@ O importarse desde main.py:
 """
 
 from items_migration import build_catalogo_items_df
-from items_migration.exporter_sql import export_items_to_sql
+from items_migration.exporter_sql import (
+    export_items_to_db,
+    export_items_to_sql,
+    export_items_to_tsv,
+)
 from excel_loader import load_dfs_limpios
+from utils.sql_writer import FILAS_POR_INSERT
 
 
-def run(dfs_limpios: dict | None = None):
+def run(
+    dfs_limpios: dict | None = None,
+    engine=None,
+    directo: bool = False,
+    formato: str = "sql",
+):
     """
     Corre la migración de catalogo_items.
     Si dfs_limpios es None, carga el Excel por su cuenta.
+    Con directo=True inserta en la BD en vez de generar el .sql; con
+    formato="tsv" genera TSV + driver LOAD DATA.
     """
     if dfs_limpios is None:
         dfs_limpios = load_dfs_limpios()
@@ -28,7 +40,18 @@ def run(dfs_limpios: dict | None = None):
     )
     print(df_items.head(5).to_string())
 
-    ruta_sql = export_items_to_sql(df_items, filename="catalogo_items.sql")
+    if directo:
+        export_items_to_db(df_items, engine=engine)
+        return dfs_limpios
+
+    if formato == "tsv":
+        ruta_driver = export_items_to_tsv(df_items, filename="catalogo_items.tsv")
+        print(f"\n[run_catalogo_items] Driver LOAD DATA generado: {ruta_driver}")
+        return dfs_limpios
+
+    ruta_sql = export_items_to_sql(
+        df_items, filename="catalogo_items.sql", filas_por_insert=FILAS_POR_INSERT
+    )
     print(f"\n[run_catalogo_items] SQL generado: {ruta_sql}")
     return dfs_limpios
 
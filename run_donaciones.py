@@ -25,7 +25,12 @@ import os
 from dotenv import load_dotenv
 from sqlalchemy import create_engine
 
-from donaciones_migration import build_donaciones_sql
+from donaciones_migration import (
+    build_donaciones_sql,
+    build_donaciones_tsv,
+    load_donaciones_to_db,
+)
+from utils.db_loader import LOTE_FILAS
 from utils.logger import get_logger
 
 load_dotenv()
@@ -42,13 +47,22 @@ def _get_engine():
     return create_engine(url)
 
 
-def run(dfs_limpios: dict, engine=None):
+def run(
+    dfs_limpios: dict,
+    engine=None,
+    directo: bool = False,
+    lote_filas: int = LOTE_FILAS,
+    formato: str = "sql",
+):
     """
     Ejecuta la migración de DONACIONES de principio a fin.
 
     Args:
         dfs_limpios: dict {nombre_hoja: DataFrame} ya limpiados
         engine:      SQLAlchemy engine (opcional; si None lo crea internamente)
+        directo:     inserta en la BD en vez de generar el .sql
+        lote_filas:  filas por lote / transacción en el modo directo
+        formato:     "sql" (INSERTs) o "tsv" (TSV + driver LOAD DATA)
     """
     logger.info("=" * 60)
     logger.info("MIGRACIÓN: DONACIONES")
@@ -57,6 +71,14 @@ def run(dfs_limpios: dict, engine=None):
     if engine is None:
         engine = _get_engine()
 
+    if directo:
+        return load_donaciones_to_db(dfs_limpios, engine, lote_filas)
+
+    if formato == "tsv":
+        ruta_driver = build_donaciones_tsv(dfs_limpios, engine)
+        logger.info(f"[run_donaciones] Driver LOAD DATA generado: {ruta_driver}")
+        return ruta_driver
+
     ruta_sql = build_donaciones_sql(dfs_limpios, engine)
     logger.info(f"[run_donaciones] SQL generado: {ruta_sql}")
 
@@ -17,8 +17,15 @@ import os
 from dotenv import load_dotenv
 from sqlalchemy import create_engine
 
-from egresos_migration import build_egresos_df, export_egresos_to_sql
+from egresos_migration import (
+    build_egresos_df,
+    export_egresos_to_db,
+    export_egresos_to_sql,
+    export_egresos_to_tsv,
+)
+from utils.db_loader import LOTE_FILAS
 from utils.logger import get_logger
+from utils.sql_writer import FILAS_POR_INSERT
 
 load_dotenv()
 
@@ -39,7 +46,14 @@ def _get_engine():
     return create_engine(url)
 
 
-def run(dfs_limpios: dict, engine=None):
+def run(
+    dfs_limpios: dict,
+    engine=None,
+    directo: bool = False,
+    df_ingreso_detalles=None,
+    lote_filas: int = LOTE_FILAS,
+    formato: str = "sql",
+):
     """
     Ejecuta la migración de egresos de principio a fin.
 
@@ -49,6 +63,15 @@ def run(dfs_limpios: dict, engine=None):
             limpiadas por `run_catalogo_items.load_dfs_limpios`.
         engine:
             Conexión SQLAlchemy ya creada. Si es None, se crea internamente.
+        directo:
+            Inserta en la BD en vez de generar el .sql.
+        df_ingreso_detalles:
+            Lo que devolvió run_ingreso_detalles en el modo directo (si es
+            None se lee ingreso_detalles con id > 7 de la BD).
+        lote_filas:
+            Filas por lote / transacción en el modo directo.
+        formato:
+            "sql" (INSERTs) o "tsv" (TSV + driver LOAD DATA).
     """
     logger.info("=" * 60)
     logger.info("MIGRACIÓN: egresos")
@@ -59,14 +82,28 @@ def run(dfs_limpios: dict, engine=None):
         engine = _get_engine()
 
     # 1) Construir el DataFrame final de egresos (solo memoria)
-    df_egresos = build_egresos_df(dfs_limpios, engine)
+    df_egresos = build_egresos_df(
+        dfs_limpios, engine, df_ingreso_detalles=df_ingreso_detalles
+    )
 
     logger.info(
         f"DataFrame egresos listo: {df_egresos.shape[0]} filas x {df_egresos.shape[1]} columnas"
     )
 
     # 2) Exportar ese DataFrame a un archivo SQL listo para ejecutar en MySQL
-    ruta_sql = export_egresos_to_sql(df_egresos, filename="egresos.sql")
+    #    (o insertarlo directamente en la BD)
+    if directo:
+        export_egresos_to_db(df_egresos, engine, lote_filas)
+        return df_egresos
+
+    if formato == "tsv":
+        ruta_driver = export_egresos_to_tsv(df_egresos, filename="egresos.tsv")
+        logger.info(f"[run_egresos] Driver LOAD DATA generado: {ruta_driver}")
+        return df_egresos
+
+    ruta_sql = export_egresos_to_sql(
+        df_egresos, filename="egresos.sql", filas_por_insert=FILAS_POR_INSERT
+    )
     logger.info(f"[run_egresos] SQL generado: {ruta_sql}")
 
     return df_egresos
@@ -8,7 +8,7 @@ PREREQUISITO: ingresos.sql debe haber sido ejecutado en la DB primero.
 Acciones:
   1. Renombra producto_id → item_id en ingreso_detalles (si aún no se hizo)
   2. Construye el DataFrame de ingreso_detalles (con lookups a DB + fallback auto-insert)
-  3. Genera output/ingreso_detalles.sql (INSERTs + UPDATEs de total y etapa_ingreso)
+  3. Genera output/ingreso_detalles.sql (INSERTs)
 
 Puede ejecutarse directamente:
     python run_ingreso_detalles.py
@@ -24,7 +24,13 @@ from sqlalchemy import create_engine, text
 from sqlalchemy.exc import OperationalError
 
 from ingreso_detalles_migration import build_ingreso_detalles_df
-from ingreso_detalles_migration.exporter_sql import export_ingreso_detalles_to_sql
+from ingreso_detalles_migration.exporter_sql import (
+    export_ingreso_detalles_to_db,
+    export_ingreso_detalles_to_sql,
+    export_ingreso_detalles_to_tsv,
+)
+from utils.db_loader import LOTE_FILAS
+from utils.sql_writer import FILAS_POR_INSERT
 
 load_dotenv()
 
@@ -39,13 +45,30 @@ def _get_engine():
 
 
 
-def run(dfs_limpios: dict, engine=None):
+def run(
+    dfs_limpios: dict,
+    engine=None,
+    directo: bool = False,
+    df_ingresos=None,
+    lote_filas: int = LOTE_FILAS,
+    formato: str = "sql",
+):
     """
     Corre la migración de ingreso_detalles.
 
     Args:
         dfs_limpios: dict {nombre_hoja: DataFrame} ya limpios
         engine:      SQLAlchemy engine (opcional; si None lo crea internamente)
+        directo:     inserta en la BD en vez de generar el .sql
+        df_ingresos: [id, almacen_id] que devolvió run_ingresos en el modo
+                     directo (si None se consultan en la BD)
+        lote_filas:  filas por lote / transacción en el modo directo
+        formato:     "sql" (INSERTs) o "tsv" (TSV + driver LOAD DATA)
+
+    Returns:
+        df_detalles; con directo=True, el DataFrame [id, ingreso_id,
+        almacen_id, partida_id, item_id] de los detalles insertados
+        (entrada de run_egresos)
     """
     print("\n" + "=" * 60)
     print("MIGRACIÓN: ingreso_detalles")
@@ -54,7 +77,9 @@ def run(dfs_limpios: dict, engine=None):
     if engine is None:
         engine = _get_engine()
     # Paso 1: Construir DataFrame
-    df_detalles, etapas_df = build_ingreso_detalles_df(dfs_limpios, engine)
+    df_detalles = build_ingreso_detalles_df(
+        dfs_limpios, engine, df_ingresos=df_ingresos
+    )
 
     print(
         f"\nDataFrame de ingreso_detalles listo: "
@@ -62,9 +87,21 @@ def run(dfs_limpios: dict, engine=None):
     )
     print(df_detalles.head(3).to_string())
 
-    # Paso 2: Exportar SQL
+    # Paso 2: Exportar SQL (o insertar directo en la BD)
+    if directo:
+        return export_ingreso_detalles_to_db(df_detalles, engine, lote_filas)
+
+    if formato == "tsv":
+        ruta_driver = export_ingreso_detalles_to_tsv(
+            df_detalles, filename="ingreso_detalles.tsv"
+        )
+        print(f"\n[run_ingreso_detalles] Driver LOAD DATA generado: {ruta_driver}")
+        return df_detalles
+
     ruta_sql = export_ingreso_detalles_to_sql(
-        df_detalles, etapas_df, filename="ingreso_detalles.sql"
+        df_detalles,
+        filename="ingreso_detalles.sql",
+        filas_por_insert=FILAS_POR_INSERT,
     )
     print(f"\n[run_ingreso_detalles] SQL generado: {ruta_sql}")
     return df_detalles
@@ -13,20 +13,51 @@ import os
 import pandas as pd
 
 from dotenv import load_dotenv
+from sqlalchemy import create_engine
 
 from ingresos_migration import build_ingresos_df
-from ingresos_migration.exporter_sql import export_ingresos_to_sql
+from ingresos_migration.exporter_sql import (
+    export_ingresos_to_db,
+    export_ingresos_to_sql,
+    export_ingresos_to_tsv,
+)
 from excel_export import export_book_to_excel
+from utils.db_loader import LOTE_FILAS
+from utils.sql_writer import FILAS_POR_INSERT
 
 load_dotenv()
 
 
-def run(dfs_limpios: dict):
+def _get_engine():
+    url = (
+        f"mysql+pymysql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}"
+        f"@{os.getenv('DB_HOST', 'localhost')}:{os.getenv('DB_PORT', '3306')}"
+        f"/{os.getenv('DB_NAME')}"
+    )
+    return create_engine(url)
+
+
+def run(
+    dfs_limpios: dict,
+    engine=None,
+    directo: bool = False,
+    lote_filas: int = LOTE_FILAS,
+    formato: str = "sql",
+):
     """
     Corre la migración de ingresos.
 
     Args:
         dfs_limpios: dict {nombre_hoja: DataFrame} ya limpios (de run_catalogo_items)
+        engine:      SQLAlchemy engine (solo para directo=True; si None lo
+                     crea internamente)
+        directo:     inserta en la BD en vez de generar el .sql
+        lote_filas:  filas por lote / transacción en el modo directo
+        formato:     "sql" (INSERTs) o "tsv" (TSV + driver LOAD DATA)
+
+    Returns:
+        df_ingresos; con directo=True, el DataFrame [id, almacen_id] de los
+        ingresos insertados (entrada de run_ingreso_detalles)
     """
     print("\n" + "=" * 60)
     print("MIGRACIÓN: ingresos")
@@ -40,7 +71,19 @@ def run(dfs_limpios: dict):
     )
     print(df_ingresos.head(3).to_string())
 
-    ruta_sql = export_ingresos_to_sql(df_ingresos, filename="ingresos.sql")
+    if directo:
+        if engine is None:
+            engine = _get_engine()
+        return export_ingresos_to_db(df_ingresos, engine, lote_filas)
+
+    if formato == "tsv":
+        ruta_driver = export_ingresos_to_tsv(df_ingresos, filename="ingresos.tsv")
+        print(f"\n[run_ingresos] Driver LOAD DATA generado: {ruta_driver}")
+        return df_ingresos
+
+    ruta_sql = export_ingresos_to_sql(
+        df_ingresos, filename="ingresos.sql", filas_por_insert=FILAS_POR_INSERT
+    )
     print(f"\n[run_ingresos] SQL generado: {ruta_sql}")
     return df_ingresos
 
@@ -0,0 +1,129 @@
+"""
+utils.db_loader
+================
+Carga directa de los DataFrames a la BD (modo --directo de main.py), sin
+generar ni reproducir los archivos .sql.
+
+Cada lote de `lote_filas` filas va en su propia transacción explícita:
+  1. SELECT MAX(id) de la tabla
+  2. INSERT con executemany (pymysql lo reescribe como un INSERT
+     multi-fila)
+  3. SELECT de los ids mayores al MAX anterior → ids generados del lote
+  4. COMMIT
+Si la cantidad de ids nuevos no coincide con la del lote (otro proceso
+escribió en la tabla al mismo tiempo) se hace ROLLBACK del lote y se
+detiene. Los ids se devuelven en el orden de las filas para que la etapa
+siguiente los use directamente.
+
+Los valores siguen las mismas reglas que los .sql (utils.sql_render:
+columnas con quote=True como texto recortado, vacíos → NULL), y la
+conexión desactiva FOREIGN_KEY_CHECKS igual que la cabecera de los .sql.
+
+Uso:
+    from utils.db_loader import conectar, insert_dataframe
+    with conectar(engine) as conn:
+        ids = insert_dataframe(conn, "ingresos", df, _COLUMNAS_SQL)
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from utils.sql_render import param_column
+
+# Filas por lote (y por transacción) en los modos directos
+LOTE_FILAS = 1000
+
+
+@contextmanager
+def conectar(engine: Engine) -> Iterator[Connection]:
+    """
+    Conexión para la carga directa, con la misma configuración de sesión
+    que la cabecera de los .sql (solo MySQL).
+    """
+    with engine.connect() as conn:
+        es_mysql = conn.dialect.name == "mysql"
+        if es_mysql:
+            conn.execute(text("SET NAMES utf8mb4"))
+            conn.execute(text("SET FOREIGN_KEY_CHECKS = 0"))
+            conn.commit()
+        try:
+            yield conn
+        finally:
+            if es_mysql:
+                conn.rollback()
+                conn.execute(text("SET FOREIGN_KEY_CHECKS = 1"))
+                conn.commit()
+
+
+def _transaccion(conn: Connection):
+    """Transacción explícita del lote (cierra la implícita que haya abierto
+    una consulta anterior en la misma conexión)."""
+    if conn.in_transaction():
+        conn.commit()
+    return conn.begin()
+
+
+def _lotes(n: int, lote_filas: int) -> Iterator[tuple[int, int]]:
+    paso = max(int(lote_filas), 1)
+    for inicio in range(0, n, paso):
+        yield inicio, min(inicio + paso, n)
+
+
+def insert_dataframe(
+    conn: Connection,
+    tabla: str,
+    df: pd.DataFrame,
+    columnas: list[tuple[str, bool]],
+    lote_filas: int = LOTE_FILAS,
+) -> np.ndarray:
+    """
+    Inserta las columnas indicadas de `df` en `tabla`, por lotes.
+
+    Args:
+        conn:       conexión de conectar()
+        tabla:      tabla destino (con id autoincremental)
+        df:         DataFrame de origen
+        columnas:   lista de (columna, quote), la misma de los exporters;
+                    las que no existen en df se insertan como NULL
+        lote_filas: filas por lote / transacción
+
+    Returns:
+        array int64 con el id generado de cada fila, en el orden de df
+    """
+    nombres = [c for c, _ in columnas]
+    cols = ", ".join(f"`{c}`" for c in nombres)
+    marcas = ", ".join(f":p{i}" for i in range(len(nombres)))
+    insert = text(f"INSERT INTO `{tabla}` ({cols}) VALUES ({marcas})")
+    max_id = text(f"SELECT COALESCE(MAX(id), 0) FROM `{tabla}`")
+    nuevos = text(f"SELECT id FROM `{tabla}` WHERE id > :desde ORDER BY id")
+
+    ids = np.empty(len(df), dtype=np.int64)
+    for inicio, fin in _lotes(len(df), lote_filas):
+        bloque = df.iloc[inicio:fin]
+        valores = [
+            param_column(bloque[c], quote) if c in bloque.columns else [None] * len(bloque)
+            for c, quote in columnas
+        ]
+        filas = [
+            {f"p{i}": v for i, v in enumerate(fila)} for fila in zip(*valores)
+        ]
+
+        with _transaccion(conn):
+            desde = conn.execute(max_id).scalar()
+            conn.execute(insert, filas)
+            generados = conn.execute(nuevos, {"desde": desde}).scalars().all()
+            if len(generados) != len(filas):
+                raise RuntimeError(
+                    f"{tabla}: se insertaron {len(filas)} filas pero aparecieron "
+                    f"{len(generados)} ids nuevos (¿otro proceso escribiendo en la "
+                    "tabla?). Se deshace el lote."
+                )
+        ids[inicio:fin] = generados
+
+    print(f"[db_loader] {len(df)} filas insertadas en `{tabla}`")
+    return ids
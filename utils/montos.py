@@ -0,0 +1,73 @@
+"""
+utils.montos
+============
+Selección saldo / ingreso de cada fila de las hojas detalle, compartida
+por `ingresos` (total, etapa_ingreso) e `ingreso_detalles` (cantidad,
+costo, total).
+
+Regla:
+  - Si SALDO_AL_01_DE_ENERO_DE_2025_TOTAL Bs. > 0:
+        cantidad/costo/total = columnas de SALDO  → etapa = 'ANTES 2025'
+  - Sino:
+        cantidad/costo/total = columnas de INGRESO → etapa = '2025'
+
+Cada fila de una hoja detalle genera exactamente un ingreso y un detalle,
+así que ambos transformers aplican calcular_montos a las mismas filas y
+el ingreso sale con su total y etapa finales (sin UPDATE posterior).
+
+El cálculo es por columnas (calcular_montos): cada columna se convierte a
+número una sola vez (utils/numeros.py; las hojas del loader ya vienen en
+float64) y la condición se aplica con np.where.
+verification/check_paridad_transformers.py lo compara con la versión
+original fila por fila.
+
+Uso:
+    from utils.montos import calcular_montos
+    montos = calcular_montos(df)  # [cantidad, costo, total, _etapa]
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.numeros import a_numeros
+
+_COL_SALDO_TOTAL = "SALDO_AL_01_DE_ENERO_DE_2025_TOTAL Bs."
+_COL_SALDO_CANT = "SALDO_AL_01_DE_ENERO_DE_2025_CANT"
+_COL_SALDO_VALOR = "SALDO_AL_01_DE_ENERO_DE_2025_valor"
+
+_COL_ING_TOTAL = "INGRESO_ALMACENES_TOTAL Bs."
+_COL_ING_CANT = "INGRESO_ALMACENES_CANT"
+_COL_ING_VALOR = "INGRESO_ALMACENES_VALOR"
+
+_ETAPA_SALDO = "ANTES 2025"
+_ETAPA_INGRESO = "2025"
+
+
+def calcular_montos(df_raw: pd.DataFrame) -> pd.DataFrame:
+    """
+    cantidad/costo/total/etapa de cada fila, por columnas.
+
+    Returns:
+        DataFrame [cantidad, costo, total, _etapa] alineado con df_raw
+    """
+    saldo_total = a_numeros(df_raw, _COL_SALDO_TOTAL)
+    usa_saldo = saldo_total > 0
+
+    return pd.DataFrame(
+        {
+            "cantidad": np.where(
+                usa_saldo,
+                a_numeros(df_raw, _COL_SALDO_CANT),
+                a_numeros(df_raw, _COL_ING_CANT),
+            ),
+            "costo": np.where(
+                usa_saldo,
+                a_numeros(df_raw, _COL_SALDO_VALOR),
+                a_numeros(df_raw, _COL_ING_VALOR),
+            ),
+            "total": np.where(usa_saldo, saldo_total, a_numeros(df_raw, _COL_ING_TOTAL)),
+            "_etapa": np.where(usa_saldo, _ETAPA_SALDO, _ETAPA_INGRESO).tolist(),
+        },
+        index=df_raw.index,
+    )
+
@@ -0,0 +1,143 @@
+"""
+utils.numeros
+=============
+Conversión a número de las columnas de montos del Excel, compartida por
+el loader, los transformers y las verificaciones.
+
+Las celdas llegan como números, como texto ("1,5", "1.234,56", " 12 ") o
+vacías. Reglas de conversión:
+  - None / NaN / "" / "-" / "nan" / "None" → vacío (NaN, no es error)
+  - números (int/float) → tal cual; bool no se considera número
+  - texto: se quitan los espacios (también NBSP y "'" de miles) y
+      · con "," y "." → el último separador es el decimal, el otro es de miles
+        ("1.234,56" → 1234.56, "1,234.56" → 1234.56)
+      · solo "," → una sola coma es decimal ("1,5" → 1.5); varias, de miles
+      · solo "." → un solo punto es decimal; varios, de miles
+    y lo que queda debe ser un número simple (signo, dígitos, decimales,
+    exponente); "inf", "nan", "1_000", "12 kg" no se aceptan
+  - lo que no se puede convertir → NaN y se cuenta como no convertido
+
+Por columnas (convertir_columna) los valores de texto se factorizan y cada
+valor distinto se convierte una sola vez; las columnas que ya son
+numéricas no se recorren.
+
+Uso:
+    from utils.numeros import a_numero, a_numeros, convertir_columnas
+    a_numero("1.234,56")                  # → 1234.56
+    no_convertidos = convertir_columnas(df, ["INGRESO_ALMACENES_CANT"])
+    cantidades = a_numeros(df, "INGRESO_ALMACENES_CANT")  # NaN → 0
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+_VACIOS = frozenset({"", "-", "nan", "none", "null"})
+_ESPACIOS = re.compile(r"[\s']+")  # \s incluye NBSP y el espacio fino de miles
+_NUMERO = re.compile(r"[+-]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?")
+
+# Resultado de convertir un valor
+_OK = 0
+_VACIO = 1
+_ERROR = 2
+
+
+def _normalizar_separadores(texto: str) -> str:
+    """Deja el texto con "." como único separador decimal y sin miles."""
+    coma, punto = texto.rfind(","), texto.rfind(".")
+    if coma >= 0 and punto >= 0:
+        if coma > punto:
+            return texto.replace(".", "").replace(",", ".")
+        return texto.replace(",", "")
+    if coma >= 0:
+        if texto.count(",") > 1:
+            return texto.replace(",", "")
+        return texto.replace(",", ".")
+    if texto.count(".") > 1:
+        return texto.replace(".", "")
+    return texto
+
+
+def _convertir(valor) -> tuple[float, int]:
+    """(número o NaN, _OK | _VACIO | _ERROR) de un valor suelto."""
+    if valor is None:
+        return np.nan, _VACIO
+    if isinstance(valor, (bool, np.bool_)):
+        return np.nan, _ERROR
+    if isinstance(valor, (int, float, np.integer, np.floating)):
+        if np.isnan(valor):
+            return np.nan, _VACIO
+        return float(valor), _OK
+    if not isinstance(valor, str):
+        try:
+            if pd.isna(valor):
+                return np.nan, _VACIO
+        except (TypeError, ValueError):
+            pass
+        return np.nan, _ERROR
+
+    texto = _ESPACIOS.sub("", valor)
+    if texto.lower() in _VACIOS:
+        return np.nan, _VACIO
+    texto = _normalizar_separadores(texto)
+    if _NUMERO.fullmatch(texto) is None:
+        return np.nan, _ERROR
+    return float(texto), _OK
+
+
+def a_numero(valor, default=0.0):
+    """
+    Convierte un valor suelto; vacío o no convertible → `default`.
+    """
+    numero, estado = _convertir(valor)
+    return numero if estado == _OK else default
+
+
+def convertir_columna(serie: pd.Series) -> tuple[np.ndarray, int]:
+    """
+    Convierte una columna completa.
+
+    Returns:
+        (array float64 con NaN en vacíos y no convertidos,
+         cantidad de valores no vacíos que no se pudieron convertir)
+    """
+    if pd.api.types.is_numeric_dtype(serie) and not pd.api.types.is_bool_dtype(serie):
+        return serie.to_numpy(dtype=np.float64, na_value=np.nan), 0
+
+    codigos, unicos = pd.factorize(serie)
+    convertidos = [_convertir(v) for v in unicos.tolist()]
+    numeros = np.array([n for n, _ in convertidos] + [np.nan], dtype=np.float64)
+    errores = np.array([e == _ERROR for _, e in convertidos] + [False])
+    # codigo -1 (nulo) → última posición: NaN, sin error
+    return numeros[codigos], int(errores[codigos].sum())
+
+
+def a_numeros(df: pd.DataFrame, columna: str, default: float = 0.0) -> np.ndarray:
+    """
+    Columna como array float64 con `default` en vacíos y no convertidos
+    (también si la columna no existe).
+    """
+    if columna not in df.columns:
+        return np.full(len(df), default, dtype=np.float64)
+    numeros, _ = convertir_columna(df[columna])
+    return np.where(np.isnan(numeros), default, numeros)
+
+
+def convertir_columnas(df: pd.DataFrame, columnas) -> dict[str, int]:
+    """
+    Reemplaza en `df` (in place) las columnas indicadas que existan por su
+    versión float64.
+
+    Returns:
+        {columna: no convertidos} de las columnas con algún valor no convertido
+    """
+    no_convertidos = {}
+    for columna in columnas:
+        if columna not in df.columns:
+            continue
+        numeros, errores = convertir_columna(df[columna])
+        df[columna] = numeros
+        if errores:
+            no_convertidos[columna] = errores
+    return no_convertidos
@@ -0,0 +1,177 @@
+"""
+utils.sql_render
+=================
+Renderizado vectorizado de valores SQL compartido por todos los exporters.
+
+En lugar de formatear celda por celda dentro de df.iterrows(), convierte
+columnas completas a literales SQL de una sola vez y luego une las columnas
+en tuplas "(v1, v2, ...)":
+  - columnas numéricas → astype(str) + máscara de nulos
+  - columnas de texto/objeto → se factorizan y cada valor distinto se
+    formatea una sola vez (fechas, códigos y constantes se repiten mucho)
+
+Reglas (las mismas que aplicaban las copias de `_v()` en cada exporter):
+  - None / NaN / NaT / texto vacío / "None" / "nan" / "NaN" → NULL
+  - el texto se recorta (strip) antes de escribirse
+  - quote=True  → 'texto' con comillas simples duplicadas
+  - quote=False → str(valor) tal cual (números)
+
+Para archivos grandes, iter_rows / iter_values renderizan el DataFrame por
+bloques de filas, de modo que la memoria no crece con el tamaño del archivo.
+
+Para la carga directa a la BD (utils/db_loader.py) sql_param / param_column
+aplican las mismas reglas pero devuelven el valor Python que se pasa como
+parámetro al driver (None en lugar de NULL, texto sin comillas), así los
+dos caminos escriben lo mismo.
+
+Uso:
+    from utils.sql_render import render_rows
+    tuplas = render_rows(df, [("nombre", True), ("almacen_id", False)])
+"""
+
+from collections.abc import Iterator
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_numeric_dtype
+
+NULL = "NULL"
+
+# Filas renderizadas por bloque en iter_rows / iter_values
+CHUNK_FILAS = 10_000
+
+_TEXTOS_NULOS = ("", "None", "nan", "NaN")
+_TIPOS_NUMERICOS = (bool, int, float, np.bool_, np.integer, np.floating)
+
+
+def sql_literal(valor, quote: bool = False) -> str:
+    """Formatea un valor suelto para SQL: NULL, número o 'cadena'."""
+    if valor is None:
+        return NULL
+    try:
+        if pd.isna(valor):
+            return NULL
+    except (TypeError, ValueError):
+        pass
+    s = str(valor).strip()
+    if s in _TEXTOS_NULOS:
+        return NULL
+    if quote:
+        return "'" + s.replace("'", "''") + "'"
+    return s
+
+
+def sql_param(valor, quote: bool = False):
+    """Como sql_literal, pero devuelve el valor para el driver (None = NULL)."""
+    literal = sql_literal(valor, quote)
+    if literal == NULL:
+        return None
+    if quote:
+        return str(valor).strip()
+    if isinstance(valor, np.generic):
+        return valor.item()  # escalares de numpy → int/float de Python
+    if isinstance(valor, _TIPOS_NUMERICOS):
+        return valor
+    return literal
+
+
+def param_column(serie: pd.Series, quote: bool = False) -> list:
+    """
+    Convierte una columna completa a valores para el driver
+    (el equivalente de render_column para executemany).
+    """
+    if is_numeric_dtype(serie) or is_bool_dtype(serie):
+        valores = serie.astype(object).where(serie.notna(), None).tolist()
+        if quote:
+            return [None if v is None else str(v) for v in valores]
+        return valores
+
+    codigos, unicos = pd.factorize(serie, use_na_sentinel=True)
+
+    # mismo caso que render_column: 1, 1.0 y True son iguales al factorizar
+    tipos = {type(u) for u in unicos if isinstance(u, _TIPOS_NUMERICOS)}
+    if len(tipos) > 1:
+        return [sql_param(v, quote) for v in serie.tolist()]
+
+    valores = np.array([sql_param(u, quote) for u in unicos] + [None], dtype=object)
+    return valores[codigos].tolist()
+
+
+def render_column(serie: pd.Series, quote: bool = False) -> list[str]:
+    """
+    Convierte una columna completa a literales SQL.
+
+    Args:
+        serie: columna del DataFrame
+        quote: True para cadenas (se encierran entre comillas simples)
+
+    Returns:
+        Lista de str con el literal SQL de cada celda
+    """
+    if is_numeric_dtype(serie) or is_bool_dtype(serie):
+        # str() de un número nunca lleva espacios ni queda vacío
+        texto = serie.astype(str)
+        if quote:
+            texto = "'" + texto + "'"
+        return texto.astype(object).where(serie.notna(), NULL).tolist()
+
+    codigos, unicos = pd.factorize(serie, use_na_sentinel=True)
+
+    # factorize considera iguales 1, 1.0 y True; si la columna mezcla tipos
+    # numéricos se formatea celda por celda para conservar str() exacto
+    tipos = {type(u) for u in unicos if isinstance(u, _TIPOS_NUMERICOS)}
+    if len(tipos) > 1:
+        return [sql_literal(v, quote) for v in serie.tolist()]
+
+    literales = np.array(
+        [sql_literal(u, quote) for u in unicos] + [NULL], dtype=object
+    )
+    # el código -1 (nulo) apunta al último elemento: NULL
+    return literales[codigos].tolist()
+
+
+def render_values(df: pd.DataFrame, columnas: list[tuple[str, bool]]) -> list[str]:
+    """
+    Renderiza las columnas indicadas y las une por fila como "v1, v2, ...".
+    Las columnas que no existen en el DataFrame se escriben como NULL.
+
+    Args:
+        df:       DataFrame de origen
+        columnas: lista de (nombre_columna, quote)
+
+    Returns:
+        Lista con un string por fila (sin paréntesis)
+    """
+    renderizadas = []
+    for nombre, quote in columnas:
+        if nombre in df.columns:
+            renderizadas.append(render_column(df[nombre], quote=quote))
+        else:
+            renderizadas.append([NULL] * len(df))
+
+    return [", ".join(valores) for valores in zip(*renderizadas)]
+
+
+def render_rows(df: pd.DataFrame, columnas: list[tuple[str, bool]]) -> list[str]:
+    """Igual que render_values pero cada fila como tupla "(v1, v2, ...)"."""
+    return [f"({valores})" for valores in render_values(df, columnas)]
+
+
+def iter_values(
+    df: pd.DataFrame,
+    columnas: list[tuple[str, bool]],
+    chunk_filas: int = CHUNK_FILAS,
+) -> Iterator[str]:
+    """Como render_values, pero renderiza y entrega el DataFrame por bloques."""
+    for inicio in range(0, len(df), chunk_filas):
+        yield from render_values(df.iloc[inicio : inicio + chunk_filas], columnas)
+
+
+def iter_rows(
+    df: pd.DataFrame,
+    columnas: list[tuple[str, bool]],
+    chunk_filas: int = CHUNK_FILAS,
+) -> Iterator[str]:
+    """Como render_rows, pero renderiza y entrega el DataFrame por bloques."""
+    for valores in iter_values(df, columnas, chunk_filas):
+        yield f"({valores})"
@@ -0,0 +1,240 @@
+"""
+utils.sql_writer
+=================
+Utilidades compartidas por los exporters para escribir sentencias SQL.
+
+Modo "extended insert": agrupa varias filas en un solo
+INSERT INTO ... VALUES (...), (...), ...; para que MySQL no pague el costo
+de parseo y commit por cada fila. El tamaño de cada sentencia se limita
+en bytes para no superar `max_allowed_packet` del servidor.
+
+SqlStreamWriter: escribe las líneas al archivo a medida que se generan,
+con un buffer de tamaño acotado, en vez de acumular todo el archivo en
+una lista y hacer "\n".join(lineas) al final. Escribe en
+`output_path + ".tmp"` y solo al terminar sin errores lo renombra al
+destino: un fallo a mitad de camino no pisa el .sql anterior ni deja un
+script parcial.
+
+Perfil de importación rápida (cabecera_importacion / pie_importacion /
+iter_transacciones), compartido por todos los exporters: la cabecera
+guarda el estado de la sesión y desactiva AUTOCOMMIT, UNIQUE_CHECKS y
+FOREIGN_KEY_CHECKS; el cuerpo va en bloques START TRANSACTION ... COMMIT
+de `sentencias_por_transaccion` sentencias (sin autocommit cada INSERT
+no fuerza su propio flush del redo log); el pie restaura los valores
+originales. Con sentencias_por_transaccion = 0 se genera el formato
+clásico (solo FOREIGN_KEY_CHECKS = 0/1, autocommit por sentencia).
+
+Uso:
+    from utils.sql_writer import SqlStreamWriter, iter_insert_statements
+    with SqlStreamWriter(output_path) as writer:
+        writer.write_lines(cabecera + cabecera_importacion())
+        writer.write_lines(
+            iter_transacciones(iter_insert_statements("ingresos", columnas, tuplas))
+        )
+        writer.write_lines(pie_importacion())
+"""
+
+import os
+from collections.abc import Callable, Iterable, Iterator
+
+# Valores por defecto usados por los run_*.py
+FILAS_POR_INSERT = 500
+# Muy por debajo del max_allowed_packet por defecto de MySQL (4 MB / 64 MB)
+MAX_BYTES_INSERT = 1_000_000
+# Caracteres acumulados en memoria antes de volcar al archivo
+BUFFER_CHARS = 1 << 20
+# Sentencias por bloque START TRANSACTION ... COMMIT (0 = sin perfil rápido)
+SENTENCIAS_POR_TRANSACCION = 1000
+
+
+def cabecera_importacion(rapida: bool = True) -> list[str]:
+    """Líneas SET del inicio de cada archivo (guarda el estado de la sesión)."""
+    if not rapida:
+        return ["SET NAMES utf8mb4;", "SET FOREIGN_KEY_CHECKS = 0;"]
+    return [
+        "SET NAMES utf8mb4;",
+        "SET @OLD_AUTOCOMMIT = @@AUTOCOMMIT, AUTOCOMMIT = 0;",
+        "SET @OLD_UNIQUE_CHECKS = @@UNIQUE_CHECKS, UNIQUE_CHECKS = 0;",
+        "SET @OLD_FOREIGN_KEY_CHECKS = @@FOREIGN_KEY_CHECKS, FOREIGN_KEY_CHECKS = 0;",
+    ]
+
+
+def pie_importacion(rapida: bool = True) -> list[str]:
+    """Líneas SET del final de cada archivo (restaura el estado de la sesión)."""
+    if not rapida:
+        return ["SET FOREIGN_KEY_CHECKS = 1;"]
+    return [
+        "SET FOREIGN_KEY_CHECKS = @OLD_FOREIGN_KEY_CHECKS;",
+        "SET UNIQUE_CHECKS = @OLD_UNIQUE_CHECKS;",
+        "SET AUTOCOMMIT = @OLD_AUTOCOMMIT;",
+    ]
+
+
+def iter_transacciones(
+    sentencias: Iterable[str],
+    sentencias_por_transaccion: int = SENTENCIAS_POR_TRANSACCION,
+) -> Iterator[str]:
+    """
+    Intercala START TRANSACTION; / COMMIT; cada `sentencias_por_transaccion`
+    elementos de `sentencias` (con 0 las devuelve tal cual). Cada elemento
+    cuenta como una sentencia aunque ocupe varias líneas.
+    """
+    if sentencias_por_transaccion <= 0:
+        yield from sentencias
+        return
+
+    en_curso = 0
+    for sentencia in sentencias:
+        if en_curso == 0:
+            yield "START TRANSACTION;"
+        yield sentencia
+        en_curso += 1
+        if en_curso >= sentencias_por_transaccion:
+            yield "COMMIT;"
+            en_curso = 0
+    if en_curso:
+        yield "COMMIT;"
+
+
+def insert_prefix(tabla: str, columnas: list[str]) -> str:
+    """Devuelve 'INSERT INTO `tabla` (`col1`, `col2`, ...)'."""
+    cols = ", ".join(f"`{c}`" for c in columnas)
+    return f"INSERT INTO `{tabla}` ({cols})"
+
+
+def iter_insert_statements(
+    tabla: str,
+    columnas: list[str],
+    tuplas: Iterable[str],
+    filas_por_insert: int = 1,
+    max_bytes: int = MAX_BYTES_INSERT,
+) -> Iterator[str]:
+    """
+    Genera las sentencias INSERT para una secuencia de tuplas ya renderizadas.
+
+    Con filas_por_insert=1 produce el formato clásico (una sentencia por fila):
+        INSERT INTO `t` (`a`, `b`) VALUES (1, 'x');
+
+    Con filas_por_insert > 1 agrupa hasta N filas por sentencia, cortando
+    antes si la sentencia superaría `max_bytes` (UTF-8):
+        INSERT INTO `t` (`a`, `b`) VALUES
+        (1, 'x'),
+        (2, 'y');
+
+    Args:
+        tabla:            nombre de la tabla destino
+        columnas:         columnas en el mismo orden que los valores
+        tuplas:           iterable de strings "(v1, v2, ...)"
+        filas_por_insert: máximo de filas por sentencia
+        max_bytes:        tamaño máximo aproximado de cada sentencia
+
+    Returns:
+        Iterador de sentencias SQL terminadas en ';'
+    """
+    prefix = insert_prefix(tabla, columnas)
+
+    if filas_por_insert <= 1:
+        for tupla in tuplas:
+            yield f"{prefix} VALUES {tupla};"
+        return
+
+    cabecera = f"{prefix} VALUES"
+    base_bytes = len(cabecera.encode("utf-8")) + 2  # "\n" + ";"
+
+    for grupo in _agrupar(
+        tuplas,
+        filas_por_insert,
+        max_bytes,
+        base_bytes,
+        lambda tupla: len(tupla.encode("utf-8")) + 2,  # ",\n"
+    ):
+        yield cabecera + "\n" + ",\n".join(grupo) + ";"
+
+
+def _agrupar(
+    elementos: Iterable,
+    max_filas: int,
+    max_bytes: int,
+    base_bytes: int,
+    bytes_de: Callable[[object], int],
+) -> Iterator[list]:
+    """
+    Agrupa `elementos` en listas de hasta `max_filas`, cortando antes si la
+    sentencia (base_bytes + bytes_de(e) de cada elemento) superaría
+    `max_bytes`. Un elemento solo siempre forma un grupo.
+    """
+    grupo: list = []
+    grupo_bytes = base_bytes
+
+    for elemento in elementos:
+        elemento_bytes = bytes_de(elemento)
+        if grupo and (
+            len(grupo) >= max_filas or grupo_bytes + elemento_bytes > max_bytes
+        ):
+            yield grupo
+            grupo = []
+            grupo_bytes = base_bytes
+        grupo.append(elemento)
+        grupo_bytes += elemento_bytes
+
+    if grupo:
+        yield grupo
+
+
+class SqlStreamWriter:
+    """
+    Escritor de archivos SQL línea a línea con buffer acotado.
+
+    El resultado es idéntico a open(...).write("\n".join(lineas)): las
+    líneas se separan con "\n" y no se agrega salto al final. El archivo
+    se escribe como output_path + ".tmp" y se mueve a output_path con
+    os.replace al salir del bloque sin excepción; si hubo una, el .tmp se
+    borra y el archivo anterior queda intacto.
+    """
+
+    def __init__(self, output_path: str, buffer_chars: int = BUFFER_CHARS):
+        self.output_path = output_path
+        self._tmp_path = output_path + ".tmp"
+        self.buffer_chars = buffer_chars
+        self._file = None
+        self._buffer: list[str] = []
+        self._buffer_len = 0
+        self._primera = True
+
+    def __enter__(self) -> "SqlStreamWriter":
+        self._file = open(self._tmp_path, "w", encoding="utf-8")
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        completo = False
+        try:
+            if exc_type is None:
+                self.flush()
+                completo = True
+        finally:
+            self._file.close()
+            if completo:
+                os.replace(self._tmp_path, self.output_path)
+            else:
+                os.remove(self._tmp_path)
+
+    def write_line(self, linea: str) -> None:
+        """Agrega una línea; vuelca el buffer si supera buffer_chars."""
+        if self._primera:
+            self._primera = False
+        else:
+            linea = "\n" + linea
+        self._buffer.append(linea)
+        self._buffer_len += len(linea)
+        if self._buffer_len >= self.buffer_chars:
+            self.flush()
+
+    def write_lines(self, lineas: Iterable[str]) -> None:
+        for linea in lineas:
+            self.write_line(linea)
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._file.write("".join(self._buffer))
+            self._buffer = []
+            self._buffer_len = 0
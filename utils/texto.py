@@ -0,0 +1,82 @@
+"""
+utils.texto
+===========
+Normalización de texto compartida por los módulos que comparan nombres
+de ítems (catalogo_items, ingreso_detalles, egresos).
+
+Dos textos son "el mismo nombre" si coinciden después de normalizarlos:
+  - convierte a string
+  - trim
+  - minúsculas
+  - elimina acentos/diacríticos (NFD)
+  - normaliza espacios
+
+Hay dos entradas con el mismo resultado:
+  - normalizar_texto(valor): un valor suelto.
+  - normalizar_serie(serie): una columna completa; se factoriza y cada
+    valor distinto se normaliza una sola vez.
+Ambas usan _normalizar_str, que guarda el resultado en un caché LRU
+acotado (_MAX_CACHE), porque los mismos nombres se normalizan en items,
+ingreso_detalles y egresos. Los diacríticos se quitan carácter por
+carácter (unicodedata.category == "Mn"), como en la versión original.
+
+Uso:
+    from utils.texto import normalizar_texto, normalizar_serie
+    normalizar_texto("  Café   Molido ")  # → "cafe molido"
+    claves = normalizar_serie(df["DESCRIPCION"])
+"""
+
+import unicodedata
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# Cantidad de strings distintos que recuerda normalizar_texto
+_MAX_CACHE = 65536
+
+
+@lru_cache(maxsize=_MAX_CACHE)
+def _normalizar_str(text: str) -> str:
+    text = text.strip().lower()
+
+    # 1) Separar letras de sus diacríticos (acentos)
+    text = unicodedata.normalize("NFD", text)
+    # 2) Quitar los diacríticos (categoría Mn)
+    text = "".join(ch for ch in text if unicodedata.category(ch) != "Mn")
+    # 3) Normalizar espacios
+    return " ".join(text.split())
+
+
+def normalizar_texto(s) -> str:
+    """
+    Normaliza texto para comparar (None / NaN → "").
+    """
+    if s is None:
+        return ""
+    try:
+        if pd.isna(s):
+            return ""
+    except Exception:
+        pass
+    return _normalizar_str(str(s))
+
+
+def normalizar_serie(serie) -> pd.Series:
+    """
+    normalizar_texto de cada valor de una columna, por valores distintos.
+
+    Returns:
+        Series de str (dtype object) alineada con `serie` (nulos → "")
+    """
+    if not isinstance(serie, pd.Series):
+        serie = pd.Series(serie, dtype=object)
+    codigos, unicos = pd.factorize(serie)
+    if not all(isinstance(v, str) for v in unicos.tolist()):
+        # 1, 1.0 y True son el mismo valor al factorizar, pero no como texto
+        textos = serie.astype(object).map(str).where(serie.notna(), None)
+        codigos, unicos = pd.factorize(textos)
+    normalizados = [_normalizar_str(str(v)) for v in unicos.tolist()]
+    # codigo -1 (nulo) → última posición: ""
+    valores = np.array(normalizados + [""], dtype=object)
+    return pd.Series(valores[codigos], index=serie.index, dtype=object)
@@ -0,0 +1,188 @@
+"""
+utils.tsv_writer
+=================
+Formato alternativo de salida para `LOAD DATA LOCAL INFILE`, la vía de
+carga más rápida de MySQL: en vez de miles de INSERTs, cada tabla se
+escribe como un archivo TSV y un script .sql corto (el "driver") lo carga
+con una sola sentencia por tabla.
+
+Formato del TSV (los valores por defecto de LOAD DATA, declarados
+explícitamente en cada sentencia):
+  - campos separados por tabulador, filas terminadas en "\\n"
+  - NULL → \\N
+  - en los textos se escapan \\ , tabulador, salto de línea, retorno de
+    carro y NUL con barra invertida (\\\\, \\t, \\n, \\r, \\0)
+  - sin fila de encabezado; el orden de los campos es la lista de columnas
+    explícita del LOAD DATA (la misma `_COLUMNAS_SQL` de cada exporter)
+
+Los valores siguen las mismas reglas que los INSERT (utils.sql_render):
+texto recortado y vacíos / "nan" / "None" → NULL.
+
+El driver necesita local_infile habilitado en el servidor y en el cliente:
+    mysql --local-infile=1 -u ... base < output/ingresos_load.sql
+
+Uso:
+    from utils.tsv_writer import write_tsv, load_data_statement, write_load_script
+    write_tsv(df, _COLUMNAS_SQL, ruta_tsv)
+    sentencia = load_data_statement("ingresos", ruta_tsv, _COLUMNAS)
+    write_load_script(ruta_driver(ruta_tsv), "ingresos", [sentencia], len(df))
+"""
+
+import os
+from datetime import datetime
+
+import pandas as pd
+
+from utils.sql_render import CHUNK_FILAS, param_column
+from utils.sql_writer import (
+    SENTENCIAS_POR_TRANSACCION,
+    cabecera_importacion,
+    iter_transacciones,
+    pie_importacion,
+)
+
+TSV_NULL = "\\N"
+
+_ESCAPES = str.maketrans(
+    {"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r", "\0": "\\0"}
+)
+
+
+def _campo(valor) -> str:
+    if valor is None:
+        return TSV_NULL
+    if isinstance(valor, bool):
+        return str(int(valor))  # 'True' no es un número para LOAD DATA
+    return str(valor).translate(_ESCAPES)
+
+
+def tsv_column(serie: pd.Series, quote: bool = False) -> list[str]:
+    """
+    Convierte una columna completa a campos TSV ya escapados
+    (el equivalente de render_column para LOAD DATA).
+    """
+    return [_campo(v) for v in param_column(serie, quote)]
+
+
+def _lineas_tsv(df: pd.DataFrame, columnas: list[tuple[str, bool]]) -> list[str]:
+    """Líneas TSV de df; las columnas que no existen en df van como NULL."""
+    campos = [
+        tsv_column(df[c], quote) if c in df.columns else [TSV_NULL] * len(df)
+        for c, quote in columnas
+    ]
+    return ["\t".join(fila) for fila in zip(*campos)]
+
+
+def write_tsv(
+    df: pd.DataFrame,
+    columnas: list[tuple[str, bool]],
+    output_path: str,
+    chunk_filas: int = CHUNK_FILAS,
+) -> int:
+    """
+    Escribe df como TSV para LOAD DATA, por bloques de `chunk_filas` filas.
+
+    Returns:
+        cantidad de filas escritas
+    """
+    # Igual que SqlStreamWriter: se escribe en un .tmp y se renombra al
+    # final, así un error a mitad de camino no deja un TSV parcial.
+    # newline="\n": en Windows no se convierte a "\r\n" (el "\r" quedaría
+    # dentro del último campo)
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8", newline="\n") as f:
+        try:
+            for inicio in range(0, len(df), chunk_filas):
+                bloque = df.iloc[inicio : inicio + chunk_filas]
+                f.write("".join(linea + "\n" for linea in _lineas_tsv(bloque, columnas)))
+        except BaseException:
+            f.close()
+            os.remove(tmp_path)
+            raise
+    os.replace(tmp_path, output_path)
+    return len(df)
+
+
+def ruta_driver(tsv_path: str) -> str:
+    """output/ingresos.tsv → output/ingresos_load.sql"""
+    return os.path.splitext(tsv_path)[0] + "_load.sql"
+
+
+def _ruta_sql(ruta: str) -> str:
+    """Ruta absoluta como literal SQL ('/' también sirve en Windows)."""
+    ruta = os.path.abspath(ruta).replace("\\", "/")
+    return "'" + ruta.replace("'", "''") + "'"
+
+
+def load_data_statement(
+    tabla: str,
+    tsv_path: str,
+    columnas: list[str],
+    asignaciones: list[str] | None = None,
+) -> str:
+    """
+    Sentencia LOAD DATA LOCAL INFILE para un TSV de write_tsv.
+
+    Args:
+        tabla:        tabla destino
+        tsv_path:     ruta del TSV (se escribe absoluta)
+        columnas:     lista explícita de columnas, en el orden del TSV; un
+                      nombre con '@' lee el campo en una variable de usuario
+        asignaciones: expresiones para la cláusula SET (p.ej. columnas
+                      calculadas a partir de esas variables)
+    """
+    cols = ", ".join(c if c.startswith("@") else f"`{c}`" for c in columnas)
+    lineas = [
+        f"LOAD DATA LOCAL INFILE {_ruta_sql(tsv_path)}",
+        f"INTO TABLE `{tabla}`",
+        "CHARACTER SET utf8mb4",
+        "FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\'",
+        "LINES TERMINATED BY '\\n'",
+        f"({cols})",
+    ]
+    if asignaciones:
+        lineas.append("SET " + ",\n    ".join(asignaciones))
+    return "\n".join(lineas) + ";"
+
+
+def write_load_script(
+    output_path: str,
+    titulo: str,
+    sentencias: list[str],
+    total_registros: int,
+    sentencias_por_transaccion: int = SENTENCIAS_POR_TRANSACCION,
+) -> str:
+    """
+    Escribe el driver .sql con el mismo perfil de importación que los .sql
+    de INSERTs (utils/sql_writer.py): cabecera, sentencias en bloques
+    START TRANSACTION / COMMIT y restauración del estado de la sesión.
+    """
+    rapida = sentencias_por_transaccion > 0
+    ahora = datetime.now()
+    lineas = [
+        "-- ============================================================",
+        f"-- Migración: {titulo} (LOAD DATA)",
+        f"-- Generado el: {ahora.strftime('%Y-%m-%d %H:%M:%S')}",
+        f"-- Total de registros: {total_registros}",
+        "-- Ejecutar con: mysql --local-infile=1 ... < este_archivo.sql",
+        "-- ============================================================",
+        "",
+        *cabecera_importacion(rapida),
+        "",
+    ]
+    for sentencia in iter_transacciones(sentencias, sentencias_por_transaccion):
+        lineas.extend([sentencia, ""])
+    lineas.extend([*pie_importacion(rapida), ""])
+
+    # Igual que write_tsv: .tmp y renombre, para no dejar un driver
+    # truncado junto a un TSV completo
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        try:
+            f.write("\n".join(lineas))
+        except BaseException:
+            f.close()
+            os.remove(tmp_path)
+            raise
+    os.replace(tmp_path, output_path)
+    return output_path
@@ -0,0 +1,134 @@
+"""
+verificacion/check_motores_excel.py
+====================================
+Verifica que las hojas limpias salgan idénticas con los dos motores de
+lectura del Excel (calamine y openpyxl).
+
+Para cada hoja configurada compara, entre ambos motores:
+  - columnas (nombres y orden)
+  - dtypes
+  - valores (NaN en la misma posición cuenta como igual)
+
+También se compara el modo streaming (openpyxl por bloques).
+Ninguna lectura usa la caché, para comparar siempre contra el Excel.
+
+Uso:
+    python verification/check_motores_excel.py
+"""
+
+import logging
+import os
+import sys
+import time
+
+import pandas as pd
+
+# ---- Asegurar que el root del proyecto esté en el path ----
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from excel_loader import load_dfs_limpios
+
+# ---- Logger dedicado a esta verificación ----
+_LOG_DIR = os.path.join(_ROOT, "output")
+_LOG_FILE = os.path.join(_LOG_DIR, "check_motores_excel.log")
+
+os.makedirs(_LOG_DIR, exist_ok=True)
+
+logger = logging.getLogger("check_motores_excel")
+logger.setLevel(logging.DEBUG)
+
+_fmt = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s", "%Y-%m-%d %H:%M:%S")
+
+_fh = logging.FileHandler(_LOG_FILE, encoding="utf-8", mode="w")
+_fh.setLevel(logging.DEBUG)
+_fh.setFormatter(_fmt)
+logger.addHandler(_fh)
+
+_ch = logging.StreamHandler()
+_ch.setLevel(logging.INFO)
+_ch.setFormatter(_fmt)
+logger.addHandler(_ch)
+
+
+def _cargar(etiqueta: str, **kwargs) -> dict:
+    inicio = time.perf_counter()
+    dfs = load_dfs_limpios(usar_cache=False, **kwargs)
+    logger.info(f"[{etiqueta}] {len(dfs)} hojas en {time.perf_counter() - inicio:.2f} s")
+    return dfs
+
+
+def comparar_hoja(nombre_hoja: str, esperado: pd.DataFrame, obtenido: pd.DataFrame) -> list[str]:
+    """Devuelve la lista de diferencias encontradas (vacía si son idénticas)."""
+    if not esperado.columns.equals(obtenido.columns):
+        return [f"columnas distintas: {list(esperado.columns)} vs {list(obtenido.columns)}"]
+    if esperado.shape != obtenido.shape:
+        return [f"tamaño distinto: {esperado.shape} vs {obtenido.shape}"]
+
+    diferencias = []
+    for col in esperado.columns:
+        a, b = esperado[col], obtenido[col]
+        if a.dtype != b.dtype:
+            diferencias.append(f"[{col}] dtype {a.dtype} vs {b.dtype}")
+            continue
+        if a.equals(b):
+            continue
+        distintas = ~((a == b) | (a.isna() & b.isna()))
+        for fila in distintas[distintas].index[:5]:
+            diferencias.append(f"[{col}] fila {fila}: {a[fila]!r} vs {b[fila]!r}")
+    return diferencias
+
+
+def comparar(referencia: dict, otro: dict, etiqueta: str) -> int:
+    """Compara dos cargas completas; devuelve la cantidad de hojas distintas."""
+    hojas_mal = 0
+    if list(referencia) != list(otro):
+        logger.error(f"[{etiqueta}] hojas distintas: {list(referencia)} vs {list(otro)}")
+        return max(len(referencia), len(otro))
+
+    for nombre_hoja, esperado in referencia.items():
+        diferencias = comparar_hoja(nombre_hoja, esperado, otro[nombre_hoja])
+        if diferencias:
+            hojas_mal += 1
+            logger.warning(f"[{etiqueta}] [{nombre_hoja}] {len(diferencias)} diferencia(s)")
+            for d in diferencias:
+                logger.debug(f"    {d}")
+        else:
+            logger.debug(f"[{etiqueta}] [{nombre_hoja}] OK ({len(esperado)} filas)")
+    return hojas_mal
+
+
+def run() -> bool:
+    """
+    Ejecuta la verificación de paridad entre motores.
+
+    Returns:
+        True si todas las hojas son idénticas
+    """
+    logger.info("=" * 60)
+    logger.info("VERIFICACIÓN: paridad de motores de lectura del Excel")
+    logger.info("=" * 60)
+
+    referencia = _cargar("openpyxl", motor="openpyxl")
+    hojas_mal = 0
+
+    try:
+        hojas_mal += comparar(referencia, _cargar("calamine", motor="calamine"), "calamine")
+    except ImportError as e:
+        logger.warning(f"[calamine] no disponible: {e}")
+
+    hojas_mal += comparar(referencia, _cargar("streaming", streaming=True), "streaming")
+
+    logger.info("=" * 60)
+    if hojas_mal:
+        logger.error(f"RESUMEN → {hojas_mal} hoja(s) con diferencias")
+    else:
+        logger.info("RESUMEN → todas las hojas son idénticas")
+    logger.info(f"Log detallado guardado en: {_LOG_FILE}")
+    logger.info("=" * 60)
+    return hojas_mal == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run() else 1)
@@ -0,0 +1,623 @@
+"""
+verificacion/check_paridad_transformers.py
+===========================================
+Verifica que las versiones por columnas de los transformers den el mismo
+resultado que las reglas originales fila por fila (que se conservan como
+referencia; las de montos y egresos, que ningún módulo usa, viven en este
+script).
+
+Los montos de referencia usan la conversión original _to_num. Los cambios
+intencionales de utils/numeros.py (separadores de miles, "nan"/"inf",
+"1_000", booleanos; ver _cambio_intencional) son excepciones esperadas:
+en esas celdas se espera el valor de a_numero y se informa cuántas hubo.
+
+Comparaciones:
+  - items_migration.transformer.asignar_grupos
+        vs df.apply(_asignar_grupo, axis=1)
+  - items_migration.transformer.extraer_abreviaturas
+        vs df["CODIGO"].apply(_extraer_abreviatura)
+  - utils.montos.calcular_montos
+        vs _calcular_montos_filas (cantidad, costo, total, etapa)
+  - ingresos_migration.transformer.parse_fechas
+        vs df["FECHA INGRESO"].apply(_parse_fecha)
+  - egresos_migration.transformer.build_egresos_df
+        vs _build_egresos_filas (ingreso_detalles sintéticos alineados con
+        las SALIDAS del Excel; también que ambas rechacen duplicados y
+        descripciones distintas); también con los nombres ya normalizados
+        como los trae extractor.fetch_catalogo_items
+  - utils.texto.normalizar_serie vs .map(normalizar_texto)
+
+Se comparan los ítems reales del Excel y además un conjunto fijo de
+casos borde (mayúsculas, acentos, nulos, prioridad de las reglas, comas
+decimales, textos no numéricos, fechas en varios formatos).
+
+Uso:
+    python verification/check_paridad_transformers.py
+"""
+
+import logging
+import os
+import re
+import sys
+import time
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+# ---- Asegurar que el root del proyecto esté en el path ----
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from egresos_migration.extractor import build_df_limpio_unificado
+from egresos_migration.transformer import (
+    _COL_CANT,
+    _COL_TOTAL,
+    _COL_VALOR,
+    _validar_entrada,
+    build_egresos_df,
+)
+from excel_loader import load_dfs_limpios
+from ingreso_detalles_migration.extractor import HOJAS_DETALLE
+from utils.montos import (
+    _COL_ING_CANT,
+    _COL_ING_TOTAL,
+    _COL_ING_VALOR,
+    _COL_SALDO_CANT,
+    _COL_SALDO_TOTAL,
+    _COL_SALDO_VALOR,
+    calcular_montos,
+)
+from ingresos_migration.transformer import _parse_fecha, parse_fechas
+from items_migration.extractor import extract_items_from_detalle
+from utils.numeros import a_numero
+from utils.texto import normalizar_serie, normalizar_texto
+from items_migration.transformer import (
+    _asignar_grupo,
+    _extraer_abreviatura,
+    asignar_grupos,
+    extraer_abreviaturas,
+)
+
+# ---- Logger dedicado a esta verificación ----
+_LOG_DIR = os.path.join(_ROOT, "output")
+_LOG_FILE = os.path.join(_LOG_DIR, "check_paridad_transformers.log")
+
+os.makedirs(_LOG_DIR, exist_ok=True)
+
+logger = logging.getLogger("check_paridad_transformers")
+logger.setLevel(logging.DEBUG)
+
+_fmt = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s", "%Y-%m-%d %H:%M:%S")
+
+_fh = logging.FileHandler(_LOG_FILE, encoding="utf-8", mode="w")
+_fh.setLevel(logging.DEBUG)
+_fh.setFormatter(_fmt)
+logger.addHandler(_fh)
+
+_ch = logging.StreamHandler()
+_ch.setLevel(logging.INFO)
+_ch.setFormatter(_fmt)
+logger.addHandler(_ch)
+
+# ---- Casos borde de las reglas de catalogo_items ----
+CASOS_ITEMS = pd.DataFrame(
+    [
+        # hoja_origen, DESCRIPCION, CODIGO, UNIDAD, GRUPO
+        ("FARMACIA", "Registro de firmas", "F-1", "SERVICIO", " PSICOTROPICOS "),
+        ("FARMACIA", "Paracetamol", "f-2", "CAJA", None),
+        ("FARMACIA", "Jeringa", "3", "PIEZA", "   "),
+        (" farmacia ", "Jeringa", "FAR-3", "PIEZA", "INSUMOS"),
+        ("ANEXO-1A", "Papel", "ALM-10", " servicio ", None),
+        ("ANEXO-1A", "  REGISTRO civil", "UEO-10", "PIEZA", None),
+        ("ANEXO-1A", "registros varios", "P-1", "PIEZA", None),
+        ("ANEXO-1A", "registroá", "Ñu-2", "PIEZA", None),
+        ("ANEXO-1A", "registro-x", "áb-2", "PIEZA", None),
+        ("ANEXO-1A", "Cierre de gestión", "LIM-4", None, None),
+        ("ANEXO-1A", "cierres", " lim-4 ", np.nan, None),
+        ("ANEXO-1A", "cierre", "", "PIEZA", None),
+        ("ANEXO-1A", 12345, 123, "PIEZA", None),
+        ("ANEXO-1A", "Agua", 12.5, "PIEZA", None),
+        ("ANEXO-1A", "Agua", np.nan, "PIEZA", None),
+        ("ANEXO-1A", "Agua", "-3", "PIEZA", None),
+    ],
+    columns=["hoja_origen", "DESCRIPCION", "CODIGO", "UNIDAD", "GRUPO"],
+)
+
+# ---- Casos borde de cantidad/costo/total/etapa de ingreso_detalles ----
+_COLUMNAS_MONTOS = [
+    _COL_SALDO_CANT,
+    _COL_SALDO_VALOR,
+    _COL_SALDO_TOTAL,
+    _COL_ING_CANT,
+    _COL_ING_VALOR,
+    _COL_ING_TOTAL,
+]
+
+CASOS_DETALLES = pd.DataFrame(
+    [
+        # saldo cant, saldo valor, saldo total, ingreso cant, ingreso valor, ingreso total
+        (10, 2.5, 25, 1, 1, 1),
+        ("3,5", "1,25", "4,375", None, None, None),
+        (" 7 ", "2", " 14 ", 0, 0, 0),
+        (None, None, None, "2", "3,5", "7,0"),
+        (np.nan, np.nan, 0, 5, 2, 10),
+        ("abc", "x", "-3", "1", "1", "1"),
+        (1, 1, "nan", "4", "1", "4"),
+        (True, True, True, "1e3", "1_000", "inf"),
+        ("", "", "", "", "", ""),
+        (2, 3, "1.5", "9", "9", "9"),
+        ("1.234,5", "1,234.5", "1.234.567", "1 234", "12'000", "-"),
+        (None, None, None, "1,234.56", "1.234,56", "2.469,12"),
+    ],
+    columns=_COLUMNAS_MONTOS,
+    dtype=object,
+)
+
+# ---- Casos borde de FECHA INGRESO ----
+CASOS_FECHAS = pd.Series(
+    [
+        datetime(2025, 1, 26),
+        date(2025, 3, 4),
+        pd.Timestamp("2025-05-06"),
+        "23/08/2025",
+        " 3/11/2025 ",
+        "15-06-2025",
+        "15.06.2025",
+        "05/03/25",
+        "01/02/75",
+        "31/12/99",
+        "2025-03-04",
+        "2025/03/04",
+        "2025-03-04 10:20:30",
+        "05/03/2025 00:00:00",
+        "03/13/2025",
+        "2024/31/12",
+        "31/02/2025",
+        "abc",
+        "",
+        "   ",
+        None,
+        np.nan,
+        pd.NaT,
+        45000,
+        "23/08/2025",
+    ],
+    dtype=object,
+)
+
+
+def _comparar(nombre: str, esperado: pd.Series, obtenido: pd.Series) -> int:
+    """Devuelve la cantidad de filas distintas y las registra en el log."""
+    if esperado.dtype != obtenido.dtype:
+        logger.warning(f"[{nombre}] dtype {esperado.dtype} vs {obtenido.dtype}")
+    iguales = (esperado == obtenido) | (esperado.isna() & obtenido.isna())
+    distintas = int((~iguales).sum())
+    for fila in iguales[~iguales].index[:20]:
+        logger.debug(f"    [{nombre}] fila {fila}: {esperado[fila]!r} vs {obtenido[fila]!r}")
+    return distintas + int(esperado.dtype != obtenido.dtype)
+
+
+def verificar_items(df: pd.DataFrame, etiqueta: str) -> int:
+    """Compara grupo y abreviatura entre la referencia y la versión por columnas."""
+    if df.empty:
+        logger.info(f"[{etiqueta}] sin filas, nada que comparar")
+        return 0
+
+    inicio = time.perf_counter()
+    grupo_ref = df.apply(_asignar_grupo, axis=1)
+    abrev_ref = df["CODIGO"].apply(_extraer_abreviatura)
+    t_ref = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    grupo = asignar_grupos(df)
+    abrev = extraer_abreviaturas(df["CODIGO"])
+    t_col = time.perf_counter() - inicio
+
+    errores = _comparar(f"{etiqueta}.grupo", grupo_ref, grupo)
+    errores += _comparar(f"{etiqueta}.abreviatura", abrev_ref, abrev)
+    logger.info(
+        f"[{etiqueta}] {len(df)} filas | diferencias={errores} | "
+        f"fila por fila {t_ref * 1000:.1f} ms, por columnas {t_col * 1000:.1f} ms"
+    )
+    return errores
+
+
+# ---- Conversión original de montos (antes de utils/numeros.py) ----
+
+
+def _to_num(val, default=0):
+    """Convierte a número; retorna default si no es posible."""
+    try:
+        if pd.isna(val):
+            return default
+    except Exception:
+        pass
+    try:
+        return float(str(val).replace(",", ".").strip())
+    except (ValueError, TypeError):
+        return default
+
+
+def _cambio_intencional(valor) -> bool:
+    """
+    Valores que utils.numeros.a_numero convierte distinto que _to_num a
+    propósito: separadores de miles ("1.234,56", "1 234", "12'000"),
+    "nan"/"inf", "1_000" y booleanos.
+    """
+    if isinstance(valor, (bool, np.bool_)):
+        return True
+    if not isinstance(valor, str):
+        return False
+    texto = valor.strip().lower()
+    return (
+        texto.lstrip("+-") in ("nan", "inf", "infinity")
+        or "_" in texto
+        or re.search(r"[\s']", texto) is not None
+        or texto.count(",") + texto.count(".") > 1
+    )
+
+
+def _to_num_esperado(val, default=0):
+    """_to_num, salvo en los cambios intencionales (ahí manda a_numero)."""
+    if _cambio_intencional(val):
+        return a_numero(val, default)
+    return _to_num(val, default)
+
+
+def _contar_cambios(df: pd.DataFrame, columnas: list) -> int:
+    """Celdas de `columnas` que son cambios intencionales de la conversión."""
+    presentes = [c for c in columnas if c in df.columns]
+    return int(sum(df[c].map(_cambio_intencional).sum() for c in presentes))
+
+
+def _calcular_montos_filas(df_raw: pd.DataFrame) -> pd.DataFrame:
+    """Versión original fila por fila de calcular_montos."""
+    cantidades, costos, totales, etapas = [], [], [], []
+
+    for _, row in df_raw.iterrows():
+        saldo_total = _to_num_esperado(row.get(_COL_SALDO_TOTAL), 0)
+
+        if saldo_total > 0:
+            cantidades.append(_to_num_esperado(row.get(_COL_SALDO_CANT), 0))
+            costos.append(_to_num_esperado(row.get(_COL_SALDO_VALOR), 0))
+            totales.append(saldo_total)
+            etapas.append("ANTES 2025")
+        else:
+            cantidades.append(_to_num_esperado(row.get(_COL_ING_CANT), 0))
+            costos.append(_to_num_esperado(row.get(_COL_ING_VALOR), 0))
+            totales.append(_to_num_esperado(row.get(_COL_ING_TOTAL), 0))
+            etapas.append("2025")
+
+    return pd.DataFrame(
+        {"cantidad": cantidades, "costo": costos, "total": totales, "_etapa": etapas},
+        index=df_raw.index,
+    )
+
+
+def verificar_detalles(df: pd.DataFrame, etiqueta: str) -> int:
+    """Compara cantidad/costo/total/etapa entre la referencia y la versión por columnas."""
+    if df.empty:
+        logger.info(f"[{etiqueta}] sin filas, nada que comparar")
+        return 0
+
+    inicio = time.perf_counter()
+    ref = _calcular_montos_filas(df)
+    t_ref = time.perf_counter() - inicio
+    cambios = _contar_cambios(df, _COLUMNAS_MONTOS)
+
+    inicio = time.perf_counter()
+    obtenido = calcular_montos(df)
+    t_col = time.perf_counter() - inicio
+
+    errores = sum(
+        _comparar(f"{etiqueta}.{col}", ref[col], obtenido[col]) for col in ref.columns
+    )
+    logger.info(
+        f"[{etiqueta}] {len(df)} filas ({cambios} celdas con cambio intencional) | "
+        f"diferencias={errores} | "
+        f"fila por fila {t_ref * 1000:.1f} ms, por columnas {t_col * 1000:.1f} ms"
+    )
+    return errores
+
+
+def verificar_fechas(serie: pd.Series, etiqueta: str) -> int:
+    """Compara FECHA INGRESO entre la referencia y la versión por valores distintos."""
+    if serie.empty:
+        logger.info(f"[{etiqueta}] sin filas, nada que comparar")
+        return 0
+
+    inicio = time.perf_counter()
+    ref = serie.apply(_parse_fecha).astype(object)
+    t_ref = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    obtenido, no_interpretadas = parse_fechas(serie)
+    t_col = time.perf_counter() - inicio
+
+    errores = _comparar(etiqueta, ref, obtenido)
+    logger.info(
+        f"[{etiqueta}] {len(serie)} filas ({no_interpretadas} no interpretadas) | "
+        f"diferencias={errores} | "
+        f"fila por fila {t_ref * 1000:.1f} ms, por columnas {t_col * 1000:.1f} ms"
+    )
+    return errores
+
+
+# ---- Casos borde de la normalización de nombres ----
+CASOS_TEXTOS = pd.Series(
+    [
+        "  Café   Molido ",
+        "CAFÉ MOLIDO",
+        "cafe\tmolido\n",
+        "Año  nuevo",
+        "pingüino",
+        "e\u0301",
+        "\u00a0espacio\u2003raro\u00a0",
+        "ﬁla",
+        "İstanbul",
+        "",
+        "   ",
+        None,
+        np.nan,
+        12.5,
+        1,
+        True,
+        "1",
+    ],
+    dtype=object,
+)
+
+
+def verificar_textos(serie: pd.Series, etiqueta: str) -> int:
+    """Compara normalizar_serie con normalizar_texto valor por valor."""
+    inicio = time.perf_counter()
+    ref = serie.map(normalizar_texto).astype(object)
+    t_ref = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    obtenido = normalizar_serie(serie)
+    t_col = time.perf_counter() - inicio
+
+    errores = _comparar(etiqueta, ref, obtenido)
+    logger.info(
+        f"[{etiqueta}] {len(serie)} filas | diferencias={errores} | "
+        f"fila por fila {t_ref * 1000:.1f} ms, por columnas {t_col * 1000:.1f} ms"
+    )
+    return errores
+
+
+def _build_egresos_filas(
+    df_ingreso_detalles: pd.DataFrame,
+    df_limpio: pd.DataFrame,
+    item_id_to_nombre: dict[int, str],
+) -> pd.DataFrame:
+    """Versión original fila por fila de build_egresos_df (se detiene en el primer error)."""
+
+    ahora = datetime.now()
+    fecha_registro = ahora.strftime("%Y-%m-%d")
+    created_at = ahora.strftime("%Y-%m-%d %H:%M:%S")
+    updated_at = ahora.strftime("%Y-%m-%d %H:%M:%S")
+
+    _validar_entrada(df_ingreso_detalles, df_limpio)
+    df_limpio = df_limpio.copy()
+    df_limpio["_desc_norm"] = df_limpio["DESCRIPCION"].map(normalizar_texto)
+
+    # --- Validación de unicidad de pares (ingreso_id, ingreso_detalle_id) ---
+    seen_pairs: set[tuple[int, int]] = set()
+
+    rows_out = []
+
+    # Recorremos por índice posicional (i)
+    for i, (_, det) in enumerate(df_ingreso_detalles.iterrows()):
+        # IDs principales
+        ingreso_id = int(det["ingreso_id"])
+        ingreso_detalle_id = int(det["id"])
+        pair = (ingreso_id, ingreso_detalle_id)
+
+        if pair in seen_pairs:
+            msg = (
+                f"Duplicado detectado: (ingreso_id, ingreso_detalle_id)=({ingreso_id}, {ingreso_detalle_id}).\n"
+                f"- pos i={i}\n"
+                "Cancelando ejecución."
+            )
+            logger.error(msg)
+            raise ValueError(msg)
+        seen_pairs.add(pair)
+
+        # Campos del detalle
+        almacen_id = int(det["almacen_id"]) if pd.notna(det["almacen_id"]) else None
+
+        partida_id = det["partida_id"] if pd.notna(det.get("partida_id", None)) else None
+        if partida_id is not None:
+            partida_id = int(partida_id)
+
+        item_id = int(det["item_id"])
+        nombre_item = item_id_to_nombre.get(item_id, "")
+        nombre_norm = normalizar_texto(nombre_item)
+
+        # 1) Tomamos la fila EXACTA del Excel por posición i
+        row_excel = df_limpio.iloc[i]
+
+        # 2) Validamos descripción
+        desc_excel_raw = row_excel.get("DESCRIPCION", "")
+        desc_excel_norm = row_excel.get("_desc_norm", "")
+
+        if desc_excel_norm != nombre_norm:
+            msg = (
+                "Validación DESCRIPCION fallida por posición.\n"
+                f"- pos i={i}\n"
+                f"- ingreso_id={ingreso_id}, ingreso_detalle_id={ingreso_detalle_id}, item_id={item_id}\n"
+                f"- Excel.DESCRIPCION='{desc_excel_raw}' (norm='{desc_excel_norm}')\n"
+                f"- catalogo_items.nombre='{nombre_item}' (norm='{nombre_norm}')\n"
+            )
+            logger.error(msg)
+            raise ValueError(msg)
+
+        # 3) Extraer cantidad / costo / total de ESA MISMA fila
+        cantidad = int(_to_num_esperado(row_excel.get(_COL_CANT), 0))
+        costo = _to_num_esperado(row_excel.get(_COL_VALOR), 0)
+        total = _to_num_esperado(row_excel.get(_COL_TOTAL), 0)
+
+        # 4) Armar salida
+        rows_out.append(
+            {
+                "ingreso_id": ingreso_id,
+                "ingreso_detalle_id": ingreso_detalle_id,
+                "almacen_id": almacen_id,
+                "partida_id": partida_id,
+                "item_id": item_id,
+                "destino_id": None,
+                "cantidad": cantidad,
+                "costo": costo,
+                "total": total,
+                "fecha_registro": fecha_registro,
+                "editable": 1,
+                "created_at": created_at,
+                "updated_at": updated_at,
+            }
+        )
+
+    df_out = pd.DataFrame(rows_out)
+    logger.info(f"DataFrame egresos construido: {len(df_out)} filas")
+    return df_out
+
+
+def _detalles_sinteticos(df_limpio: pd.DataFrame) -> tuple[pd.DataFrame, dict]:
+    """
+    ingreso_detalles y catalogo_items de prueba para build_egresos_df: un
+    item por DESCRIPCION distinta, con el nombre en mayúsculas (coincide al
+    normalizar) y partida_id nulo en una de cada siete filas.
+    """
+    n = len(df_limpio)
+    item_ids, descripciones = pd.factorize(df_limpio["DESCRIPCION"])
+    item_id_to_nombre = {
+        i + 1: str(d).upper() for i, d in enumerate(descripciones.tolist())
+    }
+    partidas = pd.Series(np.arange(n) % 5 + 1, dtype=object)
+    partidas[np.arange(n) % 7 == 0] = None
+    df_det = pd.DataFrame(
+        {
+            "id": np.arange(8, n + 8),
+            "ingreso_id": np.arange(7, n + 7),
+            "almacen_id": df_limpio["almacen_id"].to_numpy(),
+            "partida_id": partidas,
+            # DESCRIPCION nula → item inexistente (nombre "")
+            "item_id": np.where(item_ids >= 0, item_ids + 1, 0),
+        }
+    )
+    return df_det, item_id_to_nombre
+
+
+def verificar_egresos(df_limpio: pd.DataFrame, etiqueta: str) -> int:
+    """Compara build_egresos_df con la referencia, y sus errores de validación."""
+    if df_limpio.empty:
+        logger.info(f"[{etiqueta}] sin filas, nada que comparar")
+        return 0
+    df_det, item_id_to_nombre = _detalles_sinteticos(df_limpio)
+
+    inicio = time.perf_counter()
+    ref = _build_egresos_filas(df_det, df_limpio, item_id_to_nombre)
+    t_ref = time.perf_counter() - inicio
+    cambios = _contar_cambios(df_limpio, [_COL_CANT, _COL_VALOR, _COL_TOTAL])
+
+    inicio = time.perf_counter()
+    obtenido = build_egresos_df(df_det, df_limpio, item_id_to_nombre)
+    t_col = time.perf_counter() - inicio
+
+    errores = int(list(ref.columns) != list(obtenido.columns))
+    fechas = ["fecha_registro", "created_at", "updated_at"]
+    errores += sum(
+        _comparar(f"{etiqueta}.{col}", ref[col], obtenido[col])
+        for col in ref.columns
+        if col not in fechas
+    )
+    errores += sum(int(ref[col].dtype != obtenido[col].dtype) for col in fechas)
+
+    # Con el nombre normalizado precalculado (columna nombre_norm del fetch)
+    nombres_norm = normalizar_serie(pd.Series(item_id_to_nombre, dtype=object))
+    con_norm = build_egresos_df(df_det, df_limpio, item_id_to_nombre, nombres_norm=nombres_norm)
+    errores += sum(
+        _comparar(f"{etiqueta}.nombre_norm.{col}", obtenido[col], con_norm[col])
+        for col in obtenido.columns
+        if col not in fechas
+    )
+
+    # Un duplicado y dos descripciones distintas: ambas deben fallar y la
+    # versión por columnas debe reportar los tres problemas juntos
+    df_mal = df_det.copy()
+    df_mal.loc[len(df_mal) - 1, ["ingreso_id", "id"]] = df_mal.loc[0, ["ingreso_id", "id"]].tolist()
+    df_mal.loc[[1, len(df_mal) // 2], "item_id"] = -1
+    nombres_mal = {**item_id_to_nombre, -1: "no coincide"}
+    for nombre, funcion in (("referencia", _build_egresos_filas), ("columnas", build_egresos_df)):
+        try:
+            funcion(df_mal, df_limpio, nombres_mal)
+            logger.warning(f"[{etiqueta}.errores] {nombre}: no detectó los errores")
+            errores += 1
+        except ValueError as e:
+            logger.debug(f"[{etiqueta}.errores] {nombre}: {str(e).splitlines()[0]}")
+            reporta_todo = "1 par(es)" in str(e) and "2 DESCRIPCION" in str(e)
+            if nombre == "columnas" and not reporta_todo:
+                errores += 1
+
+    logger.info(
+        f"[{etiqueta}] {len(df_limpio)} filas ({cambios} celdas con cambio intencional) | "
+        f"diferencias={errores} | "
+        f"fila por fila {t_ref * 1000:.1f} ms, por columnas {t_col * 1000:.1f} ms"
+    )
+    return errores
+
+
+def _filas_detalle(dfs_limpios: dict) -> pd.DataFrame:
+    """Hojas detalle concatenadas como en extract_ingreso_detalles (sin la DB)."""
+    fragmentos = [df for nombre, df in dfs_limpios.items() if nombre in HOJAS_DETALLE]
+    if not fragmentos:
+        return pd.DataFrame()
+    return pd.concat(fragmentos, ignore_index=True)
+
+
+def run(dfs_limpios: dict | None = None) -> bool:
+    """
+    Ejecuta todas las comparaciones.
+
+    Args:
+        dfs_limpios: dict ya cargado (opcional; si None lo carga internamente)
+
+    Returns:
+        True si no hubo diferencias
+    """
+    if dfs_limpios is None:
+        dfs_limpios = load_dfs_limpios()
+
+    logger.info("=" * 60)
+    logger.info("VERIFICACIÓN: paridad de transformers (referencia vs columnas)")
+    logger.info("=" * 60)
+
+    errores = verificar_items(CASOS_ITEMS, "items.casos_borde")
+    errores += verificar_items(extract_items_from_detalle(dfs_limpios), "items.excel")
+    errores += verificar_detalles(CASOS_DETALLES, "detalles.casos_borde")
+    errores += verificar_detalles(
+        CASOS_DETALLES.drop(columns=[_COL_ING_TOTAL]), "detalles.sin_columna"
+    )
+    df_detalle = _filas_detalle(dfs_limpios)
+    errores += verificar_detalles(df_detalle, "detalles.excel")
+    errores += verificar_fechas(CASOS_FECHAS, "fechas.casos_borde")
+    errores += verificar_egresos(build_df_limpio_unificado(dfs_limpios), "egresos.excel")
+    errores += verificar_textos(CASOS_TEXTOS, "textos.casos_borde")
+    if "DESCRIPCION" in df_detalle.columns:
+        errores += verificar_textos(df_detalle["DESCRIPCION"], "textos.excel")
+    if "FECHA INGRESO" in df_detalle.columns:
+        errores += verificar_fechas(df_detalle["FECHA INGRESO"], "fechas.excel")
+
+    logger.info("=" * 60)
+    if errores:
+        logger.error(f"RESUMEN → {errores} diferencia(s); ver {_LOG_FILE}")
+    else:
+        logger.info("RESUMEN → sin diferencias")
+    logger.info("=" * 60)
+    return errores == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run() else 1)
@@ -26,6 +26,7 @@ import logging
 import os
 import sys
 
+import numpy as np
 import pandas as pd
 
 # ---- Root del proyecto en el path ----
@@ -34,6 +35,7 @@ if _ROOT not in sys.path:
     sys.path.insert(0, _ROOT)
 
 from excel_loader import load_dfs_limpios, DETALLES
+from utils.numeros import convertir_columna
 
 # ---- Logger dedicado ----
 _LOG_DIR = os.path.join(_ROOT, "output")
@@ -72,19 +74,12 @@ GRUPO_B = [
 ALL_COLS = GRUPO_A + GRUPO_B
 
 
-def _tiene_dato(val) -> bool:
-    """Retorna True si el valor es numérico y mayor a cero."""
-    if val is None:
-        return False
-    try:
-        if pd.isna(val):
-            return False
-    except Exception:
-        pass
-    try:
-        return float(str(val).replace(",", ".").strip()) > 0
-    except (ValueError, TypeError):
-        return False
+def _tiene_dato(df: pd.DataFrame, cols: list[str]) -> np.ndarray:
+    """Por fila: True si alguna de `cols` tiene un valor numérico mayor a cero."""
+    tiene = np.zeros(len(df), dtype=bool)
+    for col in cols:
+        tiene |= convertir_columna(df[col])[0] > 0
+    return tiene
 
 
 def _fila_a_texto(row: pd.Series, cols: list[str]) -> str:
@@ -112,21 +107,17 @@ def verificar_hoja(nombre_hoja: str, df: pd.DataFrame) -> int:
         )
         return 0
 
-    alertas = 0
-
-    for idx, row in df.iterrows():
-        tiene_a = any(_tiene_dato(row.get(c)) for c in cols_a)
-        tiene_b = any(_tiene_dato(row.get(c)) for c in cols_b)
+    # Solo las filas con alerta se recorren (para armar el log)
+    con_alerta = _tiene_dato(df, cols_a) & _tiene_dato(df, cols_b)
 
-        if tiene_a and tiene_b:
-            alertas += 1
-            fila_txt = _fila_a_texto(row, ALL_COLS)
-            logger.warning(
-                f"[{nombre_hoja}] fila {idx} — POSIBLE INCOHERENCIA: "
-                f"datos en saldo inicial Y en ingresos simultáneamente | {fila_txt}"
-            )
+    for idx, row in df[con_alerta].iterrows():
+        fila_txt = _fila_a_texto(row, ALL_COLS)
+        logger.warning(
+            f"[{nombre_hoja}] fila {idx} — POSIBLE INCOHERENCIA: "
+            f"datos en saldo inicial Y en ingresos simultáneamente | {fila_txt}"
+        )
 
-    return alertas
+    return int(con_alerta.sum())
 
 
 def run(dfs_limpios: dict | None = None) -> None:
@@ -20,6 +20,7 @@ import logging
 import os
 import sys
 
+import numpy as np
 import pandas as pd
 
 # ---- Asegurar que el root del proyecto esté en el path ----
@@ -28,6 +29,7 @@ if _ROOT not in sys.path:
     sys.path.insert(0, _ROOT)
 
 from excel_loader import load_dfs_limpios, DETALLES
+from utils.numeros import convertir_columna
 
 # ---- Logger dedicado a esta verificación ----
 _LOG_DIR = os.path.join(_ROOT, "output")
@@ -61,27 +63,6 @@ COLS_VALOR = [
 _TOLERANCIA = 1e-6
 
 
-def _es_nulo(val) -> bool:
-    """Retorna True si el valor es nulo, vacío o cero no significativo."""
-    if val is None:
-        return True
-    try:
-        if pd.isna(val):
-            return True
-    except Exception:
-        pass
-    s = str(val).strip()
-    return s in ("", "None", "nan", "NaN")
-
-
-def _to_float(val) -> float | None:
-    """Convierte a float; retorna None si no es posible."""
-    try:
-        return float(str(val).replace(",", ".").strip())
-    except (ValueError, TypeError):
-        return None
-
-
 def verificar_hoja(nombre_hoja: str, df: pd.DataFrame) -> dict:
     """
     Verifica la consistencia de las columnas valor en una hoja detalle.
@@ -110,15 +91,15 @@ def verificar_hoja(nombre_hoja: str, df: pd.DataFrame) -> dict:
     filas_alerta = 0
     filas_sin_datos = 0
 
-    for idx, row in df.iterrows():
-        valores_no_nulos: dict[str, float] = {}
+    # Cada columna se convierte una sola vez (NaN = vacío o no numérico)
+    numeros = {col: convertir_columna(df[col])[0] for col in cols_presentes}
 
-        for col in cols_presentes:
-            val = row.get(col)
-            if not _es_nulo(val):
-                num = _to_float(val)
-                if num is not None:
-                    valores_no_nulos[col] = num
+    for pos, idx in enumerate(df.index):
+        valores_no_nulos: dict[str, float] = {
+            col: float(numeros[col][pos])
+            for col in cols_presentes
+            if not np.isnan(numeros[col][pos])
+        }
 
         if len(valores_no_nulos) == 0:
             filas_sin_datos += 1